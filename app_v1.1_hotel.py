@@ -13,26 +13,58 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta, date
-import importlib.util
-import sys
-import os
+import time
 
 # 로깅 모듈 import 및 초기화
-from utils.logger import setup_logging, log_auth, log_error, log_access
+from utils.logger import setup_logging, log_auth, log_error, log_access, is_log_enabled
 setup_logging()
 
+# 메트릭 엔드포인트 (METRICS_PORT 설정 시, 프로세스당 1회만 시작됨 - 워커마다 다른 포트)
+from utils.metrics import start_metrics_server, record_cache
+start_metrics_server()
+
 # 인증 모듈 import
 from utils.auth import (
     authenticate_user,
     is_authenticated,
-    logout
+    logout,
+    restore_session,
+    start_session
 )
+from utils.session_token import get_token_ttl
 
 # 숙소 검색 모듈 import
 from utils.hotel_search import search_hotels, get_hotel_by_id
 
 # 숙소별 데이터 조회 모듈 import
-from utils.data_fetcher_hotel import fetch_hotel_data, fetch_hotel_summary_stats
+from utils.data_fetcher_hotel import REPORT_STEPS, fetch_hotel_report
+from utils.query_builder_hotel import GRANULARITIES
+
+# 리포트 백그라운드 작업 모듈 import
+from utils.report_jobs import (
+    STATE_CANCELLED,
+    STATE_DONE,
+    STATE_FAILED,
+    cancel_job,
+    discard_job,
+    get_job,
+    submit_report_job
+)
+
+# 조회 결과 보관소 import
+from utils.result_store import add_to_result, get_result, put_result
+
+# 조회 결과 집계 보기 모듈 import
+from utils.result_pivot import get_dimensions as get_pivot_dimensions, get_result_pivot
+from utils.result_table import (
+    PAGE_SIZES as DETAIL_PAGE_SIZES,
+    SORT_COLUMNS as DETAIL_SORT_COLUMNS,
+    filter_result,
+    format_detail_page,
+    get_page,
+    get_page_count,
+    sort_result,
+)
 
 # 숙소별 엑셀 핸들러 import
 from utils.excel_handler_hotel import create_hotel_excel_download
@@ -88,122 +120,72 @@ st.markdown(sidebar_css, unsafe_allow_html=True)
 # 인증 체크 및 로그인 페이지
 # ============================================
 
+# 세션 토큰 쿠키 이름 (기존 auth_admin_id 쿠키는 서명이 없어 더 이상 사용하지 않음)
+AUTH_COOKIE_NAME = "auth_token"
+
 # 쿠키에서 인증 정보 복원 (새로고침 문제 해결)
 def restore_auth_from_cookie():
-    """쿠키에서 인증 정보를 읽어 세션 상태에 복원"""
-    try:
-        log_auth("DEBUG", "restore_auth_from_cookie 시작", 
-                has_logout_flag=st.session_state.get('_logout_in_progress', False),
-                is_authenticated=is_authenticated(st.session_state))
-    except:
-        pass
+    """쿠키의 서명 토큰을 검증하여 세션 상태에 복원 (DB 조회 없음)"""
+    # 이미 인증되어 있으면 복원 불필요 (매 rerun마다 호출되므로 로그 없이 바로 반환)
+    if is_authenticated(st.session_state):
+        return True
     
     # 로그아웃 중이면 복원하지 않음
     # 단, 로그아웃 플래그는 로그아웃 버튼 클릭 시에만 설정되므로
     # 새로고침 시에는 플래그가 없어야 함
     if st.session_state.get('_logout_in_progress', False):
-        try:
-            log_auth("DEBUG", "로그아웃 진행 중 - 쿠키 복원 건너뜀")
-        except:
-            pass  # 로그 기록 실패해도 계속 진행
         return False
     
-    # 이미 인증되어 있으면 복원 불필요
-    if is_authenticated(st.session_state):
-        try:
-            log_auth("DEBUG", "이미 인증됨 - 쿠키 복원 불필요")
-        except:
-            pass
-        return True
-    
     try:
-        # 방법 1: st.context.cookies 사용
-        has_context = hasattr(st, 'context')
-        has_cookies = has_context and hasattr(st.context, 'cookies')
-        
-        try:
-            log_auth("DEBUG", "쿠키 접근 시도", 
-                    has_context=has_context,
-                    has_cookies=has_cookies)
-        except:
-            pass
-        
-        if has_cookies:
-            cookies = st.context.cookies
-            cookie_dict = cookies.to_dict() if hasattr(cookies, 'to_dict') else dict(cookies)
-            
-            try:
-                log_auth("DEBUG", "쿠키 확인 (context)", 
-                        available_cookies=list(cookie_dict.keys()),
-                        has_auth_cookie='auth_admin_id' in cookie_dict,
-                        cookie_dict_keys=str(list(cookie_dict.keys())))
-            except:
-                pass  # 로그 기록 실패해도 계속 진행
-            
-            if 'auth_admin_id' in cookie_dict:
-                admin_id = cookie_dict.get('auth_admin_id')
-                if admin_id:
-                    st.session_state.authenticated = True
-                    st.session_state.admin_id = admin_id
-                    # 로그아웃 플래그가 있다면 삭제 (새로고침 시 정상 복원을 위해)
-                    if '_logout_in_progress' in st.session_state:
-                        del st.session_state['_logout_in_progress']
-                    try:
-                        log_auth("INFO", "쿠키에서 인증 정보 복원 (context)", admin_id=admin_id)
-                    except:
-                        pass  # 로그 기록 실패해도 계속 진행
-                    return True
-            else:
-                try:
-                    log_auth("DEBUG", "쿠키에 auth_admin_id 없음", 
-                            available_cookies=list(cookie_dict.keys()))
-                except:
-                    pass
-        else:
-            try:
-                log_auth("WARNING", "st.context.cookies 접근 불가", 
-                        has_context=has_context,
-                        has_cookies=has_cookies)
-            except:
-                pass
+        # 방법 1: st.context.cookies 사용 (Streamlit 1.37 이상)
+        cookies = getattr(getattr(st, 'context', None), 'cookies', None)
+        if cookies is None:
+            return False
         
+        token = cookies.get(AUTH_COOKIE_NAME)
+        if token and restore_session(st.session_state, token):
+            # 로그아웃 플래그가 있다면 삭제 (새로고침 시 정상 복원을 위해)
+            if '_logout_in_progress' in st.session_state:
+                del st.session_state['_logout_in_progress']
+            log_auth("INFO", "쿠키에서 인증 정보 복원 (context)", admin_id=st.session_state.admin_id)
+            return True
+        if token:
+            log_auth("WARNING", "세션 토큰 검증 실패 (만료 또는 위조)")
     except Exception as e:
         try:
-            log_error("ERROR", "쿠키에서 인증 정보 복원 실패", exception=e, traceback_str=str(e))
+            log_error("ERROR", "쿠키에서 인증 정보 복원 실패", exception=e)
         except:
             pass  # 로그 기록 실패해도 계속 진행
     
-    try:
-        log_auth("DEBUG", "쿠키 복원 실패 - 로그인 페이지로 이동")
-    except:
-        pass
-    
     return False
 
 # 쿠키에서 인증 정보 복원 시도
-# st.context가 초기화되기 전에는 쿠키를 읽을 수 없으므로,
-# 여러 번 시도하거나 JavaScript를 사용
+# st.context가 없는 버전에서는 쿠키를 읽을 수 없으므로 JavaScript를 사용
 restore_result = restore_auth_from_cookie()
 
 # st.context가 없고 쿠키 복원이 실패한 경우, JavaScript로 재시도
 # 운영 서버 환경 대응: URL 파라미터 방식 개선
-if not restore_result and not is_authenticated(st.session_state) and not st.session_state.get('_logout_in_progress', False):
+if not restore_result and not st.session_state.get('_logout_in_progress', False):
     # URL 파라미터에서 인증 정보 복원 (먼저 확인)
     query_params = st.query_params
     if 'auth_restore' in query_params:
-        admin_id = query_params['auth_restore']
-        if admin_id:
-            st.session_state.authenticated = True
-            st.session_state.admin_id = admin_id
+        token = query_params['auth_restore']
+        # URL 파라미터 제거
+        st.query_params.clear()
+        if restore_session(st.session_state, token):
             if '_logout_in_progress' in st.session_state:
                 del st.session_state['_logout_in_progress']
-            # URL 파라미터 제거
-            st.query_params.clear()
             try:
-                log_auth("INFO", "쿠키에서 인증 정보 복원 (JavaScript URL 파라미터)", admin_id=admin_id)
+                log_auth("INFO", "쿠키에서 인증 정보 복원 (JavaScript URL 파라미터)",
+                         admin_id=st.session_state.admin_id)
             except:
                 pass
             st.rerun()
+        else:
+            try:
+                log_auth("WARNING", "세션 토큰 검증 실패 (만료 또는 위조)")
+            except:
+                pass
     else:
         # URL 파라미터가 없으면 JavaScript로 쿠키 읽기 시도
         # 새로고침 시 session_state가 초기화되므로, URL 파라미터로 체크
@@ -224,50 +206,40 @@ if not restore_result and not is_authenticated(st.session_state) and not st.sess
                 return null;
             }
             
-            // URL 파라미터에 auth_restore가 없고, 쿠키에 auth_admin_id가 있으면 리다이렉트
+            // URL 파라미터에 auth_restore가 없고, 쿠키에 세션 토큰이 있으면 리다이렉트
             var urlParams = new URLSearchParams(window.location.search);
             if (!urlParams.has('auth_restore')) {
-                var authId = getCookie("auth_admin_id");
-                if (authId) {
+                var authToken = getCookie("%s");
+                if (authToken) {
                     // 리다이렉트 전에 약간의 지연 (Streamlit 렌더링 완료 대기)
                     setTimeout(function() {
-                        var newUrl = window.location.pathname + "?auth_restore=" + encodeURIComponent(authId);
+                        var newUrl = window.location.pathname + "?auth_restore=" + encodeURIComponent(authToken);
                         window.location.href = newUrl;
                     }, 50);
                 }
             }
         })();
         </script>
-        """
+        """ % AUTH_COOKIE_NAME
         st.components.v1.html(cookie_read_script, height=0)
 
-# 디버깅: 세션 상태 확인
-debug_info = {
-    'has_authenticated': 'authenticated' in st.session_state,
-    'authenticated_value': st.session_state.get('authenticated', 'NOT_SET'),
-    'has_admin_id': 'admin_id' in st.session_state,
-    'admin_id_value': st.session_state.get('admin_id', 'NOT_SET'),
-    'session_state_keys': list(st.session_state.keys())
-}
 is_auth_result = is_authenticated(st.session_state)
 
-# 디버깅 로그 (로그 기록 실패해도 계속 진행)
-try:
-    log_auth("INFO", "인증 상태 체크", 
-             is_authenticated=is_auth_result,
-             debug_info=str(debug_info))
-except:
-    pass  # 로그 기록 실패해도 계속 진행
-
 # 인증 상태 확인
 if not is_auth_result:
     # 로그인 페이지
     st.title("🔐 로그인")
     st.markdown("---")
     
-    # 디버깅 정보 표시 (개발용)
+    # 디버깅 정보 표시 (개발용, 로그인 페이지에서만 생성)
     with st.expander("🔍 디버깅 정보 (개발용)", expanded=False):
-        st.json(debug_info)
+        st.json({
+            'has_authenticated': 'authenticated' in st.session_state,
+            'authenticated_value': st.session_state.get('authenticated', 'NOT_SET'),
+            'has_admin_id': 'admin_id' in st.session_state,
+            'admin_id_value': st.session_state.get('admin_id', 'NOT_SET'),
+            'session_state_keys': list(st.session_state.keys())
+        })
         st.write(f"**is_authenticated() 결과:** {is_auth_result}")
     
     # 로그인 폼
@@ -282,17 +254,17 @@ if not is_auth_result:
                 auth_result = authenticate_user(admin_id, password)
                 
                 if auth_result['success']:
-                    # 로그인 성공
-                    st.session_state.authenticated = True
-                    st.session_state.admin_id = auth_result['admin_id']
+                    # 로그인 성공 (세션 상태 설정 + 서명 토큰 발급)
+                    auth_token = start_session(st.session_state, auth_result['admin_id'])
                     
                     # 로그아웃 플래그 삭제 (로그인 성공 시)
                     if '_logout_in_progress' in st.session_state:
                         del st.session_state['_logout_in_progress']
                     
-                    # 쿠키에 인증 정보 저장 (새로고침 문제 해결)
+                    # 쿠키에 세션 토큰 저장 (새로고침 문제 해결)
                     # JavaScript를 사용하여 쿠키 설정 (서버 환경 대응)
-                    admin_id = auth_result['admin_id']
+                    # 쿠키 유효 기간은 토큰 만료와 동일하게 설정
+                    cookie_days = get_token_ttl() / 86400
                     # 쿠키 설정 스크립트 (운영 서버 환경 대응 강화)
                     cookie_script = f"""
                     <script>
@@ -328,7 +300,7 @@ if not is_auth_result:
                             }}
                             
                             document.cookie = cookieString;
-                            console.log("Cookie set: " + name + "=" + value + " (domain: " + (domain || "default") + ")");
+                            console.log("Cookie set: " + name + " (domain: " + (domain || "default") + ")");
                             
                             // 쿠키 설정 확인 (여러 번 시도)
                             var attempts = 0;
@@ -347,18 +319,19 @@ if not is_auth_result:
                         }}
                         
                         // 즉시 실행
-                        setCookie("auth_admin_id", "{admin_id}", 1);
+                        setCookie("{AUTH_COOKIE_NAME}", "{auth_token}", {cookie_days});
+                        // 서명 없는 이전 쿠키 삭제
+                        document.cookie = "auth_admin_id=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT; SameSite=Lax";
                     }})();
                     </script>
                     """
                     st.components.v1.html(cookie_script, height=0)
                     
                     # 디버깅: 로그인 성공 후 세션 상태 확인
-                    log_auth("INFO", "로그인 성공 - 세션 상태 및 쿠키 저장 시도", 
-                             admin_id=auth_result['admin_id'],
-                             authenticated_set=st.session_state.get('authenticated'),
-                             admin_id_set=st.session_state.get('admin_id'),
-                             all_keys=list(st.session_state.keys()))
+                    if is_log_enabled('auth', 'DEBUG'):
+                        log_auth("DEBUG", "로그인 성공 - 세션 상태 및 쿠키 저장 시도", 
+                                 admin_id=auth_result['admin_id'],
+                                 all_keys=list(st.session_state.keys()))
                     
                     st.rerun()
                 else:
@@ -381,11 +354,11 @@ if not is_auth_result:
 
 # 인증된 사용자만 여기까지 도달
 
-# 디버깅: 인증된 사용자 접근 확인
-log_auth("INFO", "인증된 사용자 접근", 
-         admin_id=st.session_state.get('admin_id'),
-         authenticated=st.session_state.get('authenticated'),
-         session_keys=list(st.session_state.keys()))
+# 디버깅: 인증된 사용자 접근 확인 (매 rerun마다 실행되므로 DEBUG 레벨에서만 기록)
+if is_log_enabled('auth', 'DEBUG'):
+    log_auth("DEBUG", "인증된 사용자 접근", 
+             admin_id=st.session_state.get('admin_id'),
+             session_keys=list(st.session_state.keys()))
 
 # ============================================
 # 메인 애플리케이션
@@ -400,6 +373,10 @@ with col_header2:
         # 로그아웃 플래그 설정 (쿠키 복원 방지) - 삭제하지 않고 유지
         st.session_state['_logout_in_progress'] = True
         
+        # 진행 중인 조회 작업 취소
+        if st.session_state.get('report_job'):
+            discard_job(st.session_state.pop('report_job')['job_id'])
+        
         # 세션 상태 먼저 삭제
         logout(st.session_state)
         
@@ -407,13 +384,14 @@ with col_header2:
         cookie_script = """
         <script>
         // 쿠키 삭제
+        document.cookie = "%s=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT; SameSite=Lax";
         document.cookie = "auth_admin_id=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT; SameSite=Lax";
         // 페이지 강제 리로드하여 로그인 페이지로 이동
         setTimeout(function() {
             window.location.href = window.location.pathname;
         }, 100);
         </script>
-        """
+        """ % AUTH_COOKIE_NAME
         st.components.v1.html(cookie_script, height=0)
         
         # st.rerun() 호출하여 즉시 로그인 페이지로 이동
@@ -429,6 +407,7 @@ st.caption(f"👤 로그인 사용자: {admin_id}")
 default_end = date.today() - timedelta(days=1)  # 어제까지 (당일 제외)
 default_start = default_end - timedelta(days=6)  # 최근 7일
 default_date_type = 'orderDate'  # 구매일이 기본값
+default_granularity = 'day'  # 일별 집계가 기본값
 # 예약상태는 항상 '전체'로 고정
 order_status = '전체'
 
@@ -439,43 +418,81 @@ def format_hotel_name(name, max_length=8):
         return name
     return name[:max_length] + "..."
 
-# 사이드바: 검색 조건
-with st.sidebar:
-    st.header("🔍 검색 조건")
-    
-    # 날짜 범위
-    st.subheader("날짜 범위")
-    
-    # 날짜유형 선택
-    date_type_options = get_date_type_options()
-    
-    # '전체' 옵션 제거
-    date_type_options = [opt for opt in date_type_options if opt != '전체']
-    
-    # 디버깅: 날짜유형 옵션이 제대로 로드되었는지 확인
-    if len(date_type_options) <= 1:
-        st.warning("⚠️ 날짜유형 데이터를 불러올 수 없습니다. master_data.xlsx의 date_types 시트를 확인하세요.")
-        # 기본값으로 하드코딩된 옵션 제공
-        date_type_options = ['useDate', 'orderDate']
-    
-    date_type_display = {opt: get_date_type_display_name(opt) 
-                         for opt in date_type_options}
+# 집계 보기 기준 컬럼 표시 이름과 날짜 형식
+PIVOT_LABEL_COLUMNS = {
+    'booking_date': ('일자', '%Y-%m-%d'),
+    'week_start': ('주 (월요일 시작)', '%Y-%m-%d'),
+    'month_start': ('월', '%Y-%m'),
+    'hotel_name': ('숙소명', None),
+    'channel_name': ('채널명', None),
+}
+
+# 집계 보기 합계 컬럼 표시 이름
+PIVOT_VALUE_COLUMNS = {
+    'booking_count': '예약건수',
+    'total_rooms': '총객실수',
+    'confirmed_rooms': '확정객실수',
+    'cancelled_rooms': '취소객실수',
+    'cancellation_rate': '취소율',
+    'total_deposit': '총 입금가',
+    'total_purchase': '총 실구매가',
+    'total_profit': '총 수익',
+    'profit_rate': '수익률 (%)',
+}
+
+# 상세 표 위젯 상태 (새 조회 결과가 저장되면 초기화)
+DETAIL_STATE_KEYS = ('detail_hotels', 'detail_channels', 'detail_page')
+
+def format_pivot_table(pivot_df):
+    """집계 보기 표시용 변환 (천단위 구분, 비율 % 표시, 컬럼명 한글화)"""
+    display = pd.DataFrame(index=pivot_df.index)
+    for column, (label, date_format) in PIVOT_LABEL_COLUMNS.items():
+        if column in pivot_df.columns:
+            values = pivot_df[column]
+            display[label] = values.dt.strftime(date_format) if date_format else values.fillna('-')
+    for column, label in PIVOT_VALUE_COLUMNS.items():
+        if column.endswith('_rate'):
+            display[label] = pivot_df[column].map('{:.1f}%'.format)
+        else:
+            display[label] = pivot_df[column].astype('int64').map('{:,}'.format)
+    return display
+
+# 조회 기간 최대 일수 (3개월)
+MAX_QUERY_DAYS = 90
+# 최대 선택 숙소 수
+MAX_SELECTED_HOTELS = 10
+
+def get_date_range_error(start_date, end_date, date_type):
+    """조회 기간 검증 (오류 메시지, 정상이면 None)"""
+    if date_type != 'useDate' and end_date >= date.today():
+        return "⚠️ 구매일 기준은 당일 데이터를 조회할 수 없습니다 (D-1까지만 조회 가능)."
+    if start_date > end_date:
+        return "⚠️ 시작일이 종료일보다 늦을 수 없습니다."
+    if (end_date - start_date).days + 1 > MAX_QUERY_DAYS:
+        return f"⚠️ 조회 기간은 최대 {MAX_QUERY_DAYS}일(3개월)까지 가능합니다."
+    return None
+
+def sidebar_fragment(func):
+    """
+    사이드바 입력 영역을 부분 rerun 단위로 실행
     
-    # 세션 상태 초기화
-    if 'date_type' not in st.session_state:
-        st.session_state.date_type = default_date_type
-    if 'start_date' not in st.session_state:
-        st.session_state.start_date = default_start
-    if 'end_date' not in st.session_state:
-        st.session_state.end_date = default_end
-    if 'selected_hotels' not in st.session_state:
-        st.session_state.selected_hotels = []
-    if 'search_term' not in st.session_state:
-        st.session_state.search_term = ''
+    st.fragment(또는 experimental_fragment)를 지원하는 Streamlit에서는 입력 변경 시 해당 함수만 다시 실행하고
+    (조회 결과 표시/엑셀 생성은 다시 실행하지 않음), 지원하지 않는 버전(고정 버전 1.29 포함)에서는 일반 함수로 실행
+    (날짜/집계 단위 입력은 버전과 관계없이 st.form으로 묶어 조회 버튼을 누를 때만 rerun)
+    """
+    fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+    return fragment(func) if fragment is not None else func
+
+def render_date_controls(date_type_options, date_type_display):
+    """
+    날짜유형/기간/집계 단위 입력 (st.form 안에서 호출, 제출된 값은 세션 상태에 저장하여 메인 영역에서 사용)
     
+    폼 안의 입력은 값을 바꿔도 rerun하지 않으므로 날짜유형에 따라 선택 범위를 바꾸지 않고
+    구매일 기준 당일 제외는 조회 시 검증 (get_date_range_error)
+    """
     # 세션 상태에서 날짜유형 인덱스 찾기
     date_type_index = 0
-    if 'date_type' in st.session_state and st.session_state.date_type in date_type_options:
+    if st.session_state.date_type in date_type_options:
         date_type_index = date_type_options.index(st.session_state.date_type)
     elif default_date_type in date_type_options:
         date_type_index = date_type_options.index(default_date_type)
@@ -492,27 +509,19 @@ with st.sidebar:
     # 세션 상태에 날짜유형 저장
     st.session_state.date_type = date_type
     
-    # 날짜 범위 설정: 날짜유형에 따라 다르게 설정
+    # 날짜 범위 설정: 90일 전 ~ 90일 후 (이용일 기준은 미래 날짜 가능, 구매일 기준은 어제까지 - 조회 시 검증)
     today = date.today()
     min_date = today - timedelta(days=90)  # 90일 전
-    
-    if date_type == 'useDate':
-        # 이용일(체크인) 기준: 미래 날짜도 선택 가능
-        max_date = today + timedelta(days=90)  # 90일 후
-        start_help = "이용일(체크인) 기준으로 조회합니다. 미래 날짜도 선택 가능합니다."
-        end_help = "이용일(체크인) 기준으로 조회합니다. 미래 날짜도 선택 가능합니다."
-    else:
-        # 구매일 기준: 어제까지만 선택 가능
-        max_date = today - timedelta(days=1)  # 어제까지
-        start_help = "구매일(예약일) 기준으로 조회합니다. 당일 데이터는 조회할 수 없습니다 (D-1까지만 조회 가능)"
-        end_help = "구매일(예약일) 기준으로 조회합니다. 당일 데이터는 조회할 수 없습니다 (D-1까지만 조회 가능)"
+    max_date = today + timedelta(days=90)  # 90일 후
+    date_help = ("이용일(체크인) 기준은 미래 날짜도 선택 가능합니다. "
+                 "구매일(예약일) 기준은 당일 데이터를 조회할 수 없습니다 (D-1까지만 조회 가능)")
     
     start_date = st.date_input(
         "시작일",
         value=st.session_state.start_date,
         min_value=min_date,
         max_value=max_date,
-        help=start_help,
+        help=date_help,
         key='start_date_input'
     )
     
@@ -521,7 +530,7 @@ with st.sidebar:
         value=st.session_state.end_date,
         min_value=min_date,
         max_value=max_date,
-        help=end_help,
+        help=date_help,
         key='end_date_input'
     )
     
@@ -529,21 +538,60 @@ with st.sidebar:
     st.session_state.start_date = start_date
     st.session_state.end_date = end_date
     
-    # 날짜 범위 검증
-    if start_date > end_date:
-        st.error("⚠️ 시작일이 종료일보다 늦을 수 없습니다.")
-        st.stop()
+    # 날짜 범위 검증 (조회 버튼에서 다시 확인)
+    date_range_error = get_date_range_error(start_date, end_date, date_type)
+    if date_range_error:
+        st.error(date_range_error)
+    else:
+        st.info(f"📅 조회 기간: {(end_date - start_date).days + 1}일")
     
-    # 최대 3개월 제한
-    max_days = 90
-    days_diff = (end_date - start_date).days + 1
-    if days_diff > max_days:
-        st.error(f"⚠️ 조회 기간은 최대 {max_days}일(3개월)까지 가능합니다.")
-        st.stop()
+    # 집계 단위 (주/월/기간 전체는 DB에서 묶어 조회하므로 결과 행 수가 줄어듦)
+    granularity_options = list(GRANULARITIES)
+    granularity = st.selectbox(
+        "집계 단위",
+        options=granularity_options,
+        index=granularity_options.index(st.session_state.granularity),
+        format_func=lambda x: GRANULARITIES[x],
+        help="일별 외 단위는 기간을 묶어 합계로 조회합니다. 주는 월요일 시작입니다.",
+        key='granularity_select'
+    )
+    st.session_state.granularity = granularity
+
+def get_hotel_label(hotel):
+    """검색 결과 표시 라벨 (숙소명 + 숙소코드)"""
+    return f"{hotel['name_kr']} ({hotel['product_code']})"
+
+def on_hotel_multiselect_change(hotel_by_label, previous_labels):
+    """검색 결과 선택 변경 - 추가/해제된 숙소를 선택 목록(idx 기준)에 반영 (위젯 콜백, 별도 rerun 없음)"""
+    selected_hotels = st.session_state.selected_hotels
+    labels = st.session_state.hotel_search_multiselect
     
-    st.info(f"📅 조회 기간: {days_diff}일")
+    # 선택 해제된 숙소 제거
+    for label in previous_labels:
+        if label not in labels:
+            selected_hotels.pop(hotel_by_label[label]['idx'], None)
     
-    # 숙소 검색
+    # 새로 선택된 숙소 추가 (최대 개수 초과분은 추가하지 않음 - 다음 실행에서 위젯 선택도 해제됨)
+    for label in labels:
+        hotel = hotel_by_label[label]
+        if hotel['idx'] in selected_hotels:
+            continue
+        if len(selected_hotels) < MAX_SELECTED_HOTELS:
+            selected_hotels[hotel['idx']] = hotel
+        else:
+            st.session_state.hotel_picker_notice = ('warning', f"⚠️ 최대 {MAX_SELECTED_HOTELS}개까지 선택 가능합니다.")
+
+def on_hotel_checkbox_change(hotel_idx):
+    """선택한 숙소 체크 해제 - 선택 목록에서 삭제 (위젯 콜백, 별도 rerun 없음)"""
+    if st.session_state.get(f"hotel_checkbox_{hotel_idx}", True):
+        return
+    removed_hotel = st.session_state.selected_hotels.pop(hotel_idx, None)
+    if removed_hotel is not None:
+        st.session_state.hotel_picker_notice = ('info', f"✅ '{removed_hotel.get('name_kr', 'Unknown')}' 선택 해제됨")
+
+@sidebar_fragment
+def render_hotel_picker():
+    """숙소 검색/선택 (선택 상태는 st.session_state.selected_hotels: idx -> 숙소 정보, 선택 순서 유지)"""
     st.subheader("숙소 검색")
     
     # 검색 입력창 (검색 버튼 삭제, 엔터키로만 검색)
@@ -570,7 +618,12 @@ with st.sidebar:
     if search_term_changed:
         if search_term and len(search_term.strip()) >= 2:
             with st.spinner("🔍 검색 중..."):
+                search_started = time.perf_counter()
                 search_results = search_hotels(search_term.strip(), limit=15)
+                log_access("INFO", "숙소 검색", admin_id=st.session_state.get('admin_id'),
+                          action='search_hotels',
+                          rows=len(search_results),
+                          duration_ms=round((time.perf_counter() - search_started) * 1000, 1))
                 st.session_state.search_results = search_results
                 st.session_state.last_search_term = search_term.strip()  # 공백 제거하여 저장
         else:
@@ -585,198 +638,329 @@ with st.sidebar:
     # 세션 상태에 검색어 저장
     st.session_state.search_term = search_term
     
+    selected_hotels = st.session_state.selected_hotels
+    
     # 검색 결과를 multiselect 형태로 표시 (선택된 숙소도 포함)
     if search_results:
-        # 이미 선택된 숙소의 idx 목록 (중복 선택 방지)
-        selected_hotel_indices = {h.get('idx') for h in st.session_state.selected_hotels if h.get('idx')}
-        
-        # 검색 결과를 옵션 리스트로 변환 (모든 검색 결과 포함)
-        hotel_options = []
-        hotel_dict = {}  # 옵션 라벨 -> hotel 객체 매핑
-        
-        for hotel in search_results:
-            hotel_label = f"{hotel['name_kr']} ({hotel['product_code']})"
-            hotel_options.append(hotel_label)
-            hotel_dict[hotel_label] = hotel
-        
-        # 이미 선택된 숙소의 라벨 추출 (체크 상태로 유지)
-        selected_labels_in_results = []
-        for hotel in st.session_state.selected_hotels:
-            hotel_label = f"{hotel['name_kr']} ({hotel['product_code']})"
-            if hotel_label in hotel_options:
-                selected_labels_in_results.append(hotel_label)
-        
-        # multiselect로 표시 (선택된 항목은 default에 포함하여 체크 상태 유지)
-        selected_hotel_labels = st.multiselect(
+        # 옵션 라벨 -> hotel 객체 매핑 (모든 검색 결과 포함)
+        hotel_by_label = {get_hotel_label(hotel): hotel for hotel in search_results}
+        
+        # 이미 선택된 숙소의 라벨 (체크 상태로 유지)
+        selected_labels_in_results = [label for label, hotel in hotel_by_label.items()
+                                      if hotel['idx'] in selected_hotels]
+        
+        # 위젯 선택 상태는 선택 목록 기준으로 맞추고(체크 해제/최대 개수 초과 반영), 선택 변경은 콜백에서 선택 목록에 반영
+        st.session_state.hotel_search_multiselect = selected_labels_in_results
+        st.multiselect(
             "검색 결과에서 숙소를 선택하세요",
-            options=hotel_options,
-            default=selected_labels_in_results,  # 선택된 항목을 체크 상태로 유지
+            options=list(hotel_by_label),
             help="숙소를 선택해주세요 (2개 이상 선택 가능)",
             key='hotel_search_multiselect',
-            placeholder="숙소를 선택해주세요 (2개 이상 선택 가능)"
+            placeholder="숙소를 선택해주세요 (2개 이상 선택 가능)",
+            on_change=on_hotel_multiselect_change,
+            args=(hotel_by_label, selected_labels_in_results)
         )
-        
-        # 선택된 숙소 업데이트
-        # 새로 선택된 숙소 추가
-        for label in selected_hotel_labels:
-            if label not in selected_labels_in_results:
-                hotel = hotel_dict[label]
-                # 중복 확인 (이미 선택된 숙소인지)
-                if not any(h.get('idx') == hotel['idx'] for h in st.session_state.selected_hotels):
-                    # 최대 10개 제한
-                    if len(st.session_state.selected_hotels) < 10:
-                        st.session_state.selected_hotels.append(hotel)
-                        st.rerun()
-                    else:
-                        st.warning("⚠️ 최대 10개까지 선택 가능합니다.")
-                        st.rerun()
-        
-        # 선택 해제된 숙소 제거
-        for label in selected_labels_in_results:
-            if label not in selected_hotel_labels:
-                hotel = hotel_dict[label]
-                st.session_state.selected_hotels = [h for h in st.session_state.selected_hotels if h.get('idx') != hotel['idx']]
-                st.rerun()
+    
+    # 콜백에서 남긴 안내 (1회 표시)
+    notice = st.session_state.pop('hotel_picker_notice', None)
+    if notice:
+        level, message = notice
+        (st.warning if level == 'warning' else st.info)(message)
     
     # 선택한 숙소 목록 (체크박스 형태, 체크 해제 시 삭제)
-    if st.session_state.selected_hotels:
+    if selected_hotels:
         st.markdown("---")
         st.write("**선택한 숙소 목록:**")
         
-        # 선택된 숙소를 체크박스 형태로 표시
-        hotels_to_remove = []
-        
-        for i, hotel in enumerate(st.session_state.selected_hotels):
+        for hotel_idx, hotel in list(selected_hotels.items()):
             hotel_name = hotel.get('name_kr', 'Unknown')
             hotel_name_short = format_hotel_name(hotel_name, max_length=8)
-            hotel_label = f"🏨 {hotel_name_short}"
             
-            # 체크박스 (기본값: True, 체크 해제 시 삭제)
-            is_checked = st.checkbox(
-                hotel_label,
+            # 체크박스 (기본값: True, 체크 해제 시 콜백에서 삭제)
+            st.checkbox(
+                f"🏨 {hotel_name_short}",
                 value=True,
-                key=f"hotel_checkbox_{hotel.get('idx')}_{i}",
-                help=f"{hotel_name} (클릭하여 선택 해제)"
+                key=f"hotel_checkbox_{hotel_idx}",
+                help=f"{hotel_name} (클릭하여 선택 해제)",
+                on_change=on_hotel_checkbox_change,
+                args=(hotel_idx,)
             )
-            
-            # 체크 해제 시 삭제 목록에 추가
-            if not is_checked:
-                hotels_to_remove.append(i)
-        
-        # 삭제 처리
-        if hotels_to_remove:
-            for idx in sorted(hotels_to_remove, reverse=True):
-                removed_hotel = st.session_state.selected_hotels.pop(idx)
-                st.info(f"✅ '{removed_hotel.get('name_kr', 'Unknown')}' 선택 해제됨")
-            st.rerun()
     else:
         st.warning("⚠️ 최소 1개 이상의 숙소를 선택해주세요.")
+
+# 사이드바: 검색 조건
+with st.sidebar:
+    st.header("🔍 검색 조건")
+    
+    # 날짜유형 선택
+    date_type_options = get_date_type_options()
+    
+    # '전체' 옵션 제거
+    date_type_options = [opt for opt in date_type_options if opt != '전체']
+    
+    # 디버깅: 날짜유형 옵션이 제대로 로드되었는지 확인
+    if len(date_type_options) <= 1:
+        st.warning("⚠️ 날짜유형 데이터를 불러올 수 없습니다. master_data.xlsx의 date_types 시트를 확인하세요.")
+        # 기본값으로 하드코딩된 옵션 제공
+        date_type_options = ['useDate', 'orderDate']
     
-    # 조회 및 초기화 버튼
+    date_type_display = {opt: get_date_type_display_name(opt) 
+                         for opt in date_type_options}
+    
+    # 세션 상태 초기화
+    if 'date_type' not in st.session_state:
+        st.session_state.date_type = default_date_type
+    if 'start_date' not in st.session_state:
+        st.session_state.start_date = default_start
+    if 'end_date' not in st.session_state:
+        st.session_state.end_date = default_end
+    if 'selected_hotels' not in st.session_state:
+        st.session_state.selected_hotels = {}
+    if 'search_term' not in st.session_state:
+        st.session_state.search_term = ''
+    if 'granularity' not in st.session_state:
+        st.session_state.granularity = default_granularity
+    
+    # 숙소 검색/선택 (선택 변경은 위젯 콜백으로 반영하므로 폼 밖에 배치)
+    render_hotel_picker()
+    
+    # 날짜 범위/집계 단위는 폼으로 묶어 조회/초기화 버튼을 누를 때만 rerun
+    # (입력 변경마다 조회 결과 표시/엑셀 생성까지 다시 실행하지 않음)
     st.markdown("---")
-    col1, col2 = st.columns(2)
-    with col1:
-        search_button = st.button("🔍 조회", type="primary", use_container_width=True)
-    with col2:
-        reset_button = st.button("🔄 초기화", use_container_width=True)
+    with st.form("search_conditions_form", clear_on_submit=False):
+        st.subheader("날짜 범위")
+        render_date_controls(date_type_options, date_type_display)
+        
+        # 조회 및 초기화 버튼
+        col1, col2 = st.columns(2)
+        with col1:
+            search_button = st.form_submit_button("🔍 조회", type="primary", use_container_width=True)
+        with col2:
+            reset_button = st.form_submit_button("🔄 초기화", use_container_width=True)
+    
+    # 입력값 (조회 버튼 클릭 시 제출된 값)
+    date_type = st.session_state.date_type
+    start_date = st.session_state.start_date
+    end_date = st.session_state.end_date
+    granularity = st.session_state.granularity
+    days_diff = (end_date - start_date).days + 1
     
     # 초기화 버튼 처리
     if reset_button:
         st.session_state.date_type = default_date_type
+        st.session_state.granularity = default_granularity
         st.session_state.start_date = default_start
         st.session_state.end_date = default_end
-        st.session_state.selected_hotels = []
+        st.session_state.selected_hotels = {}
         st.session_state.search_term = ''
         st.session_state.last_search_result = None
+        # 진행 중인 조회 작업 취소
+        if st.session_state.get('report_job'):
+            discard_job(st.session_state.pop('report_job')['job_id'])
         st.rerun()
 
 # 메인 영역
-# 조회 버튼이 클릭되었거나, 이전 조회 결과가 있는 경우 결과 표시
+# 조회 작업 진행 상황 확인 주기 (초, 처음 주기에서 두 배씩 늘려 최대 주기까지 - 작업이 끝나면 즉시 진행)
+REPORT_POLL_INTERVAL_SEC = 0.5
+REPORT_POLL_MAX_INTERVAL_SEC = 3.0
+
+def submit_hotel_report(start_date, end_date, selected_hotel_ids, date_type, granularity, days_diff,
+                        supersedes=None, refetched_key=None):
+    """
+    숙소별 리포트 백그라운드 작업 제출
+    
+    Args:
+        refetched_key: 보관소에서 삭제되어 다시 조회하는 결과의 키 (같은 결과는 1회만 다시 조회)
+    
+    Returns:
+        dict: 세션에 보관할 작업 정보 (작업 ID + 조회 조건)
+    """
+    job = submit_report_job(
+        fetch_hotel_report,
+        start_date,
+        end_date,
+        selected_hotel_ids=selected_hotel_ids,
+        date_type=date_type,
+        granularity=granularity,
+        name='hotel_report',
+        owner=admin_id,
+        total_steps=REPORT_STEPS,
+        supersedes=supersedes
+    )
+    return {
+        'job_id': job.id,
+        'submitted_at': time.time(),
+        'start_date': start_date,
+        'end_date': end_date,
+        'date_type': date_type,
+        'granularity': granularity,
+        'selected_hotel_ids': selected_hotel_ids,
+        'days_diff': days_diff,
+        'refetched_key': refetched_key
+    }
+
+# 조회 버튼이 클릭되었거나, 진행 중인 조회 작업 또는 이전 조회 결과가 있는 경우 결과 표시
 has_search_result = 'last_search_result' in st.session_state and st.session_state.last_search_result is not None
-should_show_result = search_button or has_search_result
+pending_report = st.session_state.get('report_job')
+should_show_result = search_button or has_search_result or pending_report is not None
 
 if should_show_result:
-    # 조회 버튼이 클릭된 경우에만 새로 조회
+    # 조회 버튼이 클릭된 경우 백그라운드 작업으로 새로 조회 (진행 중인 이전 작업은 취소)
     if search_button:
+        # 조회 기간 확인
+        date_range_error = get_date_range_error(start_date, end_date, date_type)
+        if date_range_error:
+            st.error(date_range_error)
+            st.stop()
+        
         # 선택된 숙소 확인
         if not st.session_state.selected_hotels:
             st.error("⚠️ 최소 1개 이상의 숙소를 선택해주세요.")
             st.stop()
         
         # 선택된 숙소 ID 리스트 추출
-        selected_hotel_ids = [hotel.get('idx') for hotel in st.session_state.selected_hotels if hotel.get('idx')]
+        selected_hotel_ids = [hotel_idx for hotel_idx in st.session_state.selected_hotels if hotel_idx]
         
         if not selected_hotel_ids:
             st.error("⚠️ 선택된 숙소가 없습니다. 숙소를 선택해주세요.")
             st.stop()
         
-        # 데이터 조회 (로딩 표시: st.spinner 사용 - 접기/펼치기 없음)
-        try:
-            with st.spinner("🔄 데이터를 조회하는 중..."):
-                # 로깅: 데이터 조회 시작
-                log_access("INFO", "숙소별 데이터 조회 시작", admin_id=admin_id, 
-                          기간=f"{start_date}~{end_date}", 
-                          숙소수=len(selected_hotel_ids),
-                          날짜유형=date_type)
-                
-                df = fetch_hotel_data(
-                    start_date=start_date,
-                    end_date=end_date,
-                    selected_hotel_ids=selected_hotel_ids,
-                    date_type=date_type,
-                    order_status='전체'  # 항상 '전체'로 고정
-                )
-                
-                # 요약 통계 조회
-                summary_stats = fetch_hotel_summary_stats(
-                    start_date, 
-                    end_date, 
-                    selected_hotel_ids=selected_hotel_ids,
-                    date_type=date_type,
-                    order_status='전체'  # 항상 '전체'로 고정
-                )
-                
-                # 조회 결과를 세션 상태에 저장
-                st.session_state.last_search_result = {
-                    'df': df,
-                    'summary_stats': summary_stats,
-                    'start_date': start_date,
-                    'end_date': end_date,
-                    'date_type': date_type,
-                    'order_status': '전체',
-                    'selected_hotel_ids': selected_hotel_ids,
-                    'days_diff': days_diff
-                }
-                
-                # 로깅: 데이터 조회 완료
-                log_access("INFO", "숙소별 데이터 조회 완료", admin_id=admin_id, 
-                          결과건수=len(df))
-                
-        except Exception as e:
-            # 에러 로깅
-            log_error("ERROR", "숙소별 데이터 조회 중 오류 발생", exception=e, admin_id=admin_id,
-                     기간=f"{start_date}~{end_date}", 숙소수=len(selected_hotel_ids))
-            
-            st.error(f"❌ 데이터 조회 중 오류가 발생했습니다: {e}")
-            st.exception(e)
+        # 로깅: 데이터 조회 시작
+        log_access("INFO", "숙소별 데이터 조회 시작", admin_id=admin_id, 
+                  action='fetch_hotel_data_start',
+                  기간=f"{start_date}~{end_date}", 
+                  숙소수=len(selected_hotel_ids),
+                  날짜유형=date_type,
+                  집계단위=granularity)
+        
+        pending_report = submit_hotel_report(
+            start_date, end_date, selected_hotel_ids, date_type, granularity, days_diff,
+            supersedes=pending_report['job_id'] if pending_report else None
+        )
+        st.session_state.report_job = pending_report
+    
+    # 진행 중인 조회 작업 확인
+    report_finished = False
+    if pending_report is not None:
+        job = get_job(pending_report['job_id'])
+        
+        if job is not None and not job.finished:
+            # 작업이 끝날 때까지 진행 상황 표시만 갱신 (스크립트 전체를 다시 실행하지 않음)
+            # 취소 버튼 등 위젯 조작 시에는 다음 진행 상황 갱신에서 Streamlit이 이 실행을 중단하고 rerun
+            if st.button("⏹️ 조회 취소", key="cancel_report_job"):
+                cancel_job(job.id)
+                st.rerun()
+            progress_placeholder = st.empty()
+            poll_interval = REPORT_POLL_INTERVAL_SEC
+            while True:
+                progress_placeholder.progress(job.step / job.total_steps,
+                                              text=f"🔄 데이터를 조회하는 중... ({job.progress}, {job.elapsed:.0f}초)")
+                if job.wait(poll_interval):
+                    break
+                # 폴링 시각 갱신 (버려진 작업으로 취소되지 않도록)
+                get_job(job.id)
+                poll_interval = min(poll_interval * 2, REPORT_POLL_MAX_INTERVAL_SEC)
+            progress_placeholder.empty()
+        
+        # 작업 종료 (완료/실패/취소) 또는 보관 기간 경과 - 세션에서 작업 정리
+        del st.session_state['report_job']
+        discard_job(pending_report['job_id'])
+        selected_hotel_ids = pending_report['selected_hotel_ids']
+        
+        if job is not None and job.state == STATE_DONE:
+            df = job.result['df']
+            summary_stats = job.result['summary_stats']
+            start_date = pending_report['start_date']
+            end_date = pending_report['end_date']
+            date_type = pending_report['date_type']
+            granularity = pending_report.get('granularity', 'day')
+            days_diff = pending_report['days_diff']
             
-            df = pd.DataFrame()
-            summary_stats = {
-                'total_bookings': 0,
-                'total_revenue': 0,
-                'hotel_count': 0,
-                'active_days': 0
+            # 조회 결과는 공용 보관소에 저장하고 세션에는 키와 조회 조건만 저장
+            # (같은 결과는 세션끼리 공유, 보관소에서 삭제되면 조회 조건으로 다시 조회)
+            stored_result = put_result({
+                'start_date': start_date,
+                'end_date': end_date,
+                'date_type': date_type,
+                'granularity': granularity,
+                'selected_hotel_ids': selected_hotel_ids
+            }, df, summary_stats)
+            df = stored_result['df']
+            st.session_state.last_search_result = {
+                'result_key': stored_result['key'],
+                'start_date': start_date,
+                'end_date': end_date,
+                'date_type': date_type,
+                'granularity': granularity,
+                'order_status': '전체',
+                'selected_hotel_ids': selected_hotel_ids,
+                'days_diff': days_diff,
+                # 다시 조회한 결과가 같은 키로 또 삭제되면 반복 조회하지 않음
+                'refetched_key': pending_report.get('refetched_key')
             }
+            # 상세 표 필터/페이지는 새 결과 기준으로 다시 시작
+            for detail_key in DETAIL_STATE_KEYS:
+                st.session_state.pop(detail_key, None)
+            report_finished = True
+            
+            # 로깅: 데이터 조회 완료
+            log_access("INFO", "숙소별 데이터 조회 완료", admin_id=admin_id, 
+                      action='fetch_hotel_data',
+                      결과건수=len(df),
+                      rows=len(df),
+                      duration_ms=round((job.finished_at - pending_report['submitted_at']) * 1000, 1),
+                      hotel_ids=selected_hotel_ids,
+                      days=days_diff,
+                      date_type=date_type,
+                      granularity=granularity)
+        elif job is not None and job.state == STATE_FAILED:
+            # 에러 로깅
+            log_error("ERROR", "숙소별 데이터 조회 중 오류 발생", exception=job.error, admin_id=admin_id,
+                     기간=f"{pending_report['start_date']}~{pending_report['end_date']}", 숙소수=len(selected_hotel_ids))
+            
+            st.error(f"❌ 데이터 조회 중 오류가 발생했습니다: {job.error}")
+            st.exception(job.error)
             st.session_state.last_search_result = None
-    else:
+        elif job is not None and job.state == STATE_CANCELLED:
+            st.info("⏹️ 조회가 취소되었습니다.")
+        else:
+            st.warning("⚠️ 조회 작업 정보가 만료되었습니다. 다시 조회해주세요.")
+        
+        # 보관소에서 삭제된 결과를 다시 조회하던 작업이 취소/만료된 경우 이전 결과도 버림
+        # (남겨 두면 아래에서 삭제된 결과로 판단하여 바로 다시 조회하므로 취소가 유지되지 않음)
+        if pending_report.get('refetched_key') and not report_finished:
+            st.session_state.last_search_result = None
+    
+    if not report_finished:
         # 이전 조회 결과 사용
+        record_cache('report_result', st.session_state.last_search_result is not None)
         if st.session_state.last_search_result is not None:
             result = st.session_state.last_search_result
-            df = result['df']
-            summary_stats = result['summary_stats']
+            stored_result = get_result(result['result_key'])
+            if stored_result is None and result.get('refetched_key') == result['result_key']:
+                # 같은 결과를 이미 한 번 다시 조회함 - 반복 조회하지 않고 새로 조회하도록 안내
+                st.session_state.last_search_result = None
+                st.warning("⚠️ 이전 조회 결과가 만료되었습니다. 다시 조회해주세요.")
+                st.stop()
+            if stored_result is None:
+                # 보관소에서 삭제된 결과 - 같은 조건으로 1회만 다시 조회 (완료되면 새 결과로 교체)
+                log_access("INFO", "보관소에서 삭제된 조회 결과 다시 조회", admin_id=admin_id,
+                          action='fetch_hotel_data_refetch',
+                          기간=f"{result['start_date']}~{result['end_date']}",
+                          숙소수=len(result['selected_hotel_ids']))
+                result['refetched_key'] = result['result_key']
+                st.session_state.report_job = submit_hotel_report(
+                    result['start_date'], result['end_date'], result['selected_hotel_ids'],
+                    result['date_type'], result.get('granularity', 'day'), result['days_diff'],
+                    refetched_key=result['result_key']
+                )
+                st.rerun()
+            df = stored_result['df']
+            summary_stats = stored_result['summary_stats']
             start_date = result['start_date']
             end_date = result['end_date']
             date_type = result['date_type']
+            granularity = result.get('granularity', 'day')
             order_status = result['order_status']  # '전체'
             days_diff = result['days_diff']
         else:
@@ -834,84 +1018,82 @@ if should_show_result:
         # 데이터 테이블 표시
         st.subheader("📋 상세 데이터")
         
-        # 상위 10개만 표시 안내
-        total_rows = len(df)
-        if total_rows > 10:
-            st.info(f"📊 상위 10개만 표시됩니다. 전체 데이터는 엑셀 다운로드를 이용하세요. (전체 {total_rows}개)")
-        
-        # 데이터 포맷팅
-        display_df = df.copy()
-        
-        # 날짜 컬럼명 결정
-        date_col_name = '구매일(예약일)' if date_type == 'orderDate' else '이용일(체크인)'
-        
-        # 날짜 포맷팅
-        display_df['booking_date'] = pd.to_datetime(display_df['booking_date']).dt.strftime('%Y-%m-%d')
-        
-        # 컬럼명 한글화 및 순서 정리
-        column_mapping = {
-            'booking_date': date_col_name,
-            'hotel_name': '숙소명',
-            'channel_name': '채널명',
-            'booking_count': '예약건수',
-            'total_rooms': '총객실수',
-            'confirmed_rooms': '확정객실수',
-            'cancelled_rooms': '취소객실수',
-            'cancellation_rate': '취소율',
-            'total_deposit': '총 입금가',
-            'total_purchase': '총 실구매가',
-            'total_profit': '총 수익',
-            'profit_rate': '수익률 (%)'
-        }
-        
-        # 존재하는 컬럼만 매핑
-        for old_col, new_col in column_mapping.items():
-            if old_col in display_df.columns:
-                display_df = display_df.rename(columns={old_col: new_col})
-        
-        # 컬럼 순서 정리
-        desired_order = [
-            date_col_name,
-            '숙소명',
-            '채널명',
-            '예약건수',
-            '총객실수',
-            '확정객실수',
-            '취소객실수',
-            '취소율',
-            '총 입금가',
-            '총 실구매가',
-            '총 수익',
-            '수익률 (%)'
-        ]
-        
-        # 존재하는 컬럼만 선택
-        final_cols = [col for col in desired_order if col in display_df.columns]
-        display_df = display_df[final_cols]
-        
-        # 숫자 포맷팅 (천단위 구분, 숫자만 표시)
-        numeric_cols = ['예약건수', '총객실수', '확정객실수', '취소객실수', '총 입금가', '총 실구매가', '총 수익']
-        for col in numeric_cols:
-            if col in display_df.columns:
-                display_df[col] = display_df[col].apply(lambda x: f"{int(x):,}" if pd.notna(x) else "0")
-        
-        # 취소율 포맷팅 (소수점 1자리, % 표시)
-        if '취소율' in display_df.columns:
-            display_df['취소율'] = display_df['취소율'].apply(
-                lambda x: f"{float(x):.1f}%" if pd.notna(x) else "0.0%"
+        # 필터/정렬 (세션의 타입 정리된 결과에서 처리, 화면에는 현재 페이지만 포맷하여 표시)
+        filter_col1, filter_col2 = st.columns(2)
+        with filter_col1:
+            detail_hotels = st.multiselect(
+                "숙소 필터",
+                options=sorted(df['hotel_name'].dropna().unique()),
+                key='detail_hotels',
+                placeholder="전체 숙소"
+            )
+        with filter_col2:
+            detail_channels = st.multiselect(
+                "채널 필터",
+                options=sorted(df['channel_name'].dropna().unique()),
+                key='detail_channels',
+                placeholder="전체 채널"
             )
         
-        # 수익률 포맷팅 (소수점 1자리)
-        if '수익률 (%)' in display_df.columns:
-            display_df['수익률 (%)'] = display_df['수익률 (%)'].apply(
-                lambda x: f"{float(x):.1f}%" if pd.notna(x) else "0.0%"
+        sort_col1, sort_col2, sort_col3 = st.columns([2, 1, 1])
+        with sort_col1:
+            detail_sort = st.selectbox(
+                "정렬 기준",
+                options=list(DETAIL_SORT_COLUMNS),
+                format_func=lambda column: DETAIL_SORT_COLUMNS[column],
+                key='detail_sort'
             )
+        with sort_col2:
+            detail_ascending = st.radio(
+                "정렬 순서",
+                options=[False, True],
+                format_func=lambda ascending: "오름차순" if ascending else "내림차순",
+                horizontal=True,
+                key='detail_ascending'
+            )
+        with sort_col3:
+            page_size = st.selectbox("페이지당 행 수", options=list(DETAIL_PAGE_SIZES), key='detail_page_size')
+        
+        detail_df = sort_result(filter_result(df, detail_hotels, detail_channels), detail_sort, detail_ascending)
+        total_rows = len(detail_df)
+        page_count = get_page_count(total_rows, page_size)
+        
+        # 새 조회/필터 변경으로 페이지 수가 줄어든 경우 첫 페이지로 (위젯 생성 전에만 변경 가능)
+        if st.session_state.get('detail_page', 1) > page_count:
+            st.session_state.detail_page = 1
+        page = st.number_input("페이지", min_value=1, max_value=page_count, step=1, key='detail_page')
+        page_df = get_page(detail_df, page, page_size)
         
-        # 상위 10개만 표시
-        display_df_top10 = display_df.head(10)
+        first_row = (page - 1) * page_size + 1 if total_rows else 0
+        last_row = first_row + len(page_df) - 1 if total_rows else 0
+        st.caption(f"전체 {total_rows:,}행 중 {first_row:,}~{last_row:,}행 ({page:,}/{page_count:,} 페이지)")
         
         st.dataframe(
-            display_df_top10,
+            format_detail_page(page_df, date_type, granularity, end_date),
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        # 집계 보기 (세션의 조회 결과를 다시 묶어 합계, DB 조회 없음)
+        st.markdown("---")
+        st.subheader("📊 집계 보기")
+        # 조회 집계 단위보다 작거나 경계가 다른 시간 기준은 제외 (이전 조회에서 선택한 기준도 정리)
+        pivot_options = get_pivot_dimensions(granularity)
+        if 'pivot_dimensions' in st.session_state:
+            st.session_state.pivot_dimensions = [key for key in st.session_state.pivot_dimensions
+                                                 if key in pivot_options]
+        pivot_dimensions = st.multiselect(
+            "집계 기준",
+            options=list(pivot_options),
+            default=['hotel'],
+            format_func=lambda key: pivot_options[key],
+            key='pivot_dimensions',
+            help="선택한 순서대로 묶어 합계를 계산합니다. 취소율/수익률은 합계 기준으로 다시 계산됩니다."
+        )
+        pivot_df = get_result_pivot(stored_result, pivot_dimensions)
+        st.caption(f"{len(pivot_df):,}행")
+        st.dataframe(
+            format_pivot_table(pivot_df),
             use_container_width=True,
             hide_index=True
         )
@@ -932,11 +1114,27 @@ if should_show_result:
         }
         
         try:
-            excel_data, filename = create_hotel_excel_download(
-                df=df,  # 전체 데이터 (엑셀에는 전체 포함)
-                summary_stats=summary_for_excel,
-                date_type=date_type
-            )
+            # 같은 결과의 엑셀은 보관소 결과에 저장하여 rerun마다 다시 만들지 않음 (파일 크기는 보관소 크기에 포함)
+            excel_key = (summary_for_excel['date_type'], granularity)
+            excel_export = stored_result['exports'].get(excel_key)
+            record_cache('excel_export', excel_export is not None)
+            if excel_export is None:
+                excel_started = time.perf_counter()
+                excel_export = create_hotel_excel_download(
+                    df=df,  # 전체 데이터 (엑셀에는 전체 포함)
+                    summary_stats=summary_for_excel,
+                    date_type=date_type,
+                    granularity=granularity
+                )
+                
+                # 엑셀 생성 로깅
+                log_access("INFO", "엑셀 다운로드", admin_id=admin_id, action='excel_build',
+                          파일명=excel_export[1],
+                          rows=len(df),
+                          size_bytes=len(excel_export[0]),
+                          duration_ms=round((time.perf_counter() - excel_started) * 1000, 1))
+                excel_export = add_to_result(stored_result, 'exports', excel_key, excel_export, len(excel_export[0]))
+            excel_data, filename = excel_export
             
             st.download_button(
                 label="📥 엑셀 파일 다운로드",
@@ -945,9 +1143,6 @@ if should_show_result:
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
             )
-            
-            # 엑셀 다운로드 로깅
-            log_access("INFO", "엑셀 다운로드", admin_id=admin_id, 파일명=filename)
         except Exception as e:
             log_error("ERROR", "엑셀 다운로드 실패", exception=e, admin_id=admin_id)
             st.error(f"❌ 엑셀 다운로드 중 오류가 발생했습니다: {e}")
@@ -965,11 +1160,12 @@ if should_show_result:
             4. **조회**: '조회' 버튼을 클릭하여 데이터를 조회합니다
             5. **초기화**: '초기화' 버튼을 클릭하여 모든 필터를 기본값으로 되돌립니다
             6. **엑셀 다운로드**: 조회 결과를 엑셀 파일로 다운로드할 수 있습니다
+            7. **집계 보기**: 숙소별/채널별/주별/월별 등 원하는 기준으로 조회 결과를 다시 묶어 볼 수 있습니다
             
             **주의사항:**
             - 구매일 기준 조회 시 당일 데이터는 조회할 수 없습니다 (D-1까지만 조회 가능)
             - 조회 기간은 최대 90일(3개월)까지 가능합니다
-            - 상세 데이터는 상위 10개만 표시되며, 전체 데이터는 엑셀 다운로드를 이용하세요
+            - 상세 데이터는 숙소/채널 필터와 정렬을 적용해 페이지 단위로 표시되며, 전체 데이터는 엑셀 다운로드를 이용하세요
             - 예약상태는 상세 데이터에서 확인할 수 있습니다 (확정/취소 객실수, 취소율)
             """)
 
@@ -989,7 +1185,7 @@ else:
     **주의사항**:
     - 당일 데이터는 조회할 수 없습니다 (D-1까지만 조회 가능)
     - 조회 기간은 최대 90일(3개월)까지 가능합니다
-    - 상세 데이터는 상위 10개만 표시되며, 전체 데이터는 엑셀 다운로드를 이용하세요
+    - 상세 데이터는 숙소/채널 필터와 정렬을 적용해 페이지 단위로 표시되며, 전체 데이터는 엑셀 다운로드를 이용하세요
     - 예약상태는 상세 데이터에서 확인할 수 있습니다 (확정/취소 객실수, 취소율)
     """)
 
@@ -0,0 +1,128 @@
+# benchmarks/engines.py
+"""통계 조회 엔진 벤치마크 (MySQL vs DuckDB Parquet 스냅샷)
+- 7/30/90일 기간별로 fetch_hotel_data를 엔진마다 실행하여 소요 시간과 결과 합계를 비교
+- 종료일 기본값은 스냅샷의 마지막 마감일 (두 엔진이 같은 데이터를 보도록)
+- --engines duckdb만 지정하면 MySQL 없이 스냅샷만으로 실행 (오프라인 벤치마크)
+
+MySQL 결과는 스냅샷 생성 이후 변경된 주문(늦은 취소 등)만큼 다를 수 있음
+
+사용법:
+    python -m benchmarks.engines
+    python -m benchmarks.engines --days 7 30 90 --runs 3 --date-type useDate
+    python -m benchmarks.engines --engines duckdb --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+# 프로젝트 루트 경로 추가
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from utils.data_fetcher_hotel import fetch_hotel_data
+from utils.duckdb_engine import read_manifest
+
+ENGINES = ('mysql', 'duckdb')
+
+# 엔진 간 일치 여부를 확인할 합계 컬럼
+_TOTAL_COLUMNS = ('booking_count', 'total_rooms', 'confirmed_rooms', 'cancelled_rooms',
+                  'total_deposit', 'total_purchase')
+
+
+def measure(engine: str, start_date, end_date, hotel_ids, date_type: str) -> dict:
+    """엔진 1개로 fetch_hotel_data 1회 실행 (HOTEL_STATS_ENGINE을 이 프로세스에서만 전환)"""
+    os.environ['HOTEL_STATS_ENGINE'] = engine
+    started = time.perf_counter()
+    # 날짜 분할 없이 단일 쿼리끼리 비교
+    df = fetch_hotel_data(start_date, end_date, selected_hotel_ids=hotel_ids, date_type=date_type, shards=1)
+    wall = time.perf_counter() - started
+    return {
+        'wall_s': wall,
+        'rows': len(df),
+        'totals': {column: int(df[column].sum()) if not df.empty else 0 for column in _TOTAL_COLUMNS},
+    }
+
+
+def run(days_list, engines, runs: int, hotel_ids=None, date_type: str = 'orderDate', end_date: date = None) -> list:
+    """
+    기간 x 엔진 조합별 측정 (중앙값)
+    
+    Returns:
+        list: [{'days', 'engine', 'wall_ms', 'rows', 'totals', 'speedup', 'matches'}]
+    """
+    manifest = read_manifest()
+    if end_date is None:
+        if manifest is None:
+            raise RuntimeError("Parquet 스냅샷이 없습니다 (python -m tools.export_parquet_snapshot)")
+        end_date = date.fromisoformat(manifest['covers_until'])
+    
+    results = []
+    for days in days_list:
+        start_date = end_date - timedelta(days=days - 1)
+        samples = {engine: [] for engine in engines}
+        for engine in engines:
+            # 워밍업 (MySQL 버퍼 풀, DuckDB Parquet 메타데이터)
+            measure(engine, start_date, end_date, hotel_ids, date_type)
+        for _ in range(runs):
+            for engine in engines:
+                samples[engine].append(measure(engine, start_date, end_date, hotel_ids, date_type))
+        
+        baseline = None
+        for engine in engines:
+            measured = samples[engine]
+            wall_ms = statistics.median(m['wall_s'] for m in measured) * 1000
+            if baseline is None:
+                baseline = (wall_ms, measured[0]['totals'])
+            results.append({
+                'days': days,
+                'engine': engine,
+                'wall_ms': round(wall_ms, 1),
+                'rows': measured[0]['rows'],
+                'totals': measured[0]['totals'],
+                'speedup': round(baseline[0] / wall_ms, 2) if wall_ms else 0.0,
+                'matches': measured[0]['totals'] == baseline[1],
+            })
+    return results
+
+
+def print_report(results: list):
+    """측정 결과 표 출력"""
+    print("=" * 72)
+    print("⏱️  통계 조회 엔진 벤치마크 (speedup: 첫 번째 엔진 대비 배속, 합계: 첫 번째 엔진과 비교)")
+    print("=" * 72)
+    print(f"  {'기간':>6}{'엔진':>8}{'wall(ms)':>12}{'rows':>10}{'speedup':>10}{'합계':>8}")
+    for r in results:
+        print(f"  {r['days']:>5}일{r['engine']:>8}{r['wall_ms']:>12,.1f}{r['rows']:>10,}{r['speedup']:>9.2f}x"
+              f"{'일치' if r['matches'] else '불일치':>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MySQL / DuckDB 스냅샷 통계 조회 시간 비교")
+    parser.add_argument('--days', type=int, nargs='+', default=[7, 30, 90], help="조회 기간 (기본값: 7 30 90)")
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=ENGINES,
+                        help="비교할 엔진 (기본값: mysql duckdb, 첫 번째가 기준)")
+    parser.add_argument('--runs', type=int, default=3, help="조합별 측정 횟수 (기본값: 3, 중앙값 사용)")
+    parser.add_argument('--hotel-ids', type=int, nargs='*', help="숙소 ID (기본값: 전체 숙소)")
+    parser.add_argument('--date-type', default='orderDate', choices=['orderDate', 'useDate'], help="날짜유형")
+    parser.add_argument('--end-date', type=date.fromisoformat, help="종료일 (기본값: 스냅샷의 마지막 마감일)")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    
+    results = run(args.days, args.engines, args.runs, args.hotel_ids or None, args.date_type, args.end_date)
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
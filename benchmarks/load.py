@@ -0,0 +1,389 @@
+# benchmarks/load.py
+"""동시 접속 부하 테스트 (Streamlit AppTest)
+- 가상 사용자 N명이 app_v1.1_hotel.py를 AppTest 세션으로 실행하며 실제 사용 흐름을 반복
+  open: 첫 화면 (로그인 페이지)
+  login: 로그인 폼 제출
+  search: 숙소 검색 (엔터 입력, --days 지정 시 조회 기간도 함께 변경)
+  select: 검색 결과에서 숙소 선택
+  report: 조회 버튼 클릭 ~ 결과 화면 (백그라운드 작업 대기, 첫 엑셀 생성 포함)
+  download: 엑셀 다운로드 버튼 클릭 (Streamlit 1.29는 다운로드 클릭 시 rerun)
+- 모든 세션이 한 프로세스에서 실행되므로 DB 커넥션 풀, 리포트 작업 풀, 조회 결과 보관소를 워커 1개처럼 공유
+- 단계별 p50/p95/p99, 오류 수, 프로세스 CPU/RSS, DB 커넥션 사용량(풀 크기, 최대 사용 연결 수) 출력
+- CPU/RSS에는 AppTest 자체 비용(위젯 트리 처리)이 포함되므로 실제 워커보다 다소 높게 측정됨
+- 실패한 단계가 있으면 종료 코드 1
+
+로컬 대체 DB에서 실행 (tools/generate_synthetic_data.py로 생성, 로그인 계정 bench01~):
+  .env의 DB: 로컬 MySQL/MariaDB (로그인/숙소 검색은 항상 MySQL)
+  --engine duckdb: 통계 조회만 HOTEL_STATS_PARQUET_DIR의 Parquet 스냅샷 사용
+
+사용법:
+    python -m benchmarks.load --users 10 --iterations 3
+    python -m benchmarks.load --users 20 --ramp-up 10 --think-time 1 --admin-ids bench01 bench02 bench03
+    python -m benchmarks.load --users 5 --engine duckdb --days 30 --hotels 5 --output load.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 경로 추가
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from config.configdb import get_pool_status
+from utils.result_store import get_store_stats
+
+APP_PATH = os.path.join(_project_root, 'app_v1.1_hotel.py')
+
+STEPS = ('open', 'login', 'search', 'select', 'report', 'download')
+
+# 숙소 검색어 기본값 (합성 데이터의 지역명/숙소코드)
+DEFAULT_SEARCH_TERMS = ('서울', '부산', '제주')
+
+PERCENTILES = (50, 95, 99)
+
+
+def _check(at, step: str):
+    """스크립트 예외 또는 오류 메시지(st.error)가 있으면 RuntimeError"""
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].value}")
+    if at.error:
+        raise RuntimeError(f"{step}: {at.error[0].value}")
+
+
+def _button(at, label: str):
+    """라벨로 버튼 찾기 (key가 없는 버튼용)"""
+    for button in at.button:
+        if button.label == label:
+            return button
+    raise RuntimeError(f"버튼을 찾을 수 없습니다: {label}")
+
+
+def _state(at, name: str, default=None):
+    return at.session_state[name] if name in at.session_state else default
+
+
+def run_session(admin_id: str, password: str, search_term: str, hotels: int = 3, days: int = None,
+                timeout: float = 30.0, report_timeout: float = 300.0, think_time: float = 0.0) -> list:
+    """
+    가상 사용자 세션 1회 실행 (open -> login -> search -> select -> report -> download)
+    
+    Args:
+        admin_id / password: 로그인 계정
+        search_term: 숙소 검색어
+        hotels: 검색 결과에서 선택할 숙소 수
+        days: 조회 기간 (None이면 앱 기본값)
+        timeout: 단계별 스크립트 실행 제한 시간 (초)
+        report_timeout: 조회 단계 제한 시간 (초, 백그라운드 작업 대기 포함)
+        think_time: 단계 사이 대기 시간 (초, 측정 제외)
+    
+    Returns:
+        list: 단계별 [{'step', 'ms', 'error'}] (실패한 단계 이후는 실행하지 않음)
+    """
+    from streamlit.testing.v1 import AppTest
+    
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    
+    def open_app():
+        at.run()
+        _check(at, 'open')
+    
+    def login():
+        at.text_input[0].input(admin_id)
+        at.text_input[1].input(password)
+        _button(at, "로그인").click()
+        at.run()
+        _check(at, 'login')
+        if not _state(at, 'authenticated', False):
+            raise RuntimeError("login: 로그인되지 않았습니다")
+    
+    def search():
+        if days:
+            end_date = _state(at, 'end_date')
+            at.date_input(key='start_date_input').set_value(end_date - timedelta(days=days - 1))
+        at.text_input(key='hotel_search_input').input(search_term)
+        at.run()
+        _check(at, 'search')
+        if not _state(at, 'search_results'):
+            raise RuntimeError(f"search: 검색 결과가 없습니다 ({search_term})")
+    
+    def select():
+        multiselect = at.multiselect(key='hotel_search_multiselect')
+        multiselect.set_value(multiselect.options[:hotels])
+        at.run()
+        _check(at, 'select')
+        if not _state(at, 'selected_hotels'):
+            raise RuntimeError("select: 선택된 숙소가 없습니다")
+    
+    def report():
+        deadline = time.monotonic() + report_timeout
+        _button(at, "🔍 조회").click()
+        at.run(timeout=report_timeout)
+        # 진행 중에는 앱이 같은 실행에서 작업 종료를 기다리지만, 실행이 끊긴 경우에도 작업이 끝날 때까지 다시 실행
+        while _state(at, 'report_job') is not None:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"report: {report_timeout:.0f}초 안에 조회가 끝나지 않았습니다")
+            at.run(timeout=report_timeout)
+        _check(at, 'report')
+        if _state(at, 'last_search_result') is None:
+            raise RuntimeError("report: 조회 결과가 없습니다")
+    
+    def download():
+        if not at.get('download_button'):
+            raise RuntimeError("download: 조회된 데이터가 없어 다운로드 버튼이 없습니다")
+        at.run()
+        _check(at, 'download')
+    
+    records = []
+    for step, action in zip(STEPS, (open_app, login, search, select, report, download)):
+        if records and think_time > 0:
+            time.sleep(think_time)
+        started = time.perf_counter()
+        error = None
+        try:
+            action()
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        records.append({'step': step, 'ms': round((time.perf_counter() - started) * 1000, 1), 'error': error})
+        if error:
+            break
+    return records
+
+
+def _read_rss_bytes():
+    """현재 프로세스 RSS (Linux /proc, 그 외에는 최대 RSS, 측정 불가 시 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+class ResourceMonitor:
+    """프로세스 CPU/RSS, DB 커넥션 풀, 조회 결과 보관소 크기를 주기적으로 기록 (백그라운드 스레드)"""
+    
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.samples = []
+        self._pools = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_at = self._last_wall = None
+        self._started_cpu = self._last_cpu = None
+    
+    def start(self):
+        self._started_at = self._last_wall = time.perf_counter()
+        self._started_cpu = self._last_cpu = time.process_time()
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name='load-monitor', daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> dict:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return self.summary()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def _sample(self):
+        wall, cpu = time.perf_counter(), time.process_time()
+        elapsed = wall - self._last_wall
+        self.samples.append({
+            'at': round(wall - self._started_at, 2),
+            # 여러 코어를 사용하면 100%를 넘을 수 있음
+            'cpu_percent': round((cpu - self._last_cpu) / elapsed * 100, 1) if elapsed > 0 else 0.0,
+            'rss_bytes': _read_rss_bytes(),
+            'result_store_bytes': get_store_stats()['bytes'],
+        })
+        self._last_wall, self._last_cpu = wall, cpu
+        
+        for pool in get_pool_status():
+            peak = self._pools.setdefault(pool['engine'], {'engine': pool['engine'], 'size': pool['size'],
+                                                           'peak_checked_out': 0, 'peak_overflow': 0})
+            peak['peak_checked_out'] = max(peak['peak_checked_out'], pool['checked_out'])
+            peak['peak_overflow'] = max(peak['peak_overflow'], pool['overflow'])
+    
+    def summary(self) -> dict:
+        cpu = [sample['cpu_percent'] for sample in self.samples[1:]] or [0.0]
+        rss = [sample['rss_bytes'] for sample in self.samples if sample['rss_bytes'] is not None]
+        wall = time.perf_counter() - self._started_at
+        cpu_seconds = time.process_time() - self._started_cpu
+        return {
+            'cpu_seconds': round(cpu_seconds, 2),
+            'cpu_avg_percent': round(cpu_seconds / wall * 100, 1) if wall > 0 else 0.0,
+            'cpu_peak_percent': max(cpu),
+            'rss_start_mb': round(rss[0] / 1024 / 1024, 1) if rss else None,
+            'rss_peak_mb': round(max(rss) / 1024 / 1024, 1) if rss else None,
+            'rss_end_mb': round(rss[-1] / 1024 / 1024, 1) if rss else None,
+            'result_store_peak_mb': round(max(s['result_store_bytes'] for s in self.samples) / 1024 / 1024, 1),
+            'db_pools': list(self._pools.values()),
+        }
+
+
+def percentile(values, pct: float) -> float:
+    """백분위수 (정렬 후 선형 보간)"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_steps(records: list) -> list:
+    """단계별 집계 ([{'step', 'count', 'errors', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}], 성공한 실행만 시간 집계)"""
+    summary = []
+    for step in STEPS:
+        step_records = [record for record in records if record['step'] == step]
+        if not step_records:
+            continue
+        times = [record['ms'] for record in step_records if not record['error']]
+        summary.append({
+            'step': step,
+            'count': len(step_records),
+            'errors': len(step_records) - len(times),
+            **{f"p{pct}_ms": round(percentile(times, pct), 1) for pct in PERCENTILES},
+            'max_ms': max(times, default=0.0),
+        })
+    return summary
+
+
+def run(users: int, iterations: int, admin_ids, password: str, search_terms, hotels: int = 3, days: int = None,
+        ramp_up: float = 0.0, think_time: float = 0.0, timeout: float = 30.0, report_timeout: float = 300.0,
+        sample_interval: float = 0.5) -> dict:
+    """
+    가상 사용자 동시 실행
+    
+    가상 사용자 i는 ramp_up * i / users초 뒤 시작하여 세션을 iterations회 반복
+    (계정/검색어는 사용자 번호 순서로 돌아가며 사용)
+    
+    Returns:
+        dict: JSON으로 저장할 결과 ({'benchmark', 'created_at', 'environment', 'steps', 'resources', 'sessions', 'errors'})
+    """
+    def virtual_user(user_no: int) -> list:
+        time.sleep(ramp_up * user_no / users)
+        records = []
+        for iteration in range(iterations):
+            session = run_session(admin_ids[user_no % len(admin_ids)], password,
+                                  search_terms[user_no % len(search_terms)], hotels, days,
+                                  timeout, report_timeout, think_time)
+            records.extend({'user': user_no, 'iteration': iteration, **record} for record in session)
+        return records
+    
+    monitor = ResourceMonitor(sample_interval)
+    monitor.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users, thread_name_prefix='virtual-user') as executor:
+        records = [record for user_records in executor.map(virtual_user, range(users)) for record in user_records]
+    wall = time.perf_counter() - started
+    resources = monitor.stop()
+    
+    completed = sum(1 for record in records if record['step'] == STEPS[-1] and not record['error'])
+    return {
+        'benchmark': 'load',
+        'created_at': datetime.now().replace(microsecond=0).isoformat(sep=' '),
+        'environment': {
+            'users': users,
+            'iterations': iterations,
+            'hotels': hotels,
+            'days': days,
+            'ramp_up': ramp_up,
+            'think_time': think_time,
+            'engine': os.getenv('HOTEL_STATS_ENGINE', 'mysql'),
+            'report_job_workers': os.getenv('REPORT_JOB_WORKERS'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'steps': summarize_steps(records),
+        'resources': resources,
+        'sessions': {
+            'started': users * iterations,
+            'completed': completed,
+            'wall_sec': round(wall, 1),
+            'per_minute': round(completed / wall * 60, 1) if wall > 0 else 0.0,
+        },
+        'errors': [record for record in records if record['error']],
+    }
+
+
+def print_report(report: dict):
+    env = report['environment']
+    print(f"\n가상 사용자 {env['users']}명 x {env['iterations']}회 (엔진: {env['engine']})")
+    print(f"  {'step':<10}{'count':>7}{'errors':>8}{'p50(ms)':>11}{'p95(ms)':>11}{'p99(ms)':>11}{'max(ms)':>11}")
+    for step in report['steps']:
+        print(f"  {step['step']:<10}{step['count']:>7}{step['errors']:>8}{step['p50_ms']:>11,.1f}"
+              f"{step['p95_ms']:>11,.1f}{step['p99_ms']:>11,.1f}{step['max_ms']:>11,.1f}")
+    
+    sessions = report['sessions']
+    print(f"\n완료 세션: {sessions['completed']}/{sessions['started']} ({sessions['wall_sec']}초, "
+          f"분당 {sessions['per_minute']}세션)")
+    
+    resources = report['resources']
+    print(f"CPU: {resources['cpu_seconds']}초 (평균 {resources['cpu_avg_percent']}%, 최대 {resources['cpu_peak_percent']}%)")
+    if resources['rss_peak_mb'] is not None:
+        print(f"RSS: 시작 {resources['rss_start_mb']}MB, 최대 {resources['rss_peak_mb']}MB, 종료 {resources['rss_end_mb']}MB")
+    print(f"조회 결과 보관소 최대: {resources['result_store_peak_mb']}MB")
+    for pool in resources['db_pools']:
+        print(f"DB 커넥션 ({pool['engine']}): 풀 크기 {pool['size']}, 최대 사용 {pool['peak_checked_out']}, "
+              f"최대 초과 연결 {pool['peak_overflow']}")
+    
+    for error in report['errors'][:10]:
+        print(f"❌ user {error['user']} #{error['iteration']} {error['step']}: {error['error']}")
+    if len(report['errors']) > 10:
+        print(f"   ... 외 {len(report['errors']) - 10}건")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="동시 접속 부하 테스트 (Streamlit AppTest 가상 사용자)")
+    parser.add_argument('--users', type=int, default=5, help="가상 사용자 수 (기본값: 5)")
+    parser.add_argument('--iterations', type=int, default=1, help="사용자별 세션 반복 횟수 (기본값: 1)")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="모든 사용자가 시작할 때까지의 시간 (초, 기본값: 0)")
+    parser.add_argument('--think-time', type=float, default=0.0, help="단계 사이 대기 시간 (초, 기본값: 0)")
+    parser.add_argument('--admin-ids', nargs='+', default=['bench01'], help="로그인 계정 (사용자별로 돌아가며 사용)")
+    parser.add_argument('--password', default='bench1234', help="로그인 비밀번호 (기본값: bench1234)")
+    parser.add_argument('--search-terms', nargs='+', default=list(DEFAULT_SEARCH_TERMS), help="숙소 검색어")
+    parser.add_argument('--hotels', type=int, default=3, help="사용자별 선택 숙소 수 (기본값: 3)")
+    parser.add_argument('--days', type=int, help="조회 기간 (기본값: 앱 기본 기간)")
+    parser.add_argument('--engine', choices=['mysql', 'duckdb'], help="통계 조회 엔진 (기본값: .env 설정)")
+    parser.add_argument('--timeout', type=float, default=30.0, help="단계별 스크립트 실행 제한 시간 (초, 기본값: 30)")
+    parser.add_argument('--report-timeout', type=float, default=300.0, help="조회 단계 제한 시간 (초, 기본값: 300)")
+    parser.add_argument('--sample-interval', type=float, default=0.5, help="CPU/RSS/커넥션 기록 주기 (초, 기본값: 0.5)")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+    
+    if args.engine:
+        os.environ['HOTEL_STATS_ENGINE'] = args.engine
+    
+    report = run(args.users, args.iterations, args.admin_ids, args.password, args.search_terms, args.hotels,
+                 args.days, args.ramp_up, args.think_time, args.timeout, args.report_timeout, args.sample_interval)
+    print_report(report)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        print(f"✅ 결과 저장: {args.output}")
+    return 1 if report['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
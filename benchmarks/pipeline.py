@@ -0,0 +1,342 @@
+# benchmarks/pipeline.py
+"""리포트 파이프라인 종단 벤치마크
+- 조회 버튼 한 번에 실행되는 단계를 시나리오별로 측정 (wall time 중앙값, 최대 메모리, 결과 행 수)
+  query_build: 통계 쿼리 생성
+  fetch_hotel_data / fetch_hotel_summary_stats: 통계/요약 조회
+  dtype_cleanup: 드라이버 결과(object 컬럼) 타입 정리
+  display_format: 상세 표 정렬 + 1페이지 포맷
+  excel_build: 엑셀 파일 생성
+  search_hotels: 숙소 검색 (MySQL 전용, --engine duckdb에서는 기본 제외)
+- 조회 기간(--days) x 숙소 수(--hotel-counts, 0은 전체) 조합별로 실행
+  숙소는 가장 긴 기간의 예약 건수 상위 순으로 선택 (실행마다 같은 숙소)
+- 결과는 JSON으로 저장하고 compare 명령으로 기준 결과 대비 성능 저하를 표시 (저하가 있으면 종료 코드 1)
+- 조회 오류는 앱과 달리 빈 결과로 바꾸지 않고 실행을 중단 (대체 DB 장애가 0행 빠른 실행으로 기록되지 않도록)
+  기준 결과에 행이 있던 시나리오가 0행이 되어도 저하로 표시
+
+로컬 대체 DB에서 실행 (tools/generate_synthetic_data.py로 생성):
+  --engine mysql: .env의 DB (로컬 MySQL/MariaDB)
+  --engine duckdb: HOTEL_STATS_PARQUET_DIR의 Parquet 스냅샷
+
+사용법:
+    python -m benchmarks.pipeline run --engine duckdb --output baseline.json
+    python -m benchmarks.pipeline run --days 7 30 90 --hotel-counts 1 10 0 --runs 5 --output current.json
+    python -m benchmarks.pipeline run --output current.json --baseline baseline.json
+    python -m benchmarks.pipeline compare baseline.json current.json --threshold 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+# 프로젝트 루트 경로 추가
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+import pandas as pd
+
+from config.configdb import ROLE_REPORTING, get_db_connection
+from utils.daily_stats_rollup import get_rollup_range
+from utils.data_fetcher_hotel import (
+    _coerce_hotel_data,
+    _load_hotel_data,
+    fetch_hotel_data_duckdb,
+    fetch_hotel_summary_stats,
+)
+from utils.duckdb_engine import read_manifest, snapshot_covers
+from utils.excel_handler_hotel import create_hotel_excel_file
+from utils.query_builder_hotel import build_hotel_statistics_query
+from utils.result_table import format_detail_page, get_page, sort_result
+
+SCENARIOS = ('query_build', 'fetch_hotel_data', 'fetch_hotel_summary_stats', 'dtype_cleanup',
+             'display_format', 'excel_build', 'search_hotels')
+
+# 숙소 검색어 기본값 (합성 데이터의 지역명/숙소코드)
+DEFAULT_SEARCH_TERMS = ('서울', '호텔', 'H00001')
+
+# 결과 비교 키
+_RESULT_KEY = ('scenario', 'days', 'hotels')
+
+
+def measure(func, runs: int) -> dict:
+    """
+    함수 실행 측정 (워밍업 1회 후 runs회 시간 측정, 별도 1회는 tracemalloc으로 최대 메모리 측정)
+    
+    Returns:
+        dict: {'wall_ms', 'min_ms', 'peak_kb', 'rows', 'result'}
+    """
+    result = func()
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - started)
+    
+    # tracemalloc은 실행을 느리게 하므로 시간 측정과 분리
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    rows = len(result) if hasattr(result, '__len__') and not isinstance(result, (str, bytes)) else 0
+    return {
+        'wall_ms': round(statistics.median(samples) * 1000, 3),
+        'min_ms': round(min(samples) * 1000, 3),
+        'peak_kb': round(peak / 1024, 1),
+        'rows': rows,
+        'result': result,
+    }
+
+
+def _record(results: list, scenario: str, days, hotels, measured: dict):
+    results.append({'scenario': scenario, 'days': days, 'hotels': hotels,
+                    **{name: value for name, value in measured.items() if name != 'result'}})
+    print(f"  {scenario:<26}{days if days is not None else '-':>5}{hotels if hotels is not None else '-':>7}"
+          f"{measured['wall_ms']:>12,.2f}{measured['peak_kb']:>12,.0f}{measured['rows']:>10,}", flush=True)
+
+
+def _fetch_hotel_data(start_date, end_date, selected_hotel_ids, date_type: str) -> pd.DataFrame:
+    """
+    fetch_hotel_data와 같은 경로(스냅샷이면 DuckDB, 아니면 리포팅 엔진 + 집계 테이블)로 분할 없이 조회
+    
+    fetch_hotel_data는 오류를 빈 DataFrame으로 바꾸므로 벤치마크에서는 오류가 그대로 전달되는 내부 함수 사용
+    """
+    if snapshot_covers(start_date, end_date):
+        return fetch_hotel_data_duckdb(start_date, end_date, selected_hotel_ids, date_type)
+    engine = get_db_connection(ROLE_REPORTING)
+    return _load_hotel_data(engine, start_date, end_date, selected_hotel_ids, date_type, shards=1,
+                            rollup_range=get_rollup_range(engine, date_type))
+
+
+def select_hotels(end_date: date, days: int, date_type: str, counts) -> dict:
+    """숙소 수별 숙소 ID (가장 긴 기간의 예약 건수 상위 순, 0은 전체 = None)"""
+    df = _fetch_hotel_data(end_date - timedelta(days=days - 1), end_date, None, date_type)
+    if df.empty:
+        raise RuntimeError(f"{end_date}까지 {days}일간 예약이 없습니다 (대체 DB/스냅샷의 데이터 기간 확인)")
+    ranked = df.groupby('hotel_idx')['booking_count'].sum().sort_values(
+        ascending=False, kind='stable').index.tolist()
+    return {count: (sorted(ranked[:count]) if count else None) for count in counts}
+
+
+def run(days_list, hotel_counts, runs: int, scenarios, engine: str, date_type: str = 'orderDate',
+        end_date: date = None, search_terms=DEFAULT_SEARCH_TERMS) -> dict:
+    """
+    시나리오 실행
+    
+    Returns:
+        dict: JSON으로 저장할 결과 ({'benchmark', 'created_at', 'environment', 'results'})
+    """
+    os.environ['HOTEL_STATS_ENGINE'] = engine
+    manifest = read_manifest() if engine == 'duckdb' else None
+    if end_date is None:
+        if engine == 'duckdb':
+            if manifest is None:
+                raise RuntimeError("Parquet 스냅샷이 없습니다 (python -m tools.generate_synthetic_data --parquet-dir ...)")
+            end_date = date.fromisoformat(manifest['covers_until'])
+        else:
+            end_date = date.today() - timedelta(days=1)
+    
+    print(f"  {'scenario':<26}{'days':>5}{'hotels':>7}{'wall(ms)':>12}{'peak(KB)':>12}{'rows':>10}")
+    results = []
+    hotel_sets = select_hotels(end_date, max(days_list), date_type, hotel_counts)
+    for days in days_list:
+        start_date = end_date - timedelta(days=days - 1)
+        for count, hotel_ids in hotel_sets.items():
+            hotels = count or 'all'
+            if 'query_build' in scenarios:
+                _record(results, 'query_build', days, hotels, measure(
+                    lambda: build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=hotel_ids,
+                                                         date_type=date_type, dialect=engine), runs))
+            
+            # 이후 단계는 조회 결과를 입력으로 사용
+            fetched = measure(lambda: _fetch_hotel_data(start_date, end_date, hotel_ids, date_type), runs)
+            df = fetched['result']
+            if 'fetch_hotel_data' in scenarios:
+                _record(results, 'fetch_hotel_data', days, hotels, fetched)
+            
+            summary = measure(lambda: fetch_hotel_summary_stats(start_date, end_date, selected_hotel_ids=hotel_ids,
+                                                                date_type=date_type), runs)
+            # 요약 조회는 오류를 0으로 바꾸므로 상세 결과가 있는데 예약 건수가 0이면 실패로 처리
+            if not df.empty and not summary['result']['total_bookings']:
+                raise RuntimeError(f"요약 통계 조회 실패 ({days}일, 숙소 {hotels}) - 로그 확인")
+            if 'fetch_hotel_summary_stats' in scenarios:
+                summary['rows'] = 1 if summary['result']['total_bookings'] else 0
+                _record(results, 'fetch_hotel_summary_stats', days, hotels, summary)
+            
+            if 'dtype_cleanup' in scenarios:
+                # 드라이버 반환 형태 (숫자/날짜가 object 컬럼)
+                raw = df.astype(object)
+                _record(results, 'dtype_cleanup', days, hotels, measure(lambda: _coerce_hotel_data(raw.copy()), runs))
+            
+            if 'display_format' in scenarios:
+                _record(results, 'display_format', days, hotels, measure(
+                    lambda: format_detail_page(get_page(sort_result(df, 'total_purchase'), 1, 50),
+                                               date_type, 'day', end_date), runs))
+            
+            if 'excel_build' in scenarios:
+                summary_for_excel = {**summary['result'], 'start_date': str(start_date), 'end_date': str(end_date),
+                                     'date_type': date_type}
+                excel = measure(lambda: create_hotel_excel_file(df, summary_for_excel, date_type=date_type), runs)
+                excel['rows'] = len(df)
+                _record(results, 'excel_build', days, hotels, excel)
+    
+    if 'search_hotels' in scenarios:
+        from utils.hotel_search import search_hotels
+        
+        for term in search_terms:
+            searched = measure(lambda: search_hotels(term), runs)
+            # 검색은 오류를 빈 목록으로 바꾸므로 결과가 없으면 실패로 처리 (검색어는 결과가 있는 값으로 지정)
+            if not searched['result']:
+                raise RuntimeError(f"숙소 검색 실패 또는 결과 없음 (검색어 '{term}') - 로그 확인")
+            _record(results, 'search_hotels', None, term, searched)
+    
+    return {
+        'benchmark': 'pipeline',
+        'created_at': datetime.now().replace(microsecond=0).isoformat(sep=' '),
+        'environment': {
+            'engine': engine,
+            'snapshot': manifest['snapshot'] if manifest else None,
+            'date_type': date_type,
+            'end_date': str(end_date),
+            'runs': runs,
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2, min_ms: float = 5.0,
+            memory_threshold: float = 0.3, min_kb: float = 256.0) -> list:
+    """
+    기준 결과 대비 비교
+    
+    시간은 threshold 비율 + min_ms 이상, 메모리는 memory_threshold 비율 + min_kb 이상 늘어난 경우 저하로 판단
+    (짧은 시나리오의 측정 오차로 저하가 표시되지 않도록 절대값 기준 함께 사용)
+    기준 결과에 행이 있었는데 0행이면 시간과 관계없이 저하 (조회 실패/데이터 누락)
+    
+    Returns:
+        list: [{'scenario', 'days', 'hotels', 'base_ms', 'current_ms', 'time_change', 'memory_change', 'status'}]
+              status: regression / improved / ok / new / missing
+    """
+    def key(result):
+        return tuple(result[name] for name in _RESULT_KEY)
+    
+    base_results = {key(result): result for result in baseline['results']}
+    current_results = {key(result): result for result in current['results']}
+    
+    rows = []
+    for result_key in list(base_results) + [k for k in current_results if k not in base_results]:
+        base, now = base_results.get(result_key), current_results.get(result_key)
+        row = dict(zip(_RESULT_KEY, result_key))
+        row.update({'base_ms': base['wall_ms'] if base else None, 'current_ms': now['wall_ms'] if now else None,
+                    'time_change': None, 'memory_change': None})
+        if base is None or now is None:
+            row['status'] = 'new' if base is None else 'missing'
+            rows.append(row)
+            continue
+        
+        delta_ms = now['wall_ms'] - base['wall_ms']
+        row['time_change'] = round(delta_ms / base['wall_ms'], 3) if base['wall_ms'] else 0.0
+        row['memory_change'] = round(now['peak_kb'] / base['peak_kb'] - 1, 3) if base['peak_kb'] else 0.0
+        memory_regressed = row['memory_change'] > memory_threshold and now['peak_kb'] - base['peak_kb'] > min_kb
+        rows_missing = base.get('rows', 0) > 0 and now.get('rows', 0) == 0
+        if (row['time_change'] > threshold and delta_ms > min_ms) or memory_regressed or rows_missing:
+            row['status'] = 'regression'
+        elif row['time_change'] < -threshold and -delta_ms > min_ms:
+            row['status'] = 'improved'
+        else:
+            row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows: list):
+    """비교 결과 표 출력"""
+    marks = {'regression': '❌ 저하', 'improved': '✅ 개선', 'ok': '  -', 'new': '  신규', 'missing': '  없음'}
+    print("=" * 92)
+    print("⏱️  리포트 파이프라인 벤치마크 비교 (기준 대비 변화율)")
+    print("=" * 92)
+    print(f"  {'scenario':<26}{'days':>5}{'hotels':>8}{'base(ms)':>12}{'now(ms)':>12}{'time':>9}{'memory':>9}  결과")
+    for r in rows:
+        base = f"{r['base_ms']:>12,.1f}" if r['base_ms'] is not None else f"{'-':>12}"
+        now = f"{r['current_ms']:>12,.1f}" if r['current_ms'] is not None else f"{'-':>12}"
+        time_change = f"{r['time_change']:>+9.0%}" if r['time_change'] is not None else f"{'-':>9}"
+        memory_change = f"{r['memory_change']:>+9.0%}" if r['memory_change'] is not None else f"{'-':>9}"
+        print(f"  {r['scenario']:<26}{r['days'] if r['days'] is not None else '-':>5}{str(r['hotels']):>8}"
+              f"{base}{now}{time_change}{memory_change}  {marks[r['status']]}")
+
+
+def _load_json(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="리포트 파이프라인 시나리오별 시간/메모리 측정 및 기준 결과 비교")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = commands.add_parser('run', help="시나리오 실행")
+    run_parser.add_argument('--engine', default='mysql', choices=['mysql', 'duckdb'], help="통계 조회 엔진 (기본값: mysql)")
+    run_parser.add_argument('--days', type=int, nargs='+', default=[7, 30, 90], help="조회 기간 (기본값: 7 30 90)")
+    run_parser.add_argument('--hotel-counts', type=int, nargs='+', default=[1, 10, 0],
+                            help="선택 숙소 수 (0: 전체, 기본값: 1 10 0)")
+    run_parser.add_argument('--runs', type=int, default=3, help="시나리오별 측정 횟수 (기본값: 3, 중앙값 사용)")
+    run_parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS,
+                            help="실행할 시나리오 (기본값: 전체, duckdb는 search_hotels 제외)")
+    run_parser.add_argument('--search-terms', nargs='+', default=list(DEFAULT_SEARCH_TERMS), help="숙소 검색어")
+    run_parser.add_argument('--date-type', default='orderDate', choices=['orderDate', 'useDate'], help="날짜유형")
+    run_parser.add_argument('--end-date', type=date.fromisoformat,
+                            help="종료일 (기본값: mysql은 어제, duckdb는 스냅샷의 마지막 마감일)")
+    run_parser.add_argument('--output', help="결과 JSON 저장 경로")
+    run_parser.add_argument('--baseline', help="비교할 기준 결과 JSON (저하가 있으면 종료 코드 1)")
+    run_parser.add_argument('--threshold', type=float, default=0.2, help="시간 저하 판단 비율 (기본값: 0.2)")
+    
+    compare_parser = commands.add_parser('compare', help="기준 결과와 비교 (저하가 있으면 종료 코드 1)")
+    compare_parser.add_argument('baseline', help="기준 결과 JSON")
+    compare_parser.add_argument('current', help="비교할 결과 JSON")
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help="시간 저하 판단 비율 (기본값: 0.2)")
+    compare_parser.add_argument('--min-ms', type=float, default=5.0, help="저하로 판단할 최소 시간 증가 (기본값: 5ms)")
+    compare_parser.add_argument('--memory-threshold', type=float, default=0.3,
+                                help="메모리 저하 판단 비율 (기본값: 0.3)")
+    compare_parser.add_argument('--json', action='store_true', help="비교 결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    
+    if args.command == 'compare':
+        rows = compare(_load_json(args.baseline), _load_json(args.current), args.threshold, args.min_ms,
+                       args.memory_threshold)
+        if args.json:
+            print(json.dumps(rows, ensure_ascii=False, indent=2))
+        else:
+            print_comparison(rows)
+        return 1 if any(row['status'] == 'regression' for row in rows) else 0
+    
+    scenarios = args.scenarios or [scenario for scenario in SCENARIOS
+                                   if not (args.engine == 'duckdb' and scenario == 'search_hotels')]
+    report = run(args.days, args.hotel_counts, args.runs, scenarios, args.engine, args.date_type, args.end_date,
+                 args.search_terms)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+    
+    if args.baseline:
+        rows = compare(_load_json(args.baseline), report, args.threshold)
+        print_comparison(rows)
+        return 1 if any(row['status'] == 'regression' for row in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# benchmarks/row_access.py
+"""단건/소량 행 조회 마이크로 벤치마크
+- pd.read_sql + df.iloc[0] / iterrows() (기존 방식)
+- utils.db_access.fetch_one / fetch_all (커서 + __slots__ 데이터클래스)
+
+같은 커넥션 풀에서 같은 쿼리를 실행하여 클라이언트 측 처리 비용 차이만 비교
+기본값은 인메모리 SQLite (DB 왕복 시간 제외), --url로 실제 DB 지정 가능
+
+사용법:
+    python -m benchmarks.row_access
+    python -m benchmarks.row_access --iterations 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# 프로젝트 루트 경로 추가
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from utils.db_access import fetch_all, fetch_one, HotelRow, HotelSearchRow
+
+
+def _create_sqlite_engine(rows: int = 1000):
+    """벤치마크용 인메모리 product 테이블 생성"""
+    engine = create_engine('sqlite://', poolclass=StaticPool,
+                           connect_args={'check_same_thread': False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE product (idx INTEGER PRIMARY KEY, product_code TEXT, name_kr TEXT)"))
+        conn.execute(
+            text("INSERT INTO product (idx, product_code, name_kr) VALUES (:idx, :code, :name)"),
+            [{'idx': i, 'code': f"P{i:07d}", 'name': f"테스트 호텔 {i}"} for i in range(1, rows + 1)]
+        )
+    return engine
+
+
+def _time_per_call(func, iterations: int) -> float:
+    """호출당 평균 소요 시간 (마이크로초)"""
+    func()  # 워밍업
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def run(engine, iterations: int = 2000, placeholder: str = '?') -> dict:
+    """
+    벤치마크 실행
+    
+    Args:
+        engine: SQLAlchemy 엔진
+        iterations: 반복 횟수
+        placeholder: DBAPI 파라미터 표기 (SQLite '?', pymysql '%s')
+    
+    Returns:
+        dict: {시나리오: {'pandas_us', 'rows_us', 'speedup'}}
+    """
+    one_query = f"SELECT idx, product_code, name_kr FROM product WHERE idx = {placeholder} LIMIT 1"
+    many_query = (f"SELECT idx, product_code, name_kr, 1 AS has_recent_booking "
+                  f"FROM product WHERE idx <= {placeholder} ORDER BY name_kr LIMIT 15")
+    
+    def pandas_one():
+        df = pd.read_sql(one_query, engine, params=(42,))
+        row = df.iloc[0]
+        return {'idx': int(row['idx']), 'product_code': str(row['product_code']), 'name_kr': str(row['name_kr'])}
+    
+    def rows_one():
+        row = fetch_one(one_query, (42,), row_type=HotelRow, query_name='bench_one', engine=engine)
+        return {'idx': int(row.idx), 'product_code': str(row.product_code), 'name_kr': str(row.name_kr)}
+    
+    def pandas_many():
+        df = pd.read_sql(many_query, engine, params=(15,))
+        return [{'idx': int(r['idx']), 'name_kr': str(r['name_kr'])} for _, r in df.iterrows()]
+    
+    def rows_many():
+        rows = fetch_all(many_query, (15,), row_type=HotelSearchRow, query_name='bench_many', engine=engine)
+        return [{'idx': int(r.idx), 'name_kr': str(r.name_kr)} for r in rows]
+    
+    results = {}
+    for name, pandas_func, rows_func in [
+        ('single_row (get_hotel_by_id/authenticate_user)', pandas_one, rows_one),
+        ('15_rows (search_hotels)', pandas_many, rows_many),
+    ]:
+        pandas_us = _time_per_call(pandas_func, iterations)
+        rows_us = _time_per_call(rows_func, iterations)
+        results[name] = {
+            'pandas_us': round(pandas_us, 1),
+            'rows_us': round(rows_us, 1),
+            'saved_us': round(pandas_us - rows_us, 1),
+            'speedup': round(pandas_us / rows_us, 2) if rows_us else 0.0,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="pd.read_sql vs fetch_one/fetch_all 호출당 비용 비교")
+    parser.add_argument('--iterations', type=int, default=2000, help="반복 횟수 (기본값: 2000)")
+    parser.add_argument('--url', help="SQLAlchemy DB URL (기본값: 인메모리 SQLite, product 테이블 필요)")
+    args = parser.parse_args(argv)
+    
+    if args.url:
+        engine = create_engine(args.url)
+        placeholder = '%s' if engine.dialect.paramstyle in ('format', 'pyformat') else '?'
+    else:
+        engine = _create_sqlite_engine()
+        placeholder = '?'
+    
+    print("=" * 72)
+    print(f"⏱️  행 조회 마이크로 벤치마크 ({args.iterations:,}회 반복)")
+    print("=" * 72)
+    print(f"  {'시나리오':<44}{'pandas(us)':>12}{'rows(us)':>10}{'배속':>6}")
+    for name, stats in run(engine, args.iterations, placeholder).items():
+        print(f"  {name:<46}{stats['pandas_us']:>12,.1f}{stats['rows_us']:>10,.1f}{stats['speedup']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# benchmarks/sharding.py
+"""날짜 분할 병렬 조회 벤치마크
+- 7/30/90일 기간별로 HOTEL_QUERY_SHARDS 값(1, 2, 4, 8)에 따른 통계 조회 소요 시간 비교
+- 체감 시간(wall clock)과 DB 부하(구간 쿼리 실행 시간 합계, InnoDB 읽은 행 수 등)를 함께 출력
+- 통계 쿼리가 MySQL 전용이므로 .env의 리포팅 DB(복제본 미설정 시 primary)에 직접 실행
+- 분할 효과만 측정하도록 집계 테이블/DuckDB 스냅샷/동일 쿼리 병합을 거치지 않고 원본 테이블을 조회
+  (fetch_hotel_data는 오류를 빈 결과로 바꾸므로 내부 함수로 실행하여 실패 시 중단)
+
+DB 부하 지표 중 SHOW GLOBAL STATUS 값은 서버 전체 누적값의 차이이므로
+다른 트래픽이 적은 시간(또는 복제본)에서 실행해야 의미가 있음
+
+사용법:
+    python -m benchmarks.sharding
+    python -m benchmarks.sharding --days 7 30 90 --shards 1 2 4 8 --runs 3
+    python -m benchmarks.sharding --hotel-ids 101 102 --date-type useDate --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+# 프로젝트 루트 경로 추가
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from config.configdb import ROLE_REPORTING, get_db_connection
+from utils.data_fetcher_hotel import _load_hotel_data, split_date_range
+from utils.db_access import fetch_all
+from utils.metrics import DB_QUERY_DURATION
+
+# 구간 쿼리 이름 (utils.data_fetcher_hotel에서 기록)
+_QUERY_NAMES = ('fetch_hotel_data', 'fetch_hotel_data_shard')
+
+# 실행 전후 차이를 비교할 MySQL 상태 값
+_STATUS_VARIABLES = ('Innodb_rows_read', 'Created_tmp_tables', 'Created_tmp_disk_tables', 'Sort_merge_passes')
+
+
+def _db_time() -> tuple:
+    """통계 쿼리 누적 실행 시간과 건수 (모든 구간 합계)"""
+    total, count = 0.0, 0
+    for name in _QUERY_NAMES:
+        query_total, query_count = DB_QUERY_DURATION.summary(query=name)
+        total += query_total
+        count += query_count
+    return total, count
+
+
+def _server_status(engine) -> dict:
+    """SHOW GLOBAL STATUS 값 (권한이 없으면 빈 dict)"""
+    placeholders = ','.join(['%s'] * len(_STATUS_VARIABLES))
+    try:
+        rows = fetch_all(f"SHOW GLOBAL STATUS WHERE Variable_name IN ({placeholders})",
+                         _STATUS_VARIABLES, query_name='bench_server_status', engine=engine)
+    except Exception:
+        return {}
+    return {name: int(value) for name, value in rows}
+
+
+def _fetch(engine, start_date, end_date, shards: int, hotel_ids, date_type: str):
+    """원본 테이블 통계 조회 (지정한 분할 수로 실행, 오류는 그대로 전달)"""
+    return _load_hotel_data(engine, start_date, end_date, hotel_ids, date_type, shards=shards)
+
+
+def measure(start_date, end_date, shards: int, hotel_ids, date_type: str, engine, expected_rows: int) -> dict:
+    """
+    통계 조회 1회 실행 측정
+    
+    분할 수와 관계없이 일자별 결과는 같으므로 행 수가 워밍업 결과와 다르면 RuntimeError (구간 누락 등)
+    """
+    status_before = _server_status(engine)
+    db_before, queries_before = _db_time()
+    started = time.perf_counter()
+    
+    df = _fetch(engine, start_date, end_date, shards, hotel_ids, date_type)
+    
+    wall = time.perf_counter() - started
+    if len(df) != expected_rows:
+        raise RuntimeError(f"분할 {shards} 결과 행 수가 다릅니다 ({len(df):,}행, 분할 없음 {expected_rows:,}행)")
+    db_after, queries_after = _db_time()
+    status_after = _server_status(engine)
+    
+    return {
+        'wall_s': wall,
+        'db_s': db_after - db_before,
+        'queries': queries_after - queries_before,
+        'rows': len(df),
+        'status': {name: status_after[name] - status_before.get(name, 0)
+                   for name in status_after if name in status_before},
+    }
+
+
+def run(days_list, shards_list, runs: int, hotel_ids=None, date_type: str = 'orderDate',
+        end_date: date = None) -> list:
+    """
+    기간 x 분할 수 조합별 측정 (중앙값)
+    
+    Returns:
+        list: [{'days', 'shards', 'ranges', 'wall_ms', 'db_ms', 'queries', 'rows', 'speedup', 'db_load', 'status'}]
+    """
+    engine = get_db_connection(ROLE_REPORTING)
+    end_date = end_date or date.today() - timedelta(days=1)
+    # fetch_hotel_data와 같은 쿼리가 되도록 숙소 ID 정렬
+    hotel_ids = sorted(set(hotel_ids)) if hotel_ids else None
+    results = []
+    
+    for days in days_list:
+        start_date = end_date - timedelta(days=days - 1)
+        # 버퍼 풀 워밍업 (첫 조합만 콜드 캐시로 불리해지는 것 방지), 결과 행 수는 분할별 결과 검증 기준
+        expected_rows = len(_fetch(engine, start_date, end_date, 1, hotel_ids, date_type))
+        if not expected_rows:
+            raise RuntimeError(f"{end_date}까지 {days}일간 예약이 없습니다 (DB의 데이터 기간 확인)")
+        
+        samples = {shards: [] for shards in shards_list}
+        for _ in range(runs):
+            # 분할 수 순서를 번갈아 가며 측정 (캐시/부하 변화가 한쪽에 몰리지 않도록)
+            for shards in shards_list:
+                samples[shards].append(measure(start_date, end_date, shards, hotel_ids, date_type, engine,
+                                                expected_rows))
+        
+        baseline = None
+        for shards in shards_list:
+            measured = samples[shards]
+            wall_ms = statistics.median(m['wall_s'] for m in measured) * 1000
+            db_ms = statistics.median(m['db_s'] for m in measured) * 1000
+            if baseline is None:
+                baseline = (wall_ms, db_ms)
+            status_keys = measured[0]['status'].keys()
+            results.append({
+                'days': days,
+                'shards': shards,
+                'ranges': len(split_date_range(start_date, end_date, shards)),
+                'wall_ms': round(wall_ms, 1),
+                'db_ms': round(db_ms, 1),
+                'queries': measured[0]['queries'],
+                'rows': measured[0]['rows'],
+                'speedup': round(baseline[0] / wall_ms, 2) if wall_ms else 0.0,
+                'db_load': round(db_ms / baseline[1], 2) if baseline[1] else 0.0,
+                'status': {name: int(statistics.median(m['status'].get(name, 0) for m in measured))
+                           for name in status_keys},
+            })
+    return results
+
+
+def print_report(results: list):
+    """측정 결과 표 출력"""
+    print("=" * 84)
+    print("⏱️  날짜 분할 병렬 조회 벤치마크 (speedup: 체감 시간 배속, db_load: DB 실행 시간 합계 배수)")
+    print("=" * 84)
+    print(f"  {'기간':>6}{'분할':>6}{'구간':>6}{'wall(ms)':>12}{'db(ms)':>12}{'speedup':>10}{'db_load':>10}"
+          f"{'rows_read':>14}")
+    for r in results:
+        rows_read = r['status'].get('Innodb_rows_read')
+        rows_read_text = f"{rows_read:>14,}" if rows_read is not None else f"{'-':>14}"
+        print(f"  {r['days']:>5}일{r['shards']:>6}{r['ranges']:>6}{r['wall_ms']:>12,.1f}{r['db_ms']:>12,.1f}"
+              f"{r['speedup']:>9.2f}x{r['db_load']:>9.2f}x{rows_read_text}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HOTEL_QUERY_SHARDS 값별 통계 조회 체감 시간과 DB 부하 비교")
+    parser.add_argument('--days', type=int, nargs='+', default=[7, 30, 90], help="조회 기간 (기본값: 7 30 90)")
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8], help="분할 수 (기본값: 1 2 4 8)")
+    parser.add_argument('--runs', type=int, default=3, help="조합별 측정 횟수 (기본값: 3, 중앙값 사용)")
+    parser.add_argument('--hotel-ids', type=int, nargs='*', help="숙소 ID (기본값: 전체 숙소)")
+    parser.add_argument('--date-type', default='orderDate', choices=['orderDate', 'useDate'], help="날짜유형")
+    parser.add_argument('--end-date', type=date.fromisoformat, help="종료일 (기본값: 어제)")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    
+    # 분할 없음(1)을 기준으로 배속 계산
+    shards_list = sorted(set([1] + args.shards))
+    results = run(args.days, shards_list, args.runs, args.hotel_ids or None, args.date_type, args.end_date)
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# benchmarks/startup.py
+"""워커 콜드 스타트 import 시간 벤치마크
+- 새 파이썬 프로세스에서 python -X importtime으로 앱 모듈 import 시간 측정
+- 전체 시간, 무거운 모듈 상위 N개, 앱 모듈별 누적 시간 출력
+- streamlit이 어차피 import하는 모듈(pandas 등)은 --preload로 먼저 import하여 측정에서 제외
+- --budget-ms 초과 시 종료 코드 1 (CI/배포 전 점검용)
+
+사용법:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 5 --top 15
+    python -m benchmarks.startup --budget-ms 800
+    python -m benchmarks.startup --modules utils.auth utils.hotel_search
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# 프로젝트 루트 경로
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+
+# app_v1.1_hotel.py가 시작 시 import하는 모듈 (streamlit 제외)
+DEFAULT_MODULES = (
+    'utils.logger',
+    'utils.metrics',
+    'utils.auth',
+    'utils.session_token',
+    'utils.hotel_search',
+    'utils.data_fetcher_hotel',
+    'utils.excel_handler_hotel',
+    'config.master_data_loader',
+)
+
+# streamlit import 시 함께 로드되는 모듈 (앱 모듈의 추가 비용만 측정하기 위해 먼저 import)
+DEFAULT_PRELOAD = ('pandas',)
+
+# 시작 시 import되면 안 되는 무거운 모듈 (최초 사용 시 지연 로드 대상)
+LAZY_MODULES = ('bcrypt', 'sshtunnel', 'paramiko', 'openpyxl', 'pymysql', 'sqlalchemy')
+
+# -X importtime 출력: "import time:  self [us] | cumulative | imported package"
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_once(modules, preload=DEFAULT_PRELOAD) -> dict:
+    """
+    새 프로세스에서 모듈 import 시간 1회 측정
+    
+    Args:
+        modules: 측정할 모듈
+        preload: 측정 전에 먼저 import할 모듈 (측정에서 제외)
+    
+    Returns:
+        dict: {'total_us': 전체 누적 시간, 'modules': {모듈명: (self_us, cumulative_us)}}
+    """
+    code = "".join(f"import {name}\n" for name in preload) + "import " + ", ".join(modules)
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=_project_root,
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '', 'METRICS_PORT': ''},
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import 실패:\n{completed.stderr[-2000:]}")
+    
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            entries.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3))))
+    
+    # preload 모듈과 그 하위 import는 출력 앞부분에 모이므로 마지막 preload 항목 이후만 집계
+    start = 0
+    for i, (name, _, _, depth) in enumerate(entries):
+        if depth == 1 and name in preload:
+            start = i + 1
+    
+    imported = {}
+    total_us = 0
+    for name, self_us, cumulative_us, depth in entries[start:]:
+        imported[name] = (self_us, cumulative_us)
+        # 최상위 import (들여쓰기 1칸)만 합산
+        if depth == 1:
+            total_us += cumulative_us
+    return {'total_us': total_us, 'modules': imported}
+
+
+def run(modules=DEFAULT_MODULES, runs: int = 3, top: int = 10, preload=DEFAULT_PRELOAD) -> dict:
+    """
+    여러 번 측정하여 중앙값 기준 결과 반환
+    
+    Returns:
+        dict: {'total_ms', 'runs_ms', 'app_modules_ms', 'heaviest', 'eager_heavy_modules'}
+    """
+    results = [measure_once(modules, preload) for _ in range(runs)]
+    totals = [r['total_us'] / 1000 for r in results]
+    median_index = totals.index(sorted(totals)[len(totals) // 2])
+    median = results[median_index]['modules']
+    
+    heaviest = sorted(median.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    top_level = {name.split('.')[0] for name in median}
+    
+    return {
+        'total_ms': round(statistics.median(totals), 1),
+        'runs_ms': [round(t, 1) for t in totals],
+        'app_modules_ms': {name: round(median[name][1] / 1000, 1) for name in modules if name in median},
+        'heaviest': [(name, round(self_us / 1000, 1)) for name, (self_us, _) in heaviest],
+        'eager_heavy_modules': [name for name in LAZY_MODULES if name in top_level],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="앱 모듈 콜드 스타트 import 시간 측정 (python -X importtime)")
+    parser.add_argument('--modules', nargs='+', default=list(DEFAULT_MODULES), help="측정할 모듈 (기본값: 앱 시작 시 import 모듈)")
+    parser.add_argument('--preload', nargs='*', default=list(DEFAULT_PRELOAD),
+                        help="측정에서 제외할 선행 import 모듈 (기본값: pandas, 빈 값이면 전체 측정)")
+    parser.add_argument('--runs', type=int, default=3, help="측정 횟수 (기본값: 3, 중앙값 사용)")
+    parser.add_argument('--top', type=int, default=10, help="self 시간 상위 모듈 표시 개수 (기본값: 10)")
+    parser.add_argument('--budget-ms', type=float, help="전체 import 시간 예산 (초과 시 종료 코드 1)")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    
+    result = run(args.modules, args.runs, args.top, tuple(args.preload))
+    over_budget = args.budget_ms is not None and result['total_ms'] > args.budget_ms
+    
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print("=" * 60)
+        print(f"🚀 콜드 스타트 import 시간: {result['total_ms']:,.1f}ms (측정값: {result['runs_ms']})")
+        print("=" * 60)
+        print("\n[앱 모듈별 누적 시간 (ms)]")
+        for name, ms in result['app_modules_ms'].items():
+            print(f"  {name:<32}{ms:>10,.1f}")
+        print("\n[self 시간 상위 모듈 (ms)]")
+        for name, ms in result['heaviest']:
+            print(f"  {name:<32}{ms:>10,.1f}")
+        if result['eager_heavy_modules']:
+            print(f"\n⚠️  시작 시 로드된 지연 대상 모듈: {', '.join(result['eager_heavy_modules'])}")
+        if args.budget_ms is not None:
+            status = "초과" if over_budget else "통과"
+            print(f"\n예산 {args.budget_ms:,.0f}ms: {status}")
+    
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,6 @@
 # config/channels.py
 """채널별 설정 및 매핑 정보"""
 
-import sys
-import os
-# 프로젝트 루트 디렉토리를 path에 추가
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # 채널별 상태값 매핑
 CHANNEL_CONFIG = {
     'order_product': {
@@ -1,19 +1,14 @@
 # config/database.py
 """데이터베이스 연결 설정 및 테스트"""
 
+import importlib.util
 import os
+import threading
+import time
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-import pandas as pd
-import pymysql
-
-# SSH 터널 지원 (선택사항)
-try:
-    from sshtunnel import SSHTunnelForwarder
-    SSH_TUNNEL_AVAILABLE = True
-except ImportError:
-    SSH_TUNNEL_AVAILABLE = False
-    SSHTunnelForwarder = None
+
+# sqlalchemy/pymysql, sshtunnel(paramiko), pandas는 무거우므로 최초 사용 시 import
+# (로그인 페이지 등 DB를 쓰지 않는 첫 화면의 워커 시작 시간 단축)
 
 # 프로젝트 루트 디렉토리 찾기 (현재 파일의 위치에서 계산)
 _current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -28,98 +23,157 @@ else:
     # 프로젝트 루트에 없으면 현재 작업 디렉토리에서 찾기
     load_dotenv(override=True)
 
-# SSH 터널 전역 변수 (프로세스 종료 시 정리)
-_ssh_tunnel = None
+# 엔진 역할
+# - primary: 운영 DB (인증 등 최신 데이터가 필요한 조회)
+# - reporting: 리포팅용 읽기 복제본 (통계 집계, 숙소 검색), 미설정/지연 시 primary 사용
+ROLE_PRIMARY = 'primary'
+ROLE_REPORTING = 'reporting'
 
-def _setup_ssh_tunnel():
-    """SSH 터널 설정 (필요한 경우)"""
-    global _ssh_tunnel
-    
-    # SSH 터널 정보 확인
-    ssh_host = os.getenv('SSH_HOST')
-    ssh_port = int(os.getenv('SSH_PORT', 22))
-    ssh_user = os.getenv('SSH_USER')
-    ssh_password = os.getenv('SSH_PASSWORD')
-    
-    # SSH 터널이 필요한지 확인
-    if not ssh_host or not ssh_user:
-        return None  # SSH 터널 미사용
+# 역할별 환경변수 접두사 (reporting은 DB_REPLICA_HOST 등, 없는 항목은 DB_* 값 사용)
+_ROLE_ENV_PREFIX = {
+    ROLE_PRIMARY: 'DB',
+    ROLE_REPORTING: 'DB_REPLICA',
+}
+
+# 복제 지연 기본값 (초)
+DEFAULT_REPLICA_MAX_LAG_SEC = 300
+DEFAULT_REPLICA_LAG_CHECK_SEC = 30
+# 복제본 상태 확인용 연결의 접속/읽기 제한 시간 (초) - 엔진 연결(30초)과 별도로 짧게 유지
+DEFAULT_REPLICA_PROBE_TIMEOUT_SEC = 3
+
+# SSH 터널 관리자 (역할별 1개, config.ssh_tunnel.SSHTunnelManager)
+_tunnel_managers = {}
+_tunnel_lock = threading.Lock()
+
+# 엔진 캐시 (연결 문자열별 1개 - 커넥션 풀을 호출 간에 재사용)
+_engines = {}
+_engines_lock = threading.Lock()
+
+# 복제본 상태 캐시 (지연 확인 쿼리를 DB_REPLICA_LAG_CHECK_SEC마다 1회만 실행)
+# refreshing: 확인 중인 스레드가 있는지 (확인은 1개 스레드만, 나머지는 기다리지 않고 캐시 값 사용)
+_replica_state = {'checked_at': None, 'healthy': True, 'lag': None, 'refreshing': False}
+_replica_lock = threading.Lock()
+
+# 엔진 공통 옵션
+_ENGINE_OPTIONS = {
+    'pool_pre_ping': True,  # 연결 상태 자동 확인 (터널 재연결 후 끊어진 연결 폐기)
+    'pool_recycle': 3600,   # 1시간마다 연결 재활용
+    'echo': False,          # SQL 로그 출력 (디버깅시 True)
+}
+_CONNECT_ARGS = {
+    'connect_timeout': 30,  # 연결 타임아웃 30초
+    'read_timeout': 30,     # 읽기 타임아웃 30초
+    'write_timeout': 30     # 쓰기 타임아웃 30초
+}
+
+def _get_env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+def _setup_ssh_tunnel(role: str = ROLE_PRIMARY):
+    """SSH 터널 관리자 시작 (필요한 경우)"""
+    if role in _tunnel_managers:
+        return _tunnel_managers[role]
     
-    # 원격 DB 정보 확인
-    remote_host = os.getenv('DB_REMOTE_HOST')
-    remote_port = int(os.getenv('DB_REMOTE_PORT', 3306))
+    from config.ssh_tunnel import create_manager_from_env
     
-    if not remote_host:
+    # SSH 터널이 필요한지 확인 (SSH_HOST, SSH_USER, DB_REMOTE_HOST / DB_REPLICA_REMOTE_HOST)
+    manager = create_manager_from_env(remote_env_prefix=f"{_ROLE_ENV_PREFIX[role]}_REMOTE")
+    if manager is None:
         return None  # SSH 터널 미사용
     
     # SSH 터널 라이브러리가 없으면 경고만 출력
-    if not SSH_TUNNEL_AVAILABLE:
+    if importlib.util.find_spec('sshtunnel') is None:
         print("⚠️  SSH 터널 라이브러리가 설치되지 않았습니다.")
         print("   PuTTY 등으로 수동으로 SSH 터널을 설정하거나, 다음 명령으로 설치하세요:")
         print("   pip install sshtunnel")
         return None
     
-    # 이미 터널이 열려있으면 재사용
-    if _ssh_tunnel and _ssh_tunnel.is_alive:
-        return _ssh_tunnel
+    with _tunnel_lock:
+        if role in _tunnel_managers:
+            return _tunnel_managers[role]
+        
+        ssh_host, ssh_port = manager.ssh_address
+        print(f"[SSH] SSH 터널 생성 중... ({manager.ssh_username}@{ssh_host}:{ssh_port}, "
+              f"역할 {role}, 포워더 {len(manager.status())}개)")
+        if manager.start():
+            print(f"[SSH] SSH 터널 생성 완료! {manager.status()}")
+        else:
+            # 백그라운드 점검 스레드가 백오프 간격으로 계속 재연결 시도
+            print("[ERROR] SSH 터널 생성 실패! (logs/error.log 참고, 백그라운드에서 재연결 시도)")
+            print("\n[해결 방법]")
+            print("1. SSH 서버 정보 확인 (SSH_HOST, SSH_PORT, SSH_USER, SSH_PASSWORD)")
+            print("2. 네트워크 연결 확인 (SSH 서버에 접근 가능한지)")
+            print("3. PuTTY 등으로 수동으로 SSH 터널을 설정하거나")
+            print("4. SSH 터널 없이 직접 연결을 시도하세요")
+        _tunnel_managers[role] = manager
+        return manager
+
+def _create_tunnel_engine(manager, db_config):
+    """
+    SSH 터널용 엔진 생성
     
-    try:
-        # SSH 터널 생성
-        print(f"[SSH] SSH 터널 생성 중... ({ssh_user}@{ssh_host}:{ssh_port})")
-        _ssh_tunnel = SSHTunnelForwarder(
-            (ssh_host, ssh_port),
-            ssh_username=ssh_user,
-            ssh_password=ssh_password,
-            remote_bind_address=(remote_host, remote_port),
-            local_bind_address=('127.0.0.1', 0)  # 0은 사용 가능한 포트 자동 할당
+    연결 주소를 URL에 고정하지 않고 creator에서 매번 살아 있는 포워더를 선택하므로
+    터널이 재연결되어 로컬 포트가 바뀌어도 같은 엔진(커넥션 풀)을 계속 사용
+    """
+    from sqlalchemy import create_engine
+    
+    def _connect(host, port):
+        import pymysql
+        return pymysql.connect(
+            host=host,
+            port=port,
+            user=db_config['user'],
+            password=db_config['password'],
+            database=db_config['database'],
+            charset='utf8mb4',
+            **_CONNECT_ARGS
         )
-        _ssh_tunnel.start()
-        print(f"[SSH] SSH 터널 생성 완료! (로컬: {_ssh_tunnel.local_bind_host}:{_ssh_tunnel.local_bind_port})")
-        return _ssh_tunnel
-    except Exception as e:
-        import traceback
-        print(f"[ERROR] SSH 터널 생성 실패!")
-        print(f"[ERROR] 오류 타입: {type(e).__name__}")
-        print(f"[ERROR] 오류 메시지: {str(e)}")
-        print("\n[ERROR] 상세 오류 정보:")
-        traceback.print_exc()
-        print("\n[해결 방법]")
-        print("1. SSH 서버 정보 확인 (SSH_HOST, SSH_PORT, SSH_USER, SSH_PASSWORD)")
-        print("2. 네트워크 연결 확인 (SSH 서버에 접근 가능한지)")
-        print("3. PuTTY 등으로 수동으로 SSH 터널을 설정하거나")
-        print("4. SSH 터널 없이 직접 연결을 시도하세요")
-        return None
+    
+    return create_engine("mysql+pymysql://", creator=manager.connection_creator(_connect), **_ENGINE_OPTIONS)
+
+def is_replica_configured() -> bool:
+    """리포팅 복제본 설정 여부 (DB_REPLICA_HOST, SSH 터널 사용 시 DB_REPLICA_REMOTE_HOST)"""
+    if os.getenv('SSH_HOST') and os.getenv('SSH_USER') and os.getenv('DB_REMOTE_HOST'):
+        return bool(os.getenv('DB_REPLICA_REMOTE_HOST'))
+    return bool(os.getenv('DB_REPLICA_HOST'))
 
-def get_db_connection():
-    """데이터베이스 연결 객체 반환"""
-    global _ssh_tunnel
+def _get_role_config(role: str):
+    """
+    역할별 접속 정보 (역할별 접두사 환경변수 사용, 없는 항목은 DB_* 값)
     
-    # SSH 터널 설정 (필요한 경우)
-    tunnel = _setup_ssh_tunnel()
+    Returns:
+        tuple: (SSH 터널 관리자 또는 None, db_config)
+    """
+    prefix = _ROLE_ENV_PREFIX[role]
     
-    # SSH 터널을 사용하는 경우 로컬 포트 사용
-    if tunnel:
-        db_host = tunnel.local_bind_host
-        db_port = tunnel.local_bind_port
-        print(f"📡 SSH 터널을 통해 DB 연결: {db_host}:{db_port}")
-    else:
-        # 직접 연결
-        db_host = os.getenv('DB_HOST')
-        db_port = int(os.getenv('DB_PORT', 3306))
+    def _env(name, default=None):
+        value = os.getenv(f"{prefix}_{name}")
+        return value if value else os.getenv(f"DB_{name}", default)
     
-    # 환경변수에서 DB 정보 읽기
+    # SSH 터널 설정 (필요한 경우)
+    tunnel = _setup_ssh_tunnel(role)
+    
+    # 환경변수에서 DB 정보 읽기 (SSH 터널 사용 시 호스트/포트는 포워더에서 결정)
     db_config = {
-        'host': db_host,
-        'port': db_port,
-        'user': os.getenv('DB_USER'),
-        'password': os.getenv('DB_PASSWORD'),
-        'database': os.getenv('DB_NAME')
+        'host': f'ssh-tunnel-{role}' if tunnel else os.getenv(f"{prefix}_HOST"),
+        'port': 'ssh-tunnel' if tunnel else int(_env('PORT', 3306)),
+        'user': _env('USER'),
+        'password': _env('PASSWORD'),
+        'database': _env('NAME')
     }
     
     # 필수 정보 확인
     missing = [k for k, v in db_config.items() if not v or v == 'None']
     if missing:
         raise ValueError(f"Missing database configuration: {', '.join(missing)}. Please check .env file.")
+    return tunnel, db_config
+
+def _get_role_engine(role: str):
+    """역할별 엔진 반환 (역할별 접두사 환경변수 사용, 없는 항목은 DB_* 값)"""
+    tunnel, db_config = _get_role_config(role)
     
     # MySQL 연결 문자열 생성
     connection_string = (
@@ -130,25 +184,196 @@ def get_db_connection():
     # 한글 처리를 위한 charset 추가
     connection_string += "?charset=utf8mb4"
     
-    try:
-        engine = create_engine(
-            connection_string,
-            pool_pre_ping=True,  # 연결 상태 자동 확인
-            pool_recycle=3600,   # 1시간마다 연결 재활용
-            echo=False,          # SQL 로그 출력 (디버깅시 True)
-            connect_args={
-                'connect_timeout': 30,  # 연결 타임아웃 30초
-                'read_timeout': 30,     # 읽기 타임아웃 30초
-                'write_timeout': 30     # 쓰기 타임아웃 30초
-            }
-        )
+    # 이미 생성된 엔진이 있으면 재사용
+    engine = _engines.get(connection_string)
+    if engine is not None:
         return engine
+    
+    with _engines_lock:
+        engine = _engines.get(connection_string)
+        if engine is not None:
+            return engine
+        try:
+            if tunnel:
+                engine = _create_tunnel_engine(tunnel, db_config)
+            else:
+                from sqlalchemy import create_engine
+                engine = create_engine(connection_string, connect_args=_CONNECT_ARGS, **_ENGINE_OPTIONS)
+        except Exception as e:
+            print(f"❌ DB 연결 생성 실패: {e}")
+            raise
+        _engines[connection_string] = engine
+        return engine
+
+def get_replica_lag(conn):
+    """
+    복제본의 복제 지연 (초) 조회
+    
+    Args:
+        conn: 복제본 DBAPI 연결 (닫지 않음)
+    
+    Returns:
+        float: 지연 시간 (복제 중이 아닌 서버면 0, 복제가 멈춘 경우 inf)
+    
+    Raises:
+        Exception: 조회 권한(REPLICATION CLIENT) 없음 등
+    """
+    cursor = conn.cursor()
+    try:
+        last_error = None
+        # MySQL 8.0.22+ 는 SHOW REPLICA STATUS, 이전 버전/MariaDB는 SHOW SLAVE STATUS
+        for statement in ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS"):
+            try:
+                cursor.execute(statement)
+            except Exception as e:
+                last_error = e
+                continue
+            row = cursor.fetchone()
+            if row is None:
+                return 0.0
+            status = dict(zip([column[0] for column in cursor.description], row))
+            lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+            return float('inf') if lag is None else float(lag)
+        raise last_error
+    finally:
+        cursor.close()
+
+def _connect_replica_probe(timeout: float):
+    """
+    복제본 상태 확인용 연결 (커넥션 풀을 거치지 않고 짧은 제한 시간으로 직접 접속)
+    
+    복제본에 접속할 수 없을 때 엔진 연결 제한 시간(30초)만큼 기다리지 않도록 별도 연결 사용
+    """
+    import pymysql
+    
+    tunnel, db_config = _get_role_config(ROLE_REPORTING)
+    if tunnel:
+        _, host, port = tunnel.get_address()
+    else:
+        host, port = db_config['host'], db_config['port']
+    return pymysql.connect(
+        host=host,
+        port=port,
+        user=db_config['user'],
+        password=db_config['password'],
+        database=db_config['database'],
+        charset='utf8mb4',
+        connect_timeout=timeout,
+        read_timeout=timeout,
+        write_timeout=timeout
+    )
+
+def _is_replica_healthy() -> bool:
+    """
+    복제 지연이 DB_REPLICA_MAX_LAG_SEC 이하인지 확인 (결과는 DB_REPLICA_LAG_CHECK_SEC 동안 재사용)
+    
+    확인 주기가 지나면 호출한 스레드 1개만 확인 (DB_REPLICA_PROBE_TIMEOUT_SEC 제한)
+    확인 중에는 다른 스레드가 기다리지 않고 이전 결과 사용 (첫 확인 중이면 primary 사용)
+    """
+    check_interval = _get_env_float('DB_REPLICA_LAG_CHECK_SEC', DEFAULT_REPLICA_LAG_CHECK_SEC)
+    with _replica_lock:
+        checked_at = _replica_state['checked_at']
+        if checked_at is not None and time.monotonic() - checked_at < check_interval:
+            return _replica_state['healthy']
+        if _replica_state['refreshing']:
+            return _replica_state['healthy'] if checked_at is not None else False
+        _replica_state['refreshing'] = True
+    
+    try:
+        return _refresh_replica_state()
+    finally:
+        with _replica_lock:
+            _replica_state['refreshing'] = False
+
+def _refresh_replica_state() -> bool:
+    """복제본 상태 확인 후 캐시 갱신 (_is_replica_healthy에서 1개 스레드만 호출, 잠금 없이 실행)"""
+    from utils.logger import log_app, log_error
+    from utils.metrics import DB_REPLICA_LAG
+    
+    max_lag = _get_env_float('DB_REPLICA_MAX_LAG_SEC', DEFAULT_REPLICA_MAX_LAG_SEC)
+    timeout = _get_env_float('DB_REPLICA_PROBE_TIMEOUT_SEC', DEFAULT_REPLICA_PROBE_TIMEOUT_SEC)
+    first_check = _replica_state['checked_at'] is None
+    previous = _replica_state['healthy']
+    lag = None
+    try:
+        conn = _connect_replica_probe(timeout)
     except Exception as e:
-        print(f"❌ DB 연결 생성 실패: {e}")
-        raise
+        healthy = False
+        if first_check or previous:
+            log_error("WARNING", "복제본 접속 실패 - primary로 전환", exception=e, timeout_sec=timeout)
+    else:
+        try:
+            lag = get_replica_lag(conn)
+            healthy = lag <= max_lag
+            DB_REPLICA_LAG.set(lag if lag != float('inf') else -1)
+            if not healthy:
+                log_error("WARNING", "복제본 지연 초과 - primary로 전환", lag_sec=lag, max_lag_sec=max_lag)
+            elif not previous:
+                log_app("INFO", "복제본 지연 정상화 - 복제본 사용 재개", lag_sec=lag)
+        except Exception as e:
+            # 지연 조회 권한이 없는 경우 등: 복제본 접속 자체는 가능하므로 사용
+            healthy = True
+            if first_check or not previous:
+                log_error("WARNING", "복제본 지연 확인 실패", exception=e, use_replica=healthy)
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+    
+    with _replica_lock:
+        _replica_state.update(checked_at=time.monotonic(), healthy=healthy, lag=lag)
+    return healthy
+
+def get_db_connection(role: str = ROLE_PRIMARY):
+    """
+    데이터베이스 연결 객체 반환
+    
+    Args:
+        role: 엔진 역할 (ROLE_PRIMARY, ROLE_REPORTING)
+              reporting은 복제본이 설정되어 있고 지연이 임계값 이하일 때만 복제본 엔진 반환
+    """
+    if role == ROLE_REPORTING and is_replica_configured():
+        from utils.metrics import DB_ROUTE
+        try:
+            engine = _get_role_engine(ROLE_REPORTING)
+            if _is_replica_healthy():
+                DB_ROUTE.inc(role=role, target=ROLE_REPORTING)
+                return engine
+        except Exception as e:
+            from utils.logger import log_error
+            log_error("WARNING", "복제본 엔진 생성 실패 - primary 사용", exception=e)
+        DB_ROUTE.inc(role=role, target=ROLE_PRIMARY)
+    
+    return _get_role_engine(ROLE_PRIMARY)
+
+def get_pool_status() -> list:
+    """
+    생성된 엔진별 커넥션 풀 사용 현황 (부하 테스트/점검용, 엔진을 새로 만들지 않음)
+    
+    Returns:
+        list: [{'engine': '호스트:포트/DB명', 'size', 'checked_out', 'overflow'}]
+              overflow는 풀 크기를 넘어 추가로 연 연결 수
+    """
+    with _engines_lock:
+        engines = list(_engines.items())
+    
+    status = []
+    for connection_string, engine in engines:
+        pool = engine.pool
+        status.append({
+            # 연결 문자열에서 계정/비밀번호와 옵션 제외
+            'engine': connection_string.split('@', 1)[-1].split('?', 1)[0],
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(0, pool.overflow())
+        })
+    return status
 
 def test_connection():
     """DB 연결 테스트"""
+    import pandas as pd
+    
     print("="*50)
     print("📊 DB 연결 테스트 시작")
     print("="*50)
@@ -222,7 +447,7 @@ def test_connection():
         print("🎉 DB 연결 테스트 완료!")
         print("="*50)
         return True
-        
+    
     except Exception as e:
         print("\n" + "="*50)
         print(f"❌ DB 연결 테스트 실패!")
@@ -0,0 +1,317 @@
+# config/ssh_tunnel.py
+"""SSH 터널 관리 모듈
+- SSH 터널(포워더)을 상시 유지하고 백그라운드 스레드에서 상태 점검
+- SSH keepalive 패킷 전송 (SSH_TUNNEL_KEEPALIVE_SEC)
+- 상태 점검은 포워더/SSH 전송 계층(transport)만 확인하고 DB 포트에는 접속하지 않음
+  (인사 패킷만 받고 끊는 접속은 MySQL Aborted_connects에 누적되어 max_connect_errors 초과 시 SSH 서버 호스트가 차단됨)
+- 끊어진 포워더는 지수 백오프로 자동 재연결
+- 포워더 여러 개(SSH_TUNNEL_COUNT)를 열어 DB 연결을 라운드로빈 분산 (paramiko 채널 1개에 모든 연결이 몰리지 않도록)
+- 터널 상태/재연결/연결 수/연결 시간 메트릭 기록 (utils.metrics)
+
+포워더는 forwarder_factory로 교체 가능하므로 로컬 sshd(예: 127.0.0.1:2222)나
+start()/stop()/is_alive/local_bind_host/local_bind_port(선택: is_active)를 가진 대역 객체로 시험할 수 있음
+"""
+
+import os
+import random
+import threading
+import time
+
+from utils.metrics import (
+    SSH_TUNNEL_CONNECT_DURATION,
+    SSH_TUNNEL_CONNECTIONS,
+    SSH_TUNNEL_RESTARTS,
+    SSH_TUNNEL_UP,
+)
+
+# 기본 설정
+DEFAULT_KEEPALIVE_SEC = 30.0
+DEFAULT_CHECK_INTERVAL_SEC = 10.0
+DEFAULT_BACKOFF_BASE_SEC = 1.0
+DEFAULT_BACKOFF_MAX_SEC = 60.0
+
+
+def _get_env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class _ForwarderSlot:
+    """포워더 1개의 상태 (재연결 백오프 포함)"""
+    
+    def __init__(self, index: int):
+        self.index = index
+        self.label = str(index)
+        self.forwarder = None
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.lock = threading.Lock()
+    
+    def alive_address(self):
+        """살아 있으면 (로컬 호스트, 포트), 아니면 None"""
+        forwarder = self.forwarder
+        if forwarder is None or not forwarder.is_alive:
+            return None
+        return forwarder.local_bind_host, forwarder.local_bind_port
+
+
+class SSHTunnelManager:
+    """
+    SSH 터널 관리자
+    
+    사용 예:
+        manager = SSHTunnelManager(('bastion', 22), 'user', 'pw', ('db-host', 3306), forwarders=2)
+        manager.start()
+        index, host, port = manager.get_address()   # 라운드로빈으로 살아 있는 포워더 선택
+    """
+    
+    def __init__(self, ssh_address, ssh_username, ssh_password, remote_bind_address,
+                 forwarders: int = 1, keepalive_sec: float = DEFAULT_KEEPALIVE_SEC,
+                 check_interval_sec: float = DEFAULT_CHECK_INTERVAL_SEC,
+                 backoff_base_sec: float = DEFAULT_BACKOFF_BASE_SEC,
+                 backoff_max_sec: float = DEFAULT_BACKOFF_MAX_SEC,
+                 probe: bool = True, forwarder_factory=None):
+        """
+        Args:
+            ssh_address: (SSH 호스트, 포트)
+            ssh_username / ssh_password: SSH 계정
+            remote_bind_address: SSH 서버에서 본 DB 주소 (호스트, 포트)
+            forwarders: 동시에 유지할 포워더 수
+            keepalive_sec: SSH keepalive 간격 (초)
+            check_interval_sec: 상태 점검 간격 (초)
+            backoff_base_sec / backoff_max_sec: 재연결 백오프 시작/최대 간격 (초)
+            probe: 점검 시 SSH 전송 계층(transport)이 살아 있는지까지 확인할지 여부
+            forwarder_factory: index를 받아 포워더를 생성하는 함수 (없으면 sshtunnel.SSHTunnelForwarder)
+        """
+        self.ssh_address = ssh_address
+        self.ssh_username = ssh_username
+        self.ssh_password = ssh_password
+        self.remote_bind_address = remote_bind_address
+        self.keepalive_sec = keepalive_sec
+        self.check_interval_sec = check_interval_sec
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+        self.probe = probe
+        self.forwarder_factory = forwarder_factory or self._create_sshtunnel_forwarder
+        
+        self._slots = [_ForwarderSlot(i) for i in range(max(1, forwarders))]
+        self._next = 0
+        self._next_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._monitor = None
+    
+    def _create_sshtunnel_forwarder(self, index: int):
+        """sshtunnel 포워더 생성 (paramiko는 터널이 필요할 때만 import)"""
+        from sshtunnel import SSHTunnelForwarder
+        
+        return SSHTunnelForwarder(
+            self.ssh_address,
+            ssh_username=self.ssh_username,
+            ssh_password=self.ssh_password,
+            remote_bind_address=self.remote_bind_address,
+            local_bind_address=('127.0.0.1', 0),  # 0은 사용 가능한 포트 자동 할당
+            set_keepalive=self.keepalive_sec,
+        )
+    
+    def start(self) -> bool:
+        """
+        모든 포워더 시작 및 상태 점검 스레드 실행
+        
+        Returns:
+            bool: 1개 이상의 포워더가 열렸는지 여부
+        """
+        for slot in self._slots:
+            self._restart(slot)
+        
+        if self._monitor is None or not self._monitor.is_alive():
+            self._stop_event.clear()
+            self._monitor = threading.Thread(target=self._monitor_loop, name="ssh-tunnel-monitor", daemon=True)
+            self._monitor.start()
+        return any(slot.alive_address() for slot in self._slots)
+    
+    def stop(self):
+        """상태 점검 중지 및 모든 포워더 종료"""
+        self._stop_event.set()
+        for slot in self._slots:
+            with slot.lock:
+                self._close(slot)
+    
+    def _close(self, slot: _ForwarderSlot):
+        """포워더 종료 (slot.lock 안에서 호출)"""
+        forwarder, slot.forwarder = slot.forwarder, None
+        SSH_TUNNEL_UP.set(0, forwarder=slot.label)
+        if forwarder is None:
+            return
+        try:
+            forwarder.stop()
+        except Exception:
+            pass
+    
+    def _restart(self, slot: _ForwarderSlot) -> bool:
+        """포워더 재생성 (백오프 대기 중이면 건너뜀)"""
+        from utils.logger import log_app, log_error
+        
+        with slot.lock:
+            if time.monotonic() < slot.next_attempt:
+                return False
+            self._close(slot)
+            forwarder = None
+            try:
+                forwarder = self.forwarder_factory(slot.index)
+                forwarder.start()
+            except Exception as e:
+                if forwarder is not None:
+                    try:
+                        forwarder.stop()
+                    except Exception:
+                        pass
+                slot.failures += 1
+                delay = min(self.backoff_max_sec, self.backoff_base_sec * (2 ** (slot.failures - 1)))
+                # 여러 워커가 동시에 재연결하지 않도록 지터 추가
+                slot.next_attempt = time.monotonic() + delay * random.uniform(0.5, 1.0)
+                SSH_TUNNEL_RESTARTS.inc(forwarder=slot.label, result='failure')
+                log_error("WARNING", "SSH 터널 연결 실패", exception=e,
+                          forwarder=slot.index, failures=slot.failures, retry_after_sec=round(delay, 1))
+                return False
+            
+            slot.forwarder = forwarder
+            slot.failures = 0
+            slot.next_attempt = 0.0
+            SSH_TUNNEL_UP.set(1, forwarder=slot.label)
+            SSH_TUNNEL_RESTARTS.inc(forwarder=slot.label, result='success')
+            log_app("INFO", "SSH 터널 연결", forwarder=slot.index,
+                    local=f"{forwarder.local_bind_host}:{forwarder.local_bind_port}")
+            return True
+    
+    def _probe(self, forwarder) -> bool:
+        """
+        SSH 전송 계층 활성 여부 (sshtunnel의 is_active, keepalive 응답이 끊기면 False)
+        
+        DB 포트로 접속하지 않음 - 종단 간 확인은 커넥션 풀의 pool_pre_ping(SELECT 1)이 담당
+        is_active가 없는 대역 포워더는 is_alive만으로 판단
+        """
+        return bool(getattr(forwarder, 'is_active', True))
+    
+    def check(self):
+        """모든 포워더 상태 점검 후 끊어진 포워더 재연결"""
+        from utils.logger import log_error
+        
+        for slot in self._slots:
+            forwarder = slot.forwarder
+            healthy = forwarder is not None and forwarder.is_alive and (not self.probe or self._probe(forwarder))
+            if healthy:
+                SSH_TUNNEL_UP.set(1, forwarder=slot.label)
+                continue
+            if slot.forwarder is not None:
+                log_error("WARNING", "SSH 터널 끊김 감지 - 재연결 시도", forwarder=slot.index)
+            self._restart(slot)
+    
+    def _monitor_loop(self):
+        while not self._stop_event.wait(self.check_interval_sec):
+            try:
+                self.check()
+            except Exception as e:
+                from utils.logger import log_error
+                log_error("ERROR", "SSH 터널 상태 점검 오류", exception=e)
+    
+    def get_address(self):
+        """
+        라운드로빈으로 살아 있는 포워더의 로컬 주소 반환
+        
+        살아 있는 포워더가 없으면 즉시 재연결을 시도 (백오프 대기 중인 포워더는 제외)
+        
+        Returns:
+            tuple: (포워더 번호, 로컬 호스트, 로컬 포트)
+        
+        Raises:
+            ConnectionError: 사용 가능한 포워더가 없는 경우
+        """
+        with self._next_lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self._slots)
+        
+        ordered = self._slots[start:] + self._slots[:start]
+        for slot in ordered:
+            address = slot.alive_address()
+            if address:
+                return (slot.index,) + address
+        for slot in ordered:
+            if self._restart(slot):
+                address = slot.alive_address()
+                if address:
+                    return (slot.index,) + address
+        raise ConnectionError("사용 가능한 SSH 터널이 없습니다.")
+    
+    def connection_creator(self, connect):
+        """
+        SQLAlchemy create_engine(creator=...)용 함수 생성
+        
+        커넥션 풀이 새 연결을 만들 때마다 포워더를 라운드로빈으로 선택하므로
+        터널이 재연결되어 로컬 포트가 바뀌어도 엔진을 다시 만들 필요가 없음
+        
+        Args:
+            connect: (host, port)를 받아 DBAPI 연결을 반환하는 함수
+        """
+        def _creator():
+            index, host, port = self.get_address()
+            label = str(index)
+            started = time.perf_counter()
+            try:
+                conn = connect(host, port)
+            except Exception:
+                SSH_TUNNEL_CONNECTIONS.inc(forwarder=label, status='error')
+                raise
+            SSH_TUNNEL_CONNECT_DURATION.observe(time.perf_counter() - started, forwarder=label)
+            SSH_TUNNEL_CONNECTIONS.inc(forwarder=label, status='ok')
+            return conn
+        
+        return _creator
+    
+    def status(self) -> list:
+        """포워더별 상태 (디버깅/모니터링용)"""
+        result = []
+        for slot in self._slots:
+            address = slot.alive_address()
+            result.append({
+                'forwarder': slot.index,
+                'up': address is not None,
+                'local': "%s:%s" % address if address else None,
+                'failures': slot.failures,
+            })
+        return result
+
+
+def create_manager_from_env(forwarder_factory=None, remote_env_prefix: str = 'DB_REMOTE'):
+    """
+    .env 설정으로 SSHTunnelManager 생성 (SSH 터널 미사용 환경이면 None)
+    
+    SSH_HOST, SSH_PORT, SSH_USER, SSH_PASSWORD, DB_REMOTE_HOST, DB_REMOTE_PORT
+    SSH_TUNNEL_COUNT (기본값 1), SSH_TUNNEL_KEEPALIVE_SEC (기본값 30), SSH_TUNNEL_CHECK_INTERVAL_SEC (기본값 10)
+    
+    Args:
+        forwarder_factory: 포워더 생성 함수 (시험용)
+        remote_env_prefix: 원격 DB 주소 환경변수 접두사 (리포팅 복제본은 DB_REPLICA_REMOTE)
+    """
+    ssh_host = os.getenv('SSH_HOST')
+    ssh_user = os.getenv('SSH_USER')
+    remote_host = os.getenv(f'{remote_env_prefix}_HOST')
+    if not ssh_host or not ssh_user or not remote_host:
+        return None
+    
+    try:
+        forwarders = max(1, int(os.getenv('SSH_TUNNEL_COUNT', 1)))
+    except ValueError:
+        forwarders = 1
+    
+    return SSHTunnelManager(
+        (ssh_host, int(os.getenv('SSH_PORT', 22))),
+        ssh_user,
+        os.getenv('SSH_PASSWORD'),
+        (remote_host, int(os.getenv(f'{remote_env_prefix}_PORT', 3306))),
+        forwarders=forwarders,
+        keepalive_sec=_get_env_float('SSH_TUNNEL_KEEPALIVE_SEC', DEFAULT_KEEPALIVE_SEC),
+        check_interval_sec=_get_env_float('SSH_TUNNEL_CHECK_INTERVAL_SEC', DEFAULT_CHECK_INTERVAL_SEC),
+        forwarder_factory=forwarder_factory,
+    )
@@ -0,0 +1,167 @@
+# tools/bcrypt_calibrate.py
+"""bcrypt cost 측정 도구
+- 현재 서버에서 cost별 bcrypt 검증 시간 측정
+- 목표 시간(--target-ms) 이내에서 가장 높은 cost를 BCRYPT_ROUNDS 권장값으로 출력
+- 검증 워커 수(AUTH_VERIFY_WORKERS) 기준 초당 최대 로그인 처리량 추정
+- --check-db: tblmanager.passwd 해시 유형 분포와 컬럼 길이 확인 (AUTH_REHASH_ENABLED 사용 전 점검)
+
+사용법:
+    python -m tools.bcrypt_calibrate
+    python -m tools.bcrypt_calibrate --target-ms 250 --min-rounds 10 --max-rounds 14
+    python -m tools.bcrypt_calibrate --check-db
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# 프로젝트 루트 경로 추가
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+import bcrypt
+
+from utils.password_verifier import DEFAULT_VERIFY_WORKERS, get_bcrypt_rounds
+
+# 측정용 비밀번호 (실제 비밀번호와 무관)
+_SAMPLE_PASSWORD = b"calibration-password-1234"
+
+
+def measure_rounds(rounds: int, samples: int = 5) -> dict:
+    """
+    cost별 checkpw 소요 시간 측정
+    
+    Returns:
+        dict: {'rounds', 'median_ms', 'min_ms', 'max_ms'}
+    """
+    hashed = bcrypt.hashpw(_SAMPLE_PASSWORD, bcrypt.gensalt(rounds=rounds))
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.checkpw(_SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'rounds': rounds,
+        'median_ms': round(statistics.median(timings), 1),
+        'min_ms': round(min(timings), 1),
+        'max_ms': round(max(timings), 1),
+    }
+
+
+def calibrate(target_ms: float, min_rounds: int, max_rounds: int, samples: int, workers: int) -> dict:
+    """
+    cost 범위를 측정하고 권장 cost 선택
+    
+    cost가 1 오를 때마다 시간이 약 2배가 되므로 목표 시간을 크게 넘으면 측정 중단
+    """
+    results = []
+    for rounds in range(min_rounds, max_rounds + 1):
+        result = measure_rounds(rounds, samples)
+        result['logins_per_sec'] = round(workers * 1000 / result['median_ms'], 1) if result['median_ms'] else 0.0
+        results.append(result)
+        if result['median_ms'] > target_ms * 2:
+            break
+    
+    within_target = [r for r in results if r['median_ms'] <= target_ms]
+    recommended = within_target[-1]['rounds'] if within_target else min_rounds
+    
+    return {
+        'target_ms': target_ms,
+        'workers': workers,
+        'current_rounds': get_bcrypt_rounds(),
+        'recommended_rounds': recommended,
+        'results': results,
+    }
+
+
+def check_db() -> dict:
+    """tblmanager.passwd 해시 유형 분포 및 컬럼 길이 조회"""
+    from utils.db_access import fetch_all, fetch_one
+    
+    column = fetch_one(
+        """
+        SELECT CHARACTER_MAXIMUM_LENGTH
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'tblmanager' AND COLUMN_NAME = 'passwd'
+        """,
+        query_name='calibrate_passwd_column'
+    )
+    rows = fetch_all(
+        """
+        SELECT
+            CASE
+                WHEN CHAR_LENGTH(passwd) = 60 AND passwd LIKE '$2%' THEN CONCAT('bcrypt (cost ', SUBSTRING(passwd, 5, 2), ')')
+                WHEN CHAR_LENGTH(passwd) = 32 THEN 'MD5'
+                WHEN CHAR_LENGTH(passwd) = 64 THEN 'SHA256'
+                ELSE '평문/기타'
+            END AS hash_type,
+            COUNT(*) AS cnt
+        FROM tblmanager
+        GROUP BY hash_type
+        ORDER BY cnt DESC
+        """,
+        query_name='calibrate_hash_types'
+    )
+    max_length = column[0] if column else None
+    return {
+        'passwd_max_length': max_length,
+        'rehash_safe': max_length is None or max_length >= 60,
+        'hash_types': {hash_type: int(cnt) for hash_type, cnt in rows},
+    }
+
+
+def print_report(result: dict, db_result: dict = None):
+    """측정 결과 출력"""
+    print("=" * 60)
+    print(f"🔐 bcrypt cost 측정 (목표 {result['target_ms']:.0f}ms, 검증 워커 {result['workers']}개)")
+    print("=" * 60)
+    print(f"  {'cost':>6}{'median(ms)':>12}{'min(ms)':>10}{'max(ms)':>10}{'로그인/초':>12}")
+    for r in result['results']:
+        marker = " ◀ 권장" if r['rounds'] == result['recommended_rounds'] else ""
+        print(f"  {r['rounds']:>6}{r['median_ms']:>12,.1f}{r['min_ms']:>10,.1f}{r['max_ms']:>10,.1f}"
+              f"{r['logins_per_sec']:>12,.1f}{marker}")
+    
+    print(f"\n현재 BCRYPT_ROUNDS: {result['current_rounds']}")
+    print(f"권장 설정: BCRYPT_ROUNDS={result['recommended_rounds']}")
+    
+    if db_result:
+        print("\n[tblmanager.passwd]")
+        print(f"  컬럼 최대 길이: {db_result['passwd_max_length']}")
+        for hash_type, cnt in db_result['hash_types'].items():
+            print(f"  {hash_type}: {cnt:,}건")
+        if not db_result['rehash_safe']:
+            print("  ⚠️  컬럼 길이가 60자 미만이므로 AUTH_REHASH_ENABLED를 사용하면 안 됩니다.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="서버의 bcrypt cost별 검증 시간 측정 및 BCRYPT_ROUNDS 권장값 산출")
+    parser.add_argument('--target-ms', type=float, default=250.0, help="로그인 1회 검증 목표 시간 (기본값: 250ms)")
+    parser.add_argument('--min-rounds', type=int, default=10, help="측정 시작 cost (기본값: 10)")
+    parser.add_argument('--max-rounds', type=int, default=14, help="측정 최대 cost (기본값: 14)")
+    parser.add_argument('--samples', type=int, default=5, help="cost별 측정 횟수 (기본값: 5)")
+    parser.add_argument('--workers', type=int,
+                        default=int(os.getenv('AUTH_VERIFY_WORKERS', min(DEFAULT_VERIFY_WORKERS, os.cpu_count() or 1))),
+                        help="처리량 추정에 사용할 검증 워커 수 (기본값: AUTH_VERIFY_WORKERS)")
+    parser.add_argument('--check-db', action='store_true', help="tblmanager.passwd 해시 유형 분포 확인")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    
+    result = calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples, args.workers)
+    db_result = check_db() if args.check_db else None
+    
+    if args.json:
+        if db_result:
+            result['db'] = db_result
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result, db_result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# tools/build_daily_stats.py
+"""숙소별 일자 집계 테이블(hotel_daily_stats) 적재 도구
+- 원본 테이블(order_product/order_item/order_pay)에서 일자 x 숙소 x 채널 집계를 다시 계산하여 적재
+- 야간 배치: 최근 N일(--days, 기본값 7)을 다시 적재하여 마감 후 늦게 반영된 취소/상태 변경 반영
+- 최초 적재: --start로 시작일 지정 (예: 1년치), 적재 후 .env에 HOTEL_STATS_ROLLUP_ENABLED=true 설정
+- 증분 갱신(--incremental): 마지막 실행 이후 새로 마감된 날짜와 새로 들어오거나 변경된 주문의
+  (일자, 숙소, 채널) 셀만 다시 집계 (최초 적재 후 짧은 주기로 실행, 늦은 취소 반영)
+- 원본 집계는 리포팅 엔진(복제본)에서 실행, 적재는 --target 엔진 (기본값: primary)
+
+사용법:
+    python -m tools.build_daily_stats --create-tables
+    python -m tools.build_daily_stats --start 2024-01-01
+    python -m tools.build_daily_stats                 # 야간 배치 (최근 7일)
+    python -m tools.build_daily_stats --days 30 --date-types orderDate --dry-run
+    python -m tools.build_daily_stats --incremental   # 증분 갱신
+
+cron 예시 (매일 03:10):
+    10 3 * * * cd /path/to/app && python -m tools.build_daily_stats >> logs/rollup.log 2>&1
+    */15 * * * * cd /path/to/app && python -m tools.build_daily_stats --incremental >> logs/rollup.log 2>&1
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import date, timedelta
+
+# 프로젝트 루트 경로 추가
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from config.configdb import ROLE_PRIMARY, ROLE_REPORTING, get_db_connection
+from utils.daily_stats_rollup import DATE_TYPES, build_rollup, create_tables_sql, get_rollup_table, refresh_rollup
+
+
+def create_tables(engine):
+    """집계 테이블 / 적재 기간 테이블 생성 (이미 있으면 유지)"""
+    from sqlalchemy import text
+    
+    with engine.begin() as conn:
+        for statement in create_tables_sql():
+            conn.execute(text(statement))
+
+
+def _run_incremental(args, target_engine):
+    """증분 갱신 실행 및 결과 출력"""
+    results = refresh_rollup(date_types=args.date_types, source_engine=get_db_connection(ROLE_REPORTING),
+                             target_engine=target_engine, check_days=args.check_days, dry_run=args.dry_run)
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2, default=str))
+        return 0
+    
+    print("=" * 60)
+    print(f"🔄 일자 집계 증분 갱신 ({results['mode']}){' (dry-run)' if args.dry_run else ''}")
+    print("=" * 60)
+    print(f"  order_product.idx: {results['last_idx']} -> {results['max_idx']}")
+    exit_code = 0
+    for date_type in args.date_types:
+        result = results[date_type]
+        if 'error' in result:
+            print(f"  [{date_type}] ❌ {result['error']}")
+            exit_code = 1
+            continue
+        print(f"  [{date_type}] 새 마감일 {result['new_days']}일, 변경 셀 {result['cells']:,}개 "
+              f"({result['rows']:,}행 다시 적재), 적재 종료일 {result['built_until']}")
+    print(f"  소요 시간: {results['elapsed_sec']:.1f}초")
+    return exit_code
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="hotel_daily_stats 일자 집계 테이블 적재")
+    parser.add_argument('--start', type=date.fromisoformat, help="시작일 (기본값: 종료일 - (--days - 1))")
+    parser.add_argument('--end', type=date.fromisoformat, help="종료일 (기본값: 어제, 오늘 이후는 어제로 제한)")
+    parser.add_argument('--days', type=int, default=7, help="--start 미지정 시 다시 적재할 최근 일수 (기본값: 7)")
+    parser.add_argument('--date-types', nargs='+', default=list(DATE_TYPES), choices=DATE_TYPES,
+                        help="적재할 날짜유형 (기본값: orderDate useDate)")
+    parser.add_argument('--target', default=ROLE_PRIMARY, choices=[ROLE_PRIMARY, ROLE_REPORTING],
+                        help="적재 엔진 (기본값: primary, 복제본 로컬 스키마에 적재 시 reporting)")
+    parser.add_argument('--chunk-days', type=int, default=7, help="한 트랜잭션에서 교체할 일수 (기본값: 7)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="증분 갱신 (새로 마감된 날짜 + 마지막 실행 이후 변경된 셀만 다시 집계)")
+    parser.add_argument('--check-days', type=int,
+                        help="증분 갱신 시 체크섬을 비교할 최근 일수 (기본값: HOTEL_STATS_CHECK_DAYS 또는 60)")
+    parser.add_argument('--create-tables', action='store_true', help="집계 테이블 생성 후 종료")
+    parser.add_argument('--dry-run', action='store_true', help="원본 집계만 실행하고 적재하지 않음")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    
+    target_engine = get_db_connection(args.target)
+    
+    if args.create_tables:
+        create_tables(target_engine)
+        print(f"✅ 집계 테이블 생성 완료: {get_rollup_table()}")
+        return 0
+    
+    if args.incremental:
+        return _run_incremental(args, target_engine)
+    
+    end_date = args.end or date.today() - timedelta(days=1)
+    start_date = args.start or end_date - timedelta(days=max(1, args.days) - 1)
+    
+    results = build_rollup(start_date, end_date, date_types=args.date_types,
+                           source_engine=get_db_connection(ROLE_REPORTING), target_engine=target_engine,
+                           chunk_days=args.chunk_days, dry_run=args.dry_run)
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2, default=str))
+        return 0
+    
+    print("=" * 60)
+    print(f"📦 일자 집계 적재 {start_date} ~ {end_date}{' (dry-run)' if args.dry_run else ''}")
+    print("=" * 60)
+    if not results:
+        print("  적재할 마감일이 없습니다.")
+    for date_type, result in results.items():
+        print(f"  [{date_type}] {result['rows']:,}행 ({result['chunks']}구간, {result['elapsed_sec']:.1f}초)")
+        if result['skipped']:
+            print(f"    숙소 정보가 없어 제외한 행: {result['skipped']:,}")
+        if result['built_until']:
+            print(f"    적재 기간: {result['built_from']} ~ {result['built_until']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# tools/export_parquet_snapshot.py
+"""DuckDB 분석 엔진용 Parquet 스냅샷 생성 도구
+- 리포팅 DB(복제본)에서 통계 원본 테이블을 읽어 HOTEL_STATS_PARQUET_DIR 아래 새 스냅샷 디렉토리에 저장
+- 모든 테이블을 한 트랜잭션(REPEATABLE READ)에서 읽어 테이블 간 시점을 맞춤
+- 컬럼 타입은 information_schema 기준으로 고정 (청크별 파일의 스키마가 달라지지 않도록)
+- 저장이 끝나면 CURRENT를 교체하고 오래된 스냅샷 삭제 (조회 중인 프로세스를 위해 --keep개 보관)
+- --since: 그 날짜 이후 구매/이용 주문만 저장 (스냅샷이 포함하지 않는 기간은 MySQL로 조회)
+
+사용법:
+    python -m tools.export_parquet_snapshot
+    python -m tools.export_parquet_snapshot --since 2024-01-01 --keep 3
+
+cron 예시 (매일 03:30, 일자 집계 적재 이후):
+    30 3 * * * cd /path/to/app && python -m tools.export_parquet_snapshot >> logs/snapshot.log 2>&1
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import date, datetime
+
+# 프로젝트 루트 경로 추가
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from config.configdb import ROLE_REPORTING, get_db_connection
+from utils.db_access import fetch_all
+from utils.duckdb_engine import (
+    SNAPSHOT_PREFIX,
+    SNAPSHOT_TABLES,
+    get_snapshot_dir,
+    last_closed_day,
+    read_manifest,
+    write_manifest,
+)
+
+# MySQL -> DuckDB 타입 (목록에 없는 타입은 VARCHAR)
+_INTEGER_TYPES = ('tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint')
+_FLOAT_TYPES = ('float', 'double', 'real')
+
+
+def _duckdb_type(data_type: str, precision, scale) -> str:
+    data_type = data_type.lower()
+    if data_type in _INTEGER_TYPES:
+        return 'BIGINT'
+    if data_type == 'decimal':
+        # 입금가/결제금액 합계가 MySQL과 같도록 DECIMAL 유지
+        return f"DECIMAL({min(int(precision or 18), 38)}, {int(scale or 0)})"
+    if data_type in _FLOAT_TYPES:
+        return 'DOUBLE'
+    if data_type == 'date':
+        return 'DATE'
+    if data_type in ('datetime', 'timestamp'):
+        return 'TIMESTAMP'
+    return 'VARCHAR'
+
+
+def read_column_types(source_engine, table: str, columns) -> dict:
+    """information_schema에서 컬럼 타입 조회 -> {컬럼: DuckDB 타입}"""
+    rows = fetch_all(
+        "SELECT COLUMN_NAME, DATA_TYPE, NUMERIC_PRECISION, NUMERIC_SCALE FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,),
+        query_name='snapshot_column_types',
+        engine=source_engine
+    )
+    types = {name: _duckdb_type(data_type, precision, scale) for name, data_type, precision, scale in rows}
+    missing = [column for column in columns if column not in types]
+    if missing:
+        raise ValueError(f"{table} 테이블에 컬럼이 없습니다: {', '.join(missing)}")
+    return {column: types[column] for column in columns}
+
+
+def _table_filters(since: date) -> dict:
+    """--since 지정 시 테이블별 조건 (주문에 딸린 행만, 숙소/코드는 전체)"""
+    if since is None:
+        return {}
+    orders = f"(create_date >= '{since}' OR checkin_date >= '{since}')"
+    return {
+        'order_product': orders,
+        'order_item': f"order_product_idx IN (SELECT idx FROM order_product WHERE {orders})",
+        'order_pay': f"idx IN (SELECT order_pay_idx FROM order_product WHERE {orders})",
+    }
+
+
+def export_table(conn, duck, table: str, column_types: dict, table_dir: str, where: str = None,
+                 chunk_rows: int = 200000) -> int:
+    """
+    테이블 1개를 청크별 Parquet 파일로 저장
+    
+    Args:
+        conn: 원본 SQLAlchemy Connection (스트리밍 조회)
+        duck: DuckDB 연결 (Parquet 쓰기)
+        table: 테이블 이름
+        column_types: {컬럼: DuckDB 타입}
+        table_dir: 저장 디렉토리
+        where: 조회 조건
+        chunk_rows: 파일당 행 수
+    
+    Returns:
+        int: 저장한 행 수
+    """
+    import pandas as pd
+    
+    os.makedirs(table_dir, exist_ok=True)
+    select = ', '.join(f'CAST("{column}" AS {column_type}) AS "{column}"'
+                       for column, column_type in column_types.items())
+    query = f"SELECT {', '.join(column_types)} FROM {table}" + (f" WHERE {where}" if where else "")
+    
+    rows = 0
+    part = 0
+    for chunk in pd.read_sql(query, conn, chunksize=chunk_rows):
+        path = os.path.join(table_dir, f"part-{part:05d}.parquet").replace("'", "''")
+        duck.register('chunk', chunk)
+        try:
+            duck.execute(f"COPY (SELECT {select} FROM chunk) TO '{path}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+        finally:
+            duck.unregister('chunk')
+        rows += len(chunk)
+        part += 1
+    
+    if part == 0:
+        # 빈 테이블도 스키마가 있는 파일을 남겨 뷰 조회가 실패하지 않도록 함
+        empty = ', '.join(f'CAST(NULL AS {column_type}) AS "{column}"' for column, column_type in column_types.items())
+        path = os.path.join(table_dir, "part-00000.parquet").replace("'", "''")
+        duck.execute(f"COPY (SELECT {empty} WHERE false) TO '{path}' (FORMAT PARQUET)")
+    return rows
+
+
+def prune_snapshots(base_dir: str, keep: int, current: str) -> list:
+    """현재 스냅샷을 포함해 최근 keep개만 남기고 삭제"""
+    snapshots = sorted(name for name in os.listdir(base_dir) if name.startswith(SNAPSHOT_PREFIX))
+    removed = [name for name in snapshots[:-max(1, keep)] if name != current]
+    for name in removed:
+        shutil.rmtree(os.path.join(base_dir, name), ignore_errors=True)
+    return removed
+
+
+def export_snapshot(since: date = None, keep: int = 2, chunk_rows: int = 200000, base_dir: str = None) -> dict:
+    """
+    스냅샷 생성 후 CURRENT 교체
+    
+    Returns:
+        dict: 새 manifest ({'snapshot', 'exported_at', 'covers_from', 'covers_until', 'rows', 'elapsed_sec'})
+    """
+    import duckdb
+    
+    base_dir = base_dir or get_snapshot_dir()
+    source_engine = get_db_connection(ROLE_REPORTING)
+    exported_at = datetime.now().replace(microsecond=0)
+    snapshot = f"{SNAPSHOT_PREFIX}{exported_at:%Y%m%d-%H%M%S}"
+    snapshot_path = os.path.join(base_dir, snapshot)
+    started = time.perf_counter()
+    
+    column_types = {table: read_column_types(source_engine, table, columns)
+                    for table, columns in SNAPSHOT_TABLES.items()}
+    filters = _table_filters(since)
+    
+    rows = {}
+    duck = duckdb.connect(database=':memory:')
+    try:
+        # 한 트랜잭션에서 읽어 테이블 간 시점 일치 (서버측 커서로 스트리밍)
+        with source_engine.connect() as conn:
+            conn = conn.execution_options(isolation_level='REPEATABLE READ', stream_results=True)
+            for table in SNAPSHOT_TABLES:
+                rows[table] = export_table(conn, duck, table, column_types[table],
+                                           os.path.join(snapshot_path, table), filters.get(table), chunk_rows)
+                print(f"  {table}: {rows[table]:,}행")
+    except BaseException:
+        shutil.rmtree(snapshot_path, ignore_errors=True)
+        raise
+    finally:
+        duck.close()
+    
+    manifest = {
+        'snapshot': snapshot,
+        'exported_at': exported_at.isoformat(sep=' '),
+        'covers_from': str(since) if since else None,
+        'covers_until': str(last_closed_day(exported_at)),
+        'rows': rows,
+        'elapsed_sec': round(time.perf_counter() - started, 1),
+    }
+    write_manifest(manifest, base_dir)
+    manifest['removed'] = prune_snapshots(base_dir, keep, snapshot)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DuckDB 분석 엔진용 Parquet 스냅샷 생성")
+    parser.add_argument('--since', type=date.fromisoformat, help="이 날짜 이후 구매/이용 주문만 저장 (기본값: 전체)")
+    parser.add_argument('--keep', type=int, default=2, help="보관할 스냅샷 수 (기본값: 2)")
+    parser.add_argument('--chunk-rows', type=int, default=200000, help="Parquet 파일당 행 수 (기본값: 200000)")
+    parser.add_argument('--dir', help="저장 디렉토리 (기본값: HOTEL_STATS_PARQUET_DIR 또는 data/parquet)")
+    parser.add_argument('--show', action='store_true', help="현재 스냅샷 정보만 출력")
+    args = parser.parse_args(argv)
+    
+    if args.show:
+        manifest = read_manifest(args.dir)
+        if manifest is None:
+            print("❌ 스냅샷이 없습니다.")
+            return 1
+        print(json.dumps(manifest, ensure_ascii=False, indent=2))
+        return 0
+    
+    base_dir = args.dir or get_snapshot_dir()
+    os.makedirs(base_dir, exist_ok=True)
+    print("=" * 60)
+    print(f"📦 Parquet 스냅샷 생성: {base_dir}")
+    print("=" * 60)
+    manifest = export_snapshot(args.since, args.keep, args.chunk_rows, base_dir)
+    print(f"✅ {manifest['snapshot']} (~{manifest['covers_until']}, {manifest['elapsed_sec']:.1f}초)")
+    if manifest['removed']:
+        print(f"  삭제한 스냅샷: {', '.join(manifest['removed'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,556 @@
+# tools/generate_synthetic_data.py
+"""벤치마크용 합성 예약 데이터 생성 도구
+- 운영 DB 없이 성능을 측정할 수 있도록 통계 쿼리가 사용하는 테이블을 운영 규모로 생성
+  (product, order_product, order_item, order_pay, common_code, tblmanager)
+- 숙소 인기도는 Zipf 분포(--hotel-skew, 소수 숙소에 주문 집중), 채널 구성은 CHANNEL_CONFIG,
+  예약상태 구성은 ORDER_STATUS_GROUPS 기준 (--channel-weights, --cancel-rate, --status-weights로 조정)
+- 주문 1건에 객실 상품(order_product) 1~3개, 객실 상품마다 숙박일수만큼 order_item, 결제(order_pay) 1건
+- 청크 단위로 생성/저장하여 메모리 사용량은 --chunk-rows에 비례 (전체 규모와 무관)
+- 출력 대상:
+  --mysql-url: 로컬 MySQL/MariaDB (테이블 생성 후 적재, .env의 운영 DB 설정은 사용하지 않음)
+  --parquet-dir: DuckDB 분석 엔진용 Parquet 스냅샷 (utils/duckdb_engine과 같은 구조, tblmanager 제외)
+  통계 쿼리는 MySQL/DuckDB 문법만 있으므로 SQLite는 지원하지 않음
+
+사용법:
+    python -m tools.generate_synthetic_data --mysql-url mysql+pymysql://root:pw@127.0.0.1:3306/hotel_bench --drop
+    python -m tools.generate_synthetic_data --mysql-url ... --hotels 50000 --order-products 20000000
+    python -m tools.generate_synthetic_data --parquet-dir /tmp/hotel_bench_parquet --order-products 1000000
+    python -m tools.generate_synthetic_data --parquet-dir ... --channel-weights expedia=5 AMTSUPAG0007=3 --cancel-rate 0.2
+
+MySQL에 생성한 뒤에는 python -m tools.build_daily_stats로 일자 집계도 만들 수 있음
+(.env의 DB 설정을 생성한 DB로 지정)
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+# 프로젝트 루트 경로 추가
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+import numpy as np
+import pandas as pd
+
+from config.channels import CHANNEL_CONFIG
+from config.order_status_mapping import ORDER_STATUS_GROUPS
+
+# 테이블 스키마 (MySQL 타입, 컬럼 순서대로 생성)
+TABLE_SCHEMAS = {
+    'product': {
+        'idx': 'INT NOT NULL PRIMARY KEY',
+        'product_code': 'VARCHAR(20) NOT NULL',
+        'name_kr': 'VARCHAR(200) NOT NULL',
+        'reg_date': 'DATETIME NOT NULL',
+    },
+    'common_code': {
+        'idx': 'INT NOT NULL PRIMARY KEY',
+        'code_id': 'INT NOT NULL',
+        'parent_idx': 'INT NOT NULL',
+        'code_name': 'VARCHAR(100) NOT NULL',
+    },
+    'order_product': {
+        'idx': 'BIGINT NOT NULL PRIMARY KEY',
+        'order_num': 'VARCHAR(30) NOT NULL',
+        'product_idx': 'INT NOT NULL',
+        'order_channel_idx': 'INT NULL',
+        'order_type': 'VARCHAR(30) NOT NULL',
+        'order_product_status': 'VARCHAR(20) NOT NULL',
+        'checkin_date': 'DATE NOT NULL',
+        'create_date': 'DATETIME NOT NULL',
+        'room_cnt': 'INT NOT NULL',
+        'terms': 'INT NOT NULL',
+        'order_pay_idx': 'BIGINT NOT NULL',
+    },
+    'order_item': {
+        'idx': 'BIGINT NOT NULL PRIMARY KEY',
+        'order_product_idx': 'BIGINT NOT NULL',
+        'due_price': 'DECIMAL(12, 0) NOT NULL',
+    },
+    'order_pay': {
+        'idx': 'BIGINT NOT NULL PRIMARY KEY',
+        'total_amount': 'DECIMAL(14, 0) NOT NULL',
+    },
+    'tblmanager': {
+        'admin_id': 'VARCHAR(50) NOT NULL PRIMARY KEY',
+        'passwd': 'VARCHAR(255) NOT NULL',
+        'user_status': 'VARCHAR(4) NOT NULL',
+    },
+}
+
+# 통계/검색 쿼리 조건 컬럼 인덱스
+TABLE_INDEXES = {
+    'product': ['KEY idx_product_code (product_code)'],
+    'common_code': ['KEY idx_common_code_lookup (code_id, parent_idx)'],
+    'order_product': [
+        'KEY idx_order_product_create (create_date)',
+        'KEY idx_order_product_checkin (checkin_date)',
+        'KEY idx_order_product_product (product_idx, create_date)',
+    ],
+    'order_item': ['KEY idx_order_item_product (order_product_idx)'],
+}
+
+# 채널 주문 common_code 상위 코드 (통계 쿼리의 cc.parent_idx = 1)
+CHANNEL_PARENT_IDX = 1
+# booking_master_offer 채널의 order_channel_idx 시작 값
+CHANNEL_CODE_START = 101
+
+# 기본 채널 가중치 (키: CHANNEL_CONFIG의 order_type 또는 bmo_sup_code, 목록에 없는 채널은 1)
+DEFAULT_CHANNEL_WEIGHTS = {
+    'expedia': 6,
+    'hotelbeds': 3,
+    'AMTSUPCT0001': 5,  # Trip
+    'AMTSUPAG0007': 4,  # Agoda
+    'AMTSUPME0003': 2,  # Meituan
+}
+
+# 그룹 안에서의 예약상태 가중치 (그룹 비율은 --cancel-rate)
+DEFAULT_STATUS_WEIGHTS = {
+    'complete': 55, 'confirm': 35, 'pending': 3, 'confirmWait': 2, 'confirmWip': 2, 'addpay': 1, 'noshow': 2,
+    'cancel': 75, 'cancelWait': 4, 'cancelWip': 3, 'cancelRequest': 3, 'fail': 15,
+}
+
+# 최근 90일 이내 등록된 신규 숙소 비율 (숙소 검색의 신규 숙소 조건 대상)
+NEW_HOTEL_RATE = 0.03
+# 기존 숙소 등록일 범위 (구매일 시작 전 최대 일수)
+MAX_HOTEL_AGE_DAYS = 5 * 365
+
+# 주문당 객실 상품 수 / 객실 수 분포
+ORDER_SIZES = ([1, 2, 3], [0.88, 0.10, 0.02])
+ROOM_COUNTS = ([1, 2, 3], [0.82, 0.14, 0.04])
+
+# 숙소명 생성용 단어
+_REGIONS = ('서울', '부산', '제주', '강릉', '여수', '경주', '속초', '인천', '대구', '전주', '가평', '통영')
+_BRANDS = ('그랜드', '오션', '시티', '파크', '리버', '힐사이드', '스카이', '포레스트', '하버', '센트럴')
+_KINDS = ('호텔', '리조트', '펜션', '게스트하우스', '스테이', '레지던스')
+
+
+def parse_weights(values, allowed, option: str) -> dict:
+    """KEY=WEIGHT 목록 파싱 (허용되지 않은 키/음수 가중치는 ValueError)"""
+    weights = {}
+    for value in values or []:
+        key, sep, weight = value.partition('=')
+        if not sep or key not in allowed:
+            raise ValueError(f"{option}: 알 수 없는 항목입니다: {value} (가능한 값: {', '.join(allowed)})")
+        weights[key] = float(weight)
+        if weights[key] < 0:
+            raise ValueError(f"{option}: 가중치는 0 이상이어야 합니다: {value}")
+    return weights
+
+
+def build_channels(weights: dict) -> list:
+    """
+    채널 목록 (CHANNEL_CONFIG 기준)
+    
+    order_product 채널은 order_type만, booking_master_offer 채널은 common_code로 이름을 찾는 order_channel_idx 사용
+    
+    Returns:
+        list: [(order_type, order_channel_idx, 채널명, 가중치)]
+    """
+    channels = []
+    for order_type, config in CHANNEL_CONFIG['order_product'].items():
+        channels.append((order_type, None, config['name'], weights.get(order_type, 1.0)))
+    for offset, (sup_code, config) in enumerate(CHANNEL_CONFIG['booking_master_offer'].items()):
+        channels.append((sup_code, CHANNEL_CODE_START + offset, config['name'], weights.get(sup_code, 1.0)))
+    if not sum(channel[3] for channel in channels):
+        raise ValueError("--channel-weights: 가중치 합계가 0입니다.")
+    return channels
+
+
+def build_statuses(cancel_rate: float, weights: dict):
+    """
+    예약상태 목록과 확률 (확정 그룹 1-cancel_rate, 취소 그룹 cancel_rate를 그룹 내 가중치로 나눔)
+    
+    Returns:
+        tuple: (상태 코드 list, 확률 numpy 배열)
+    """
+    codes, probabilities = [], []
+    for group, share in (('확정', 1 - cancel_rate), ('취소', cancel_rate)):
+        group_codes = ORDER_STATUS_GROUPS[group]
+        group_weights = np.array([weights.get(code, DEFAULT_STATUS_WEIGHTS.get(code, 1)) for code in group_codes],
+                                 dtype=float)
+        if not group_weights.sum():
+            group_weights[:] = 1
+        codes.extend(group_codes)
+        probabilities.extend(group_weights / group_weights.sum() * share)
+    return codes, np.array(probabilities)
+
+
+def generate_hotels(rng, count: int, skew: float, start_date: date, end_date: date) -> dict:
+    """
+    숙소 생성
+    
+    등록일은 대부분 구매일 시작 전이고, NEW_HOTEL_RATE만큼은 종료일 기준 최근 90일 이내 (신규 숙소)
+    
+    Returns:
+        dict: {'df': product DataFrame, 'popularity': 숙소별 주문 확률, 'price': 숙소별 1박 기준가}
+    """
+    idx = np.arange(1, count + 1)
+    names = [f"{_REGIONS[i % len(_REGIONS)]} {_BRANDS[(i // len(_REGIONS)) % len(_BRANDS)]} "
+             f"{_KINDS[(i // 7) % len(_KINDS)]} {i}" for i in idx]
+    df = pd.DataFrame({
+        'idx': idx,
+        'product_code': [f"H{i:07d}" for i in idx],
+        'name_kr': names,
+    })
+    
+    # 인기 순위는 숙소 ID와 무관하게 섞음 (순위 r의 가중치 1 / r^skew)
+    ranks = rng.permutation(count) + 1
+    popularity = 1.0 / np.power(ranks, skew)
+    popularity /= popularity.sum()
+    
+    # 1박 기준가 (로그정규, 100원 단위)
+    price = np.round(rng.lognormal(mean=np.log(120000), sigma=0.5, size=count), -2).clip(20000, 2000000)
+    
+    # 등록일 (업무 시간대 등록)
+    is_new = rng.random(count) < NEW_HOTEL_RATE
+    age_days = np.where(is_new, rng.integers(0, 90, size=count),
+                        (end_date - start_date).days + rng.integers(1, MAX_HOTEL_AGE_DAYS + 1, size=count))
+    df['reg_date'] = (np.datetime64(end_date, 's') - age_days.astype('timedelta64[D]')
+                      + rng.integers(9 * 3600, 19 * 3600, size=count).astype('timedelta64[s]'))
+    return {'df': df, 'popularity': popularity, 'price': price}
+
+
+def generate_common_codes(channels) -> pd.DataFrame:
+    """채널 코드 (상위 코드 1행 + booking_master_offer 채널)"""
+    rows = [(CHANNEL_PARENT_IDX, 0, 0, '주문채널')]
+    for order_type, channel_idx, name, _ in channels:
+        if channel_idx is not None:
+            rows.append((len(rows) + 1, channel_idx, CHANNEL_PARENT_IDX, name))
+    return pd.DataFrame(rows, columns=list(TABLE_SCHEMAS['common_code']))
+
+
+def generate_managers(count: int, password: str) -> pd.DataFrame:
+    """로그인용 관리자 (bcrypt 설치 시 bcrypt, 없으면 레거시 SHA256 해시)"""
+    try:
+        import bcrypt
+        from utils.password_verifier import get_bcrypt_rounds
+        
+        salt = bcrypt.gensalt(rounds=get_bcrypt_rounds())
+        passwd = bcrypt.hashpw(password.encode('utf-8'), salt).decode('ascii')
+    except ImportError:
+        passwd = hashlib.sha256(password.encode('utf-8')).hexdigest()
+    return pd.DataFrame({
+        'admin_id': [f"bench{i:02d}" for i in range(1, count + 1)],
+        'passwd': passwd,
+        'user_status': '1',
+    })
+
+
+def generate_orders(rng, rows: int, first_idx: int, first_item_idx: int, first_order_no: int,
+                    hotels: dict, channels: list, statuses, start_date: date, days: int,
+                    lead_days: float) -> dict:
+    """
+    주문 청크 생성 (객실 상품 rows행과 딸린 order_item/order_pay)
+    
+    Args:
+        rng: numpy Generator
+        rows: 생성할 order_product 행 수
+        first_idx: 첫 order_product/order_pay idx
+        first_item_idx: 첫 order_item idx
+        first_order_no: 첫 주문번호 일련번호
+        hotels: generate_hotels 결과
+        channels: build_channels 결과
+        statuses: build_statuses 결과
+        start_date: 구매일 시작
+        days: 구매일 기간 (일)
+        lead_days: 구매일 -> 이용일 평균 일수
+    
+    Returns:
+        dict: {'order_product', 'order_item', 'order_pay': DataFrame, 'orders': 주문 수}
+    """
+    # 주문별 객실 상품 수 (합계가 rows가 되도록 마지막 주문에서 조정)
+    sizes = rng.choice(ORDER_SIZES[0], size=rows, p=ORDER_SIZES[1])
+    ends = np.cumsum(sizes)
+    order_count = int(np.searchsorted(ends, rows)) + 1
+    sizes = sizes[:order_count]
+    sizes[-1] -= ends[order_count - 1] - rows
+    
+    # 주문 단위 속성 (같은 주문의 객실 상품은 숙소/채널/구매일/이용일/상태 공유)
+    hotel_pos = rng.choice(len(hotels['price']), size=order_count, p=hotels['popularity'])
+    channel_weights = np.array([channel[3] for channel in channels], dtype=float)
+    channel_pos = rng.choice(len(channels), size=order_count, p=channel_weights / channel_weights.sum())
+    status_codes, status_p = statuses
+    status_pos = rng.choice(len(status_codes), size=order_count, p=status_p)
+    created = (np.datetime64(start_date, 's')
+               + rng.integers(0, days, size=order_count).astype('timedelta64[D]')
+               + rng.integers(0, 86400, size=order_count).astype('timedelta64[s]'))
+    lead = np.minimum(rng.exponential(lead_days, size=order_count), 365).astype('int64')
+    checkin = created.astype('datetime64[D]') + lead.astype('timedelta64[D]')
+    order_nums = np.char.add('HS', np.char.zfill(np.arange(first_order_no, first_order_no + order_count).astype(str), 10))
+    
+    # 객실 상품 단위
+    idx = np.arange(first_idx, first_idx + rows)
+    terms = np.minimum(rng.geometric(0.55, size=rows), 14)
+    room_cnt = rng.choice(ROOM_COUNTS[0], size=rows, p=ROOM_COUNTS[1])
+    hotel_rows = np.repeat(hotel_pos, sizes)
+    channel_rows = np.repeat(channel_pos, sizes)
+    channel_types = np.array([channel[0] for channel in channels], dtype=object)
+    channel_idx = np.array([channel[1] for channel in channels], dtype=object)
+    
+    order_product = pd.DataFrame({
+        'idx': idx,
+        'order_num': np.repeat(order_nums, sizes),
+        'product_idx': hotel_rows + 1,
+        'order_channel_idx': channel_idx[channel_rows],
+        'order_type': channel_types[channel_rows],
+        'order_product_status': np.array(status_codes, dtype=object)[np.repeat(status_pos, sizes)],
+        'checkin_date': np.repeat(checkin, sizes).astype('datetime64[ns]'),
+        'create_date': np.repeat(created, sizes).astype('datetime64[ns]'),
+        'room_cnt': room_cnt,
+        'terms': terms,
+        'order_pay_idx': idx,
+    })
+    
+    # 숙박일별 입금가 (숙소 기준가 +-10%, 100원 단위)
+    item_rows = np.repeat(np.arange(rows), terms)
+    due_price = np.round(hotels['price'][hotel_rows][item_rows] * rng.uniform(0.9, 1.1, size=len(item_rows)), -2)
+    order_item = pd.DataFrame({
+        'idx': np.arange(first_item_idx, first_item_idx + len(item_rows)),
+        'order_product_idx': idx[item_rows],
+        'due_price': due_price,
+    })
+    
+    # 결제 금액 = 입금가 합계 x 객실 수 x (1 + 마진)
+    deposit = np.bincount(item_rows, weights=due_price, minlength=rows) * room_cnt
+    margin = rng.normal(0.08, 0.04, size=rows).clip(-0.05, 0.3)
+    order_pay = pd.DataFrame({
+        'idx': idx,
+        'total_amount': np.round(deposit * (1 + margin), -2),
+    })
+    return {'order_product': order_product, 'order_item': order_item, 'order_pay': order_pay,
+            'orders': order_count}
+
+
+class MySQLWriter:
+    """로컬 MySQL/MariaDB에 적재 (pymysql executemany - 여러 행 INSERT로 묶어 전송)"""
+    
+    def __init__(self, url: str, drop: bool = False):
+        from sqlalchemy import create_engine
+        
+        self.engine = create_engine(url, pool_pre_ping=True)
+        self.drop = drop
+        self.description = self.engine.url.render_as_string(hide_password=True)
+    
+    def create_tables(self, tables):
+        with self.engine.begin() as conn:
+            for table in tables:
+                if self.drop:
+                    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+                columns = [f"{column} {column_type}" for column, column_type in TABLE_SCHEMAS[table].items()]
+                conn.exec_driver_sql(
+                    f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns + TABLE_INDEXES.get(table, []))}) "
+                    f"ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+                )
+                if not self.drop and conn.exec_driver_sql(f"SELECT 1 FROM {table} LIMIT 1").first():
+                    raise RuntimeError(f"{table} 테이블에 이미 데이터가 있습니다 (--drop으로 다시 생성)")
+    
+    def write(self, table: str, df: pd.DataFrame):
+        columns = list(df.columns)
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        # numpy 값은 파이썬 값으로 변환 (Timestamp는 datetime 하위 클래스로 그대로 전달)
+        rows = list(zip(*(df[column].tolist() for column in columns)))
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+            cursor.executemany(query, rows)
+            connection.commit()
+        finally:
+            connection.close()
+    
+    def finish(self, summary: dict):
+        self.engine.dispose()
+
+
+class ParquetWriter:
+    """DuckDB 분석 엔진용 Parquet 스냅샷 (snapshot 디렉토리 + CURRENT, 스냅샷 대상 컬럼만 저장)"""
+    
+    def __init__(self, base_dir: str):
+        import duckdb
+        
+        from utils.duckdb_engine import SNAPSHOT_PREFIX
+        
+        self.base_dir = base_dir
+        self.snapshot = f"{SNAPSHOT_PREFIX}{datetime.now():%Y%m%d-%H%M%S}"
+        self.path = os.path.join(base_dir, self.snapshot)
+        self.description = self.path
+        self.duck = duckdb.connect(database=':memory:')
+        self.parts = {}
+    
+    def create_tables(self, tables):
+        from utils.duckdb_engine import SNAPSHOT_TABLES
+        
+        for table in tables:
+            if table in SNAPSHOT_TABLES:
+                os.makedirs(os.path.join(self.path, table), exist_ok=True)
+                self.parts[table] = 0
+    
+    def write(self, table: str, df: pd.DataFrame):
+        from utils.duckdb_engine import SNAPSHOT_TABLES
+        
+        if table not in SNAPSHOT_TABLES:
+            return
+        select = ', '.join(f'CAST({_cast_source(column, TABLE_SCHEMAS[table][column])} '
+                           f'AS {_duckdb_type(TABLE_SCHEMAS[table][column])}) AS "{column}"'
+                           for column in SNAPSHOT_TABLES[table])
+        path = os.path.join(self.path, table, f"part-{self.parts[table]:05d}.parquet").replace("'", "''")
+        self.duck.register('chunk', df)
+        try:
+            self.duck.execute(f"COPY (SELECT {select} FROM chunk) TO '{path}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+        finally:
+            self.duck.unregister('chunk')
+        self.parts[table] += 1
+    
+    def finish(self, summary: dict):
+        from utils.duckdb_engine import write_manifest
+        
+        self.duck.close()
+        write_manifest({
+            'snapshot': self.snapshot,
+            'exported_at': datetime.now().replace(microsecond=0).isoformat(sep=' '),
+            'covers_from': str(summary['start_date']),
+            'covers_until': str(summary['end_date']),
+            'rows': {table: rows for table, rows in summary['rows'].items() if table in self.parts},
+            'elapsed_sec': summary['elapsed_sec'],
+            'synthetic': True,
+        }, self.base_dir)
+
+
+def _duckdb_type(mysql_type: str) -> str:
+    """TABLE_SCHEMAS의 MySQL 타입 -> DuckDB 타입"""
+    column_type = mysql_type.replace(' PRIMARY KEY', '').replace(' NOT NULL', '').replace(' NULL', '')
+    if column_type in ('INT', 'BIGINT'):
+        return 'BIGINT'
+    if column_type.startswith('DECIMAL'):
+        # 입금가/결제금액 합계가 MySQL과 같도록 DECIMAL 유지
+        return column_type
+    if column_type == 'DATETIME':
+        return 'TIMESTAMP'
+    if column_type == 'DATE':
+        return 'DATE'
+    return 'VARCHAR'
+
+
+def _cast_source(column: str, mysql_type: str) -> str:
+    """DATE 컬럼은 TIMESTAMP를 거쳐 변환 (pandas datetime64[ns] -> DATE 직접 변환 미지원 버전 대응)"""
+    if mysql_type.startswith('DATE '):
+        return f'CAST("{column}" AS TIMESTAMP)'
+    return f'"{column}"'
+
+
+def generate(writer, hotels_count: int, order_products: int, start_date: date, end_date: date, seed: int = 42,
+             hotel_skew: float = 1.1, channel_weights: dict = None, cancel_rate: float = 0.15,
+             status_weights: dict = None, lead_days: float = 21.0, managers: int = 3,
+             manager_password: str = 'bench1234', chunk_rows: int = 200000) -> dict:
+    """
+    합성 데이터 생성 후 writer에 저장
+    
+    Returns:
+        dict: {'rows': {테이블: 행 수}, 'orders', 'start_date', 'end_date', 'elapsed_sec'}
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    channels = build_channels({**DEFAULT_CHANNEL_WEIGHTS, **(channel_weights or {})})
+    statuses = build_statuses(cancel_rate, status_weights or {})
+    days = (end_date - start_date).days + 1
+    
+    writer.create_tables(list(TABLE_SCHEMAS))
+    rows = {table: 0 for table in TABLE_SCHEMAS}
+    
+    hotels = generate_hotels(rng, hotels_count, hotel_skew, start_date, end_date)
+    for table, df in (('product', hotels['df']), ('common_code', generate_common_codes(channels)),
+                      ('tblmanager', generate_managers(managers, manager_password))):
+        writer.write(table, df)
+        rows[table] = len(df)
+    
+    orders = 0
+    while rows['order_product'] < order_products:
+        chunk = generate_orders(rng, min(chunk_rows, order_products - rows['order_product']),
+                                rows['order_product'] + 1, rows['order_item'] + 1, orders + 1,
+                                hotels, channels, statuses, start_date, days, lead_days)
+        for table in ('order_product', 'order_item', 'order_pay'):
+            writer.write(table, chunk[table])
+            rows[table] += len(chunk[table])
+        orders += chunk['orders']
+        
+        elapsed = time.perf_counter() - started
+        print(f"  order_product {rows['order_product']:,}/{order_products:,}행 "
+              f"({rows['order_product'] / elapsed:,.0f}행/초)", flush=True)
+    
+    summary = {'rows': rows, 'orders': orders, 'start_date': start_date, 'end_date': end_date,
+               'elapsed_sec': round(time.perf_counter() - started, 1)}
+    writer.finish(summary)
+    return summary
+
+
+def main(argv=None):
+    default_end = date.today() - timedelta(days=1)
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 예약 데이터 생성")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--mysql-url', help="적재할 MySQL/MariaDB SQLAlchemy URL (예: mysql+pymysql://root:pw@127.0.0.1/hotel_bench)")
+    target.add_argument('--parquet-dir', help="Parquet 스냅샷 디렉토리 (HOTEL_STATS_PARQUET_DIR로 지정하여 조회)")
+    parser.add_argument('--drop', action='store_true', help="기존 테이블 삭제 후 생성 (MySQL)")
+    parser.add_argument('--hotels', type=int, default=2000, help="숙소 수 (기본값: 2000)")
+    parser.add_argument('--order-products', type=int, default=500000, help="order_product 행 수 (기본값: 500000)")
+    parser.add_argument('--start-date', type=date.fromisoformat, help="구매일 시작 (기본값: 종료일 364일 전)")
+    parser.add_argument('--end-date', type=date.fromisoformat, default=default_end, help="구매일 종료 (기본값: 어제)")
+    parser.add_argument('--seed', type=int, default=42, help="난수 시드 (기본값: 42)")
+    parser.add_argument('--hotel-skew', type=float, default=1.1, help="숙소 인기도 Zipf 지수 (0: 균등, 기본값: 1.1)")
+    parser.add_argument('--channel-weights', nargs='*', metavar='KEY=WEIGHT',
+                        help="채널 가중치 (order_type 또는 bmo_sup_code, 지정하지 않은 채널은 기본값)")
+    parser.add_argument('--cancel-rate', type=float, default=0.15, help="취소 그룹 비율 (기본값: 0.15)")
+    parser.add_argument('--status-weights', nargs='*', metavar='STATUS=WEIGHT', help="그룹 내 예약상태 가중치")
+    parser.add_argument('--lead-days', type=float, default=21.0, help="구매일 -> 이용일 평균 일수 (기본값: 21)")
+    parser.add_argument('--managers', type=int, default=3, help="관리자 계정 수 (bench01~, 기본값: 3)")
+    parser.add_argument('--manager-password', default='bench1234', help="관리자 비밀번호 (기본값: bench1234)")
+    parser.add_argument('--chunk-rows', type=int, default=200000, help="청크당 order_product 행 수 (기본값: 200000)")
+    args = parser.parse_args(argv)
+    
+    start_date = args.start_date or args.end_date - timedelta(days=364)
+    if start_date > args.end_date:
+        parser.error("--start-date가 --end-date보다 늦습니다.")
+    if args.end_date >= date.today():
+        parser.error("--end-date는 어제까지만 가능합니다 (통계 쿼리는 당일 구매를 제외).")
+    if not 0 <= args.cancel_rate <= 1:
+        parser.error("--cancel-rate는 0~1 사이여야 합니다.")
+    if min(args.hotels, args.order_products, args.chunk_rows) < 1:
+        parser.error("--hotels, --order-products, --chunk-rows는 1 이상이어야 합니다.")
+    channel_keys = list(CHANNEL_CONFIG['order_product']) + list(CHANNEL_CONFIG['booking_master_offer'])
+    status_keys = [code for codes in ORDER_STATUS_GROUPS.values() for code in codes]
+    try:
+        channel_weights = parse_weights(args.channel_weights, channel_keys, '--channel-weights')
+        status_weights = parse_weights(args.status_weights, status_keys, '--status-weights')
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.mysql_url:
+        writer = MySQLWriter(args.mysql_url, drop=args.drop)
+    else:
+        os.makedirs(args.parquet_dir, exist_ok=True)
+        writer = ParquetWriter(args.parquet_dir)
+    
+    print("=" * 60)
+    print(f"🧪 합성 데이터 생성: {writer.description}")
+    print(f"  숙소 {args.hotels:,}개, order_product {args.order_products:,}행, 구매일 {start_date} ~ {args.end_date}")
+    print("=" * 60)
+    summary = generate(writer, args.hotels, args.order_products, start_date, args.end_date, seed=args.seed,
+                       hotel_skew=args.hotel_skew, channel_weights=channel_weights, cancel_rate=args.cancel_rate,
+                       status_weights=status_weights, lead_days=args.lead_days, managers=args.managers,
+                       manager_password=args.manager_password, chunk_rows=args.chunk_rows)
+    
+    print(f"✅ 완료 ({summary['elapsed_sec']:.1f}초, 주문 {summary['orders']:,}건)")
+    for table, count in summary['rows'].items():
+        print(f"  {table}: {count:,}행")
+    if args.managers:
+        print(f"  로그인: bench01 / {args.manager_password}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
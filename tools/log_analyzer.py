@@ -0,0 +1,216 @@
+# tools/log_analyzer.py
+"""접근 로그(access.log) 오프라인 분석 도구
+- action별 소요 시간(duration_ms) 백분위수 (p50/p90/p95/p99)
+- 조회가 많은 숙소 (hotel_ids 기준)
+- text(key=value) / JSON Lines 형식 모두 지원, 샘플링 비율(sample_rate) 가중치 반영
+
+사용법:
+    python -m tools.log_analyzer                      # logs/access.log* 분석
+    python -m tools.log_analyzer logs/access.log --top 20
+    python -m tools.log_analyzer logs/access.log --json
+"""
+
+import argparse
+import ast
+import glob
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+
+# 프로젝트 루트 경로 추가
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_current_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+# 기본 분석 대상 (로테이션된 파일 포함)
+DEFAULT_LOG_PATTERN = os.path.join(_project_root, 'logs', 'access*.log*')
+
+PERCENTILES = (50, 90, 95, 99)
+
+# 텍스트 로그 라인: [시각] [레벨] [카테고리] 메시지: key=value, ...
+_TEXT_LINE_RE = re.compile(
+    r"^\[(?P<ts>[^\]]+)\] \[(?P<level>\w+)\s*\] \[(?P<category>\w+)\] (?P<body>.*)$"
+)
+# 'key=value' 구분자 (값 안의 쉼표와 구분하기 위해 다음 key= 앞에서만 분리)
+_FIELD_SPLIT_RE = re.compile(r", (?=[^\s=,\[\]]+=)")
+
+
+def _parse_value(value: str):
+    """텍스트 로그 값을 가능한 경우 숫자/리스트로 변환"""
+    value = value.strip()
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+def parse_text_line(line: str):
+    """텍스트 형식 로그 한 줄을 딕셔너리로 변환 (형식이 다르면 None)"""
+    match = _TEXT_LINE_RE.match(line)
+    if not match:
+        return None
+    
+    entry = {
+        'ts': match.group('ts'),
+        'level': match.group('level'),
+        'category': match.group('category'),
+    }
+    
+    body = match.group('body')
+    # 예외 정보 분리
+    if ' | Exception: ' in body:
+        body, entry['exception'] = body.split(' | Exception: ', 1)
+    
+    message, sep, field_text = body.partition(': ')
+    entry['message'] = message
+    if sep:
+        for item in _FIELD_SPLIT_RE.split(field_text):
+            key, eq, value = item.partition('=')
+            if eq:
+                entry['ip' if key == 'IP' else key] = _parse_value(value)
+    
+    return entry
+
+
+def parse_line(line: str):
+    """로그 한 줄 파싱 (JSON Lines 우선, 실패 시 텍스트 형식)"""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+    return parse_text_line(line)
+
+
+def iter_entries(paths):
+    """여러 로그 파일의 항목을 순서대로 반환"""
+    for path in paths:
+        try:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    entry = parse_line(line)
+                    if entry is not None:
+                        yield entry
+        except OSError as e:
+            print(f"⚠️  로그 파일을 읽을 수 없습니다: {path} ({e})", file=sys.stderr)
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """정렬된 값 리스트의 백분위수 (선형 보간)"""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return float(sorted_values[0])
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def analyze(entries, top: int = 10) -> dict:
+    """
+    접근 로그 분석
+    
+    Args:
+        entries: 파싱된 로그 항목 iterable
+        top: 조회 상위 숙소 표시 개수
+    
+    Returns:
+        dict: {'actions': {action: 통계}, 'hot_hotels': [(hotel_id, 횟수), ...], 'total_entries': int}
+    """
+    durations = defaultdict(list)
+    action_counts = defaultdict(float)
+    hotel_counts = defaultdict(float)
+    total_entries = 0
+    
+    for entry in entries:
+        total_entries += 1
+        action = entry.get('action')
+        if not action:
+            continue
+        
+        # 샘플링된 이벤트는 1/비율만큼 가중치 적용
+        try:
+            weight = 1.0 / float(entry.get('sample_rate') or 1.0)
+        except (TypeError, ValueError, ZeroDivisionError):
+            weight = 1.0
+        action_counts[action] += weight
+        
+        duration = entry.get('duration_ms')
+        if isinstance(duration, (int, float)):
+            durations[action].append(float(duration))
+        
+        hotel_ids = entry.get('hotel_ids')
+        if isinstance(hotel_ids, (list, tuple)):
+            for hotel_id in hotel_ids:
+                hotel_counts[hotel_id] += weight
+    
+    actions = {}
+    for action, count in action_counts.items():
+        values = sorted(durations.get(action, []))
+        stats = {'count': round(count), 'samples': len(values)}
+        for pct in PERCENTILES:
+            stats[f"p{pct}_ms"] = round(percentile(values, pct), 1)
+        stats['max_ms'] = round(values[-1], 1) if values else 0.0
+        actions[action] = stats
+    
+    hot_hotels = sorted(hotel_counts.items(), key=lambda item: item[1], reverse=True)[:top]
+    
+    return {
+        'total_entries': total_entries,
+        'actions': actions,
+        'hot_hotels': [(hotel_id, round(count)) for hotel_id, count in hot_hotels],
+    }
+
+
+def print_report(result: dict):
+    """분석 결과 출력"""
+    print("=" * 60)
+    print(f"📊 접근 로그 분석 (전체 {result['total_entries']:,}건)")
+    print("=" * 60)
+    
+    print("\n[action별 소요 시간 (ms)]")
+    header = f"  {'action':<28}{'count':>8}" + ''.join(f"{f'p{p}':>10}" for p in PERCENTILES) + f"{'max':>10}"
+    print(header)
+    for action, stats in sorted(result['actions'].items(), key=lambda item: -item[1]['count']):
+        row = f"  {action:<28}{stats['count']:>8,}"
+        row += ''.join(f"{stats[f'p{p}_ms']:>10,.1f}" for p in PERCENTILES)
+        row += f"{stats['max_ms']:>10,.1f}"
+        print(row)
+    
+    print("\n[조회 상위 숙소]")
+    if not result['hot_hotels']:
+        print("  데이터 없음")
+    for rank, (hotel_id, count) in enumerate(result['hot_hotels'], 1):
+        print(f"  {rank:>3}. 숙소 ID {hotel_id}: {count:,}회")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="접근 로그(access.log) 분석 - 소요 시간 백분위수 및 조회 상위 숙소")
+    parser.add_argument('paths', nargs='*', help="분석할 로그 파일 (기본값: logs/access*.log*)")
+    parser.add_argument('--top', type=int, default=10, help="조회 상위 숙소 표시 개수 (기본값: 10)")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    
+    paths = args.paths or sorted(glob.glob(DEFAULT_LOG_PATTERN))
+    if not paths:
+        print("⚠️  분석할 로그 파일이 없습니다.", file=sys.stderr)
+        return 1
+    
+    result = analyze(iter_entries(paths), top=args.top)
+    
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
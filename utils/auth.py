@@ -1,21 +1,23 @@
 # utils/auth.py
 """인증 모듈 - 사용자 로그인 및 세션 관리"""
 
-import os
-import sys
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional
-import bcrypt
-import hashlib
 
-# 프로젝트 루트 경로 추가
-_current_dir = os.path.dirname(os.path.abspath(__file__))
-_project_root = os.path.dirname(_current_dir)
-if _project_root not in sys.path:
-    sys.path.insert(0, _project_root)
-
-from config.configdb import get_db_connection
-from utils.logger import log_auth, log_error
+from utils.db_access import execute, fetch_one, ManagerRow
+from utils.logger import log_auth, log_error, is_log_enabled
+from utils.metrics import LOGIN_DURATION, PASSWORD_REHASH
+from utils.password_verifier import (
+    VerifierBusyError,
+    detect_hash_type,
+    hash_password,
+    is_rehash_enabled,
+    login_throttle,
+    needs_rehash,
+    verify_password,
+)
+from utils.session_token import issue_token, revoke_token, verify_token
 
 # 세션 타임아웃 설정 (초)
 SESSION_TIMEOUT_SECONDS = 3600  # 1시간
@@ -48,6 +50,15 @@ def authenticate_user(admin_id: str, password: str) -> Dict:
             'error': str (실패 시)
         }
     """
+    started = time.perf_counter()
+    result = _authenticate_user(admin_id, password)
+    LOGIN_DURATION.observe(time.perf_counter() - started,
+                           result='success' if result['success'] else 'failure')
+    return result
+
+
+def _authenticate_user(admin_id: str, password: str) -> Dict:
+    """사용자 인증 (authenticate_user 본문, 처리 시간 측정용으로 분리)"""
     ip = get_user_ip()
     
     # 입력 검증
@@ -60,11 +71,20 @@ def authenticate_user(admin_id: str, password: str) -> Dict:
             'error': 'ID와 비밀번호를 입력해주세요.'
         }
     
+    # 로그인 실패 횟수 제한 (사용자 ID/IP별)
+    retry_after = login_throttle.check(ip, admin_id)
+    if retry_after > 0:
+        log_auth("WARNING", "로그인 차단", admin_id=admin_id, ip=ip, 
+                 사유="로그인 실패 횟수 초과", retry_after_sec=int(retry_after))
+        return {
+            'success': False,
+            'admin_id': admin_id,
+            'user_status': None,
+            'error': f'로그인 실패 횟수를 초과했습니다. {int(retry_after // 60) + 1}분 후 다시 시도해주세요.'
+        }
+    
     try:
-        # DB 연결
-        engine = get_db_connection()
-        
-        # 사용자 조회
+        # 사용자 조회 (단건 조회이므로 DataFrame 없이 커서로 직접 조회)
         query = """
         SELECT 
             admin_id,
@@ -72,12 +92,13 @@ def authenticate_user(admin_id: str, password: str) -> Dict:
             user_status
         FROM tblmanager
         WHERE admin_id = %s
+        LIMIT 1
         """
         
-        import pandas as pd
-        df = pd.read_sql(query, engine, params=(admin_id,))
+        user = fetch_one(query, (admin_id,), row_type=ManagerRow, query_name='authenticate_user')
         
-        if df.empty:
+        if user is None:
+            login_throttle.record_failure(ip, admin_id)
             log_auth("WARNING", "로그인 실패", admin_id=admin_id, ip=ip, 사유="존재하지 않는 사용자")
             return {
                 'success': False,
@@ -86,9 +107,8 @@ def authenticate_user(admin_id: str, password: str) -> Dict:
                 'error': 'ID 또는 비밀번호가 올바르지 않습니다.'
             }
         
-        user = df.iloc[0]
-        stored_password = user['passwd']
-        user_status = user['user_status']
+        stored_password = user.passwd
+        user_status = user.user_status
         
         # user_status 디버깅 정보 로깅
         log_auth("INFO", "사용자 조회 성공", admin_id=admin_id, ip=ip, 
@@ -110,60 +130,31 @@ def authenticate_user(admin_id: str, password: str) -> Dict:
         #     }
         
         # 비밀번호 검증
-        password_valid = False
         password_length = len(stored_password) if stored_password else 0
+        password_hash_type = detect_hash_type(stored_password)
         
         # 비밀번호 검증 디버깅 정보
         log_auth("INFO", "비밀번호 검증 시작", admin_id=admin_id, ip=ip, 
                 stored_password_length=password_length)
         
-        # 1. bcrypt 시도 (60자 길이)
-        if password_length == 60:
-            try:
-                password_valid = bcrypt.checkpw(
-                    password.encode('utf-8'),
-                    stored_password.encode('utf-8')
-                )
-                if password_valid:
-                    log_auth("INFO", "bcrypt 검증 성공", admin_id=admin_id, ip=ip)
-                else:
-                    log_auth("INFO", "bcrypt 검증 실패 (비밀번호 불일치)", admin_id=admin_id, ip=ip)
-            except Exception as e:
-                log_error("WARNING", "bcrypt 검증 실패", exception=e, admin_id=admin_id)
-        
-        # 2. MD5 시도 (32자 길이)
-        if not password_valid and password_length == 32:
-            try:
-                md5_hash = hashlib.md5(password.encode('utf-8')).hexdigest()
-                password_valid = (md5_hash.lower() == stored_password.lower())
-                if password_valid:
-                    log_auth("INFO", "MD5 검증 성공", admin_id=admin_id, ip=ip)
-            except Exception as e:
-                log_error("WARNING", "MD5 검증 중 오류", exception=e, admin_id=admin_id)
-        
-        # 3. SHA256 시도 (64자 길이)
-        if not password_valid and password_length == 64:
-            try:
-                sha256_hash = hashlib.sha256(password.encode('utf-8')).hexdigest()
-                password_valid = (sha256_hash.lower() == stored_password.lower())
-                if password_valid:
-                    log_auth("INFO", "SHA256 검증 성공", admin_id=admin_id, ip=ip)
-            except Exception as e:
-                log_error("WARNING", "SHA256 검증 중 오류", exception=e, admin_id=admin_id)
-        
-        # 4. 평문 비교 (보안상 권장하지 않지만 호환성을 위해)
-        if not password_valid:
-            password_valid = (password == stored_password)
-            if password_valid:
-                log_auth("WARNING", "평문 비밀번호 검증 성공 (보안 권장하지 않음)", admin_id=admin_id, ip=ip)
+        # bcrypt는 전용 워커 풀에서 검증 (대기열 초과 시 즉시 거절)
+        try:
+            password_valid = verify_password(password, stored_password, password_hash_type)
+        except VerifierBusyError as e:
+            log_auth("WARNING", "로그인 지연", admin_id=admin_id, ip=ip, 사유=str(e))
+            return {
+                'success': False,
+                'admin_id': admin_id,
+                'user_status': user_status,
+                'error': '로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.'
+            }
         
         if not password_valid:
+            login_throttle.record_failure(ip, admin_id)
             log_auth("WARNING", "로그인 실패", admin_id=admin_id, ip=ip, 
                     사유="비밀번호 불일치", 
                     stored_password_length=password_length,
-                    password_hash_type="bcrypt" if password_length == 60 else 
-                                      "MD5" if password_length == 32 else 
-                                      "SHA256" if password_length == 64 else "평문")
+                    password_hash_type=password_hash_type)
             return {
                 'success': False,
                 'admin_id': admin_id,
@@ -171,6 +162,19 @@ def authenticate_user(admin_id: str, password: str) -> Dict:
                 'error': 'ID 또는 비밀번호가 올바르지 않습니다.'
             }
         
+        if password_hash_type == "bcrypt":
+            log_auth("INFO", "bcrypt 검증 성공", admin_id=admin_id, ip=ip)
+        elif password_hash_type == "평문":
+            log_auth("WARNING", "평문 비밀번호 검증 성공 (보안 권장하지 않음)", admin_id=admin_id, ip=ip)
+        else:
+            log_auth("INFO", f"{password_hash_type} 검증 성공", admin_id=admin_id, ip=ip)
+        
+        login_throttle.reset(admin_id)
+        
+        # 레거시 해시/낮은 cost를 현재 BCRYPT_ROUNDS로 재해시 (AUTH_REHASH_ENABLED=true일 때만)
+        if is_rehash_enabled() and needs_rehash(stored_password):
+            _rehash_password(admin_id, password, stored_password, password_hash_type)
+        
         # 로그인 성공
         log_auth("INFO", "로그인 성공", admin_id=admin_id, ip=ip)
         return {
@@ -179,7 +183,7 @@ def authenticate_user(admin_id: str, password: str) -> Dict:
             'user_status': user_status,
             'error': None
         }
-        
+    
     except Exception as e:
         log_error("ERROR", "인증 중 오류 발생", exception=e, admin_id=admin_id, ip=ip)
         return {
@@ -190,6 +194,32 @@ def authenticate_user(admin_id: str, password: str) -> Dict:
         }
 
 
+def _rehash_password(admin_id: str, password: str, stored_password: str, hash_type: str):
+    """
+    로그인에 성공한 비밀번호를 bcrypt(BCRYPT_ROUNDS)로 재해시하여 저장
+    
+    - tblmanager.passwd가 조회 시점 값과 같을 때만 갱신 (동시 변경 방지)
+    - 실패해도 로그인은 그대로 진행 (다음 로그인 때 다시 시도)
+    - 같은 tblmanager를 사용하는 다른 시스템이 bcrypt를 지원하는지,
+      passwd 컬럼 길이가 60자 이상인지 확인 후 활성화 (tools/bcrypt_calibrate.py --check-db)
+    """
+    try:
+        new_hash = hash_password(password)
+        updated = execute(
+            "UPDATE tblmanager SET passwd = %s WHERE admin_id = %s AND passwd = %s",
+            (new_hash, admin_id, stored_password),
+            query_name='rehash_password'
+        )
+        PASSWORD_REHASH.inc(result='updated' if updated else 'skipped')
+        log_auth("INFO", "비밀번호 재해시", admin_id=admin_id, 
+                 from_hash_type=hash_type, updated=bool(updated))
+    except VerifierBusyError:
+        PASSWORD_REHASH.inc(result='busy')
+    except Exception as e:
+        PASSWORD_REHASH.inc(result='error')
+        log_error("WARNING", "비밀번호 재해시 실패", exception=e, admin_id=admin_id)
+
+
 def check_session_timeout(login_time) -> Dict:
     """
     세션 타임아웃 체크
@@ -246,7 +276,11 @@ def check_session_timeout(login_time) -> Dict:
 def is_authenticated(session_state) -> bool:
     """인증 상태 확인"""
     # authenticated와 admin_id만 있으면 인증된 것으로 간주
-    # 세션 타임아웃 체크 제거됨
+    # 세션 타임아웃 체크 제거됨 (만료는 세션 토큰의 exp로 관리)
+    
+    # 인증된 세션은 매 rerun마다 호출되므로 조건 확인만 하고 바로 반환
+    if session_state.get('authenticated') and session_state.get('admin_id'):
+        return True
     
     # 디버깅: 각 조건 확인
     has_authenticated_key = 'authenticated' in session_state
@@ -254,8 +288,9 @@ def is_authenticated(session_state) -> bool:
     has_admin_id_key = 'admin_id' in session_state
     admin_id_value = session_state.get('admin_id') if has_admin_id_key else None
     
-    # 디버깅 로그 (너무 많이 찍히지 않도록 조건부)
-    if not has_authenticated_key or not authenticated_value or not has_admin_id_key or not admin_id_value:
+    # 디버깅 로그 (너무 많이 찍히지 않도록 조건부, DEBUG 레벨 비활성 시 세션 키 목록 생성 생략)
+    if (not has_authenticated_key or not authenticated_value or not has_admin_id_key or not admin_id_value) \
+            and is_log_enabled('auth', 'DEBUG'):
         log_auth("DEBUG", "인증 체크 실패 상세", 
                  has_authenticated_key=has_authenticated_key,
                  authenticated_value=authenticated_value,
@@ -273,6 +308,36 @@ def is_authenticated(session_state) -> bool:
     return result
 
 
+def start_session(session_state, admin_id: str) -> str:
+    """
+    로그인 성공 후 세션 상태 설정 및 세션 토큰 발급
+    
+    Returns:
+        str: 쿠키에 저장할 서명 토큰
+    """
+    token = issue_token(admin_id)
+    session_state.authenticated = True
+    session_state.admin_id = admin_id
+    session_state.auth_token = token
+    return token
+
+
+def restore_session(session_state, token: str) -> bool:
+    """
+    쿠키/URL의 세션 토큰으로 인증 상태 복원 (서명/만료만 메모리에서 검증, DB 조회 없음)
+    
+    Returns:
+        bool: 복원 성공 여부
+    """
+    admin_id = verify_token(token)
+    if not admin_id:
+        return False
+    session_state.authenticated = True
+    session_state.admin_id = admin_id
+    session_state.auth_token = token
+    return True
+
+
 def logout(session_state):
     """로그아웃"""
     admin_id = session_state.get('admin_id', 'unknown')
@@ -280,6 +345,9 @@ def logout(session_state):
     
     log_auth("INFO", "로그아웃", admin_id=admin_id, ip=ip)
     
+    # 세션 토큰 무효화 (같은 프로세스의 검증 캐시에서 제거)
+    revoke_token(session_state.get('auth_token'))
+    
     # 세션 정보 삭제
     if 'authenticated' in session_state:
         del session_state.authenticated
@@ -287,6 +355,8 @@ def logout(session_state):
         del session_state.admin_id
     if 'login_time' in session_state:
         del session_state.login_time
+    if 'auth_token' in session_state:
+        del session_state.auth_token
 
 
 if __name__ == "__main__":
@@ -0,0 +1,694 @@
+# utils/daily_stats_rollup.py
+"""숙소별 일자 집계 테이블 (hotel_daily_stats)
+- 마감된 날짜의 통계를 (날짜유형, 일자, 숙소, 채널) 단위로 미리 집계하여 저장
+- 통계 쿼리는 집계된 기간을 이 테이블에서 읽고 나머지 기간만 원본 테이블에서 집계
+- 적재 기간은 hotel_daily_stats_meta에 날짜유형별 (built_from, built_until)로 기록
+- 적재는 tools/build_daily_stats.py (야간 배치), 조회 사용 여부는 .env의 HOTEL_STATS_ROLLUP_ENABLED
+- 증분 갱신(refresh_rollup): 새로 마감된 날짜는 전체 집계, 기존 기간은 마지막 실행 이후
+  새로 들어오거나 변경된 주문이 속한 (일자, 숙소, 채널) 셀만 다시 집계
+  - 새 주문: order_product.idx 상한(high-water mark) 이후 행
+  - 변경된 주문: 수정 시각 컬럼(HOTEL_STATS_CHANGE_COLUMN)이 있으면 그 상한 이후 행,
+    없으면 최근 HOTEL_STATS_CHECK_DAYS일 주문의 상태/객실 수 체크섬을 지난 실행과 비교 (늦은 취소 반영)
+  - 수정 시각 컬럼 방식은 최근 HOTEL_STATS_CHECK_DAYS일 주문의 행별 셀을 저장해 두고
+    일자/숙소/채널이 바뀐 주문은 변경 전 셀도 다시 집계 (hotel_daily_stats_order_cell)
+
+집계 테이블은 리포팅 쿼리가 실행되는 서버에 있어야 함 (원본 테이블과 같은 쿼리에서 UNION ALL)
+- primary에 적재하면 복제본으로 복제됨 (기본값)
+- 복제본에 쓰기 가능한 로컬 스키마가 있으면 HOTEL_STATS_ROLLUP_SCHEMA로 지정하고 reporting에 적재
+"""
+
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from utils.db_access import fetch_one
+from utils.logger import log_app, log_error
+
+ROLLUP_TABLE = 'hotel_daily_stats'
+META_TABLE = 'hotel_daily_stats_meta'
+WATERMARK_TABLE = 'hotel_daily_stats_watermark'
+MARKER_TABLE = 'hotel_daily_stats_marker'
+ORDER_CELL_TABLE = 'hotel_daily_stats_order_cell'
+
+DATE_TYPES = ('orderDate', 'useDate')
+
+# 적재 기간 조회 캐시 기본값 (초)
+DEFAULT_RANGE_CACHE_SEC = 300
+
+# 체크섬 비교 기본 기간 (일) - 이보다 오래된 주문의 늦은 변경은 전체 재적재로 반영
+DEFAULT_CHECK_DAYS = 60
+
+# 주문 행별 셀 조회/저장 단위 (IN 목록 크기)
+ORDER_CELL_CHUNK = 1000
+
+# 집계 테이블 컬럼 (삽입 순서)
+ROLLUP_COLUMNS = ('date_type', 'stat_date', 'product_idx', 'channel_idx', 'channel_name', 'channel_code',
+                  'booking_count', 'total_rooms', 'confirmed_rooms', 'cancelled_rooms',
+                  'total_deposit', 'total_purchase', 'built_at')
+
+# 적재 기간 캐시: (엔진 ID, 날짜유형) -> ((built_from, built_until) 또는 None, 만료 시각)
+_range_cache = {}
+_range_cache_lock = threading.Lock()
+
+
+def is_rollup_enabled() -> bool:
+    """통계 조회 시 집계 테이블 사용 여부 - .env의 HOTEL_STATS_ROLLUP_ENABLED (기본값: false)"""
+    return os.getenv('HOTEL_STATS_ROLLUP_ENABLED', 'false').strip().lower() in ('1', 'true', 'yes')
+
+
+def _qualified(name: str) -> str:
+    """스키마를 붙인 테이블 이름 - .env의 HOTEL_STATS_ROLLUP_SCHEMA (없으면 현재 DB)"""
+    schema = os.getenv('HOTEL_STATS_ROLLUP_SCHEMA', '').strip()
+    return f"`{schema}`.`{name}`" if schema else f"`{name}`"
+
+
+def get_rollup_table() -> str:
+    return _qualified(ROLLUP_TABLE)
+
+
+def get_meta_table() -> str:
+    return _qualified(META_TABLE)
+
+
+def get_change_column():
+    """order_product 수정 시각 컬럼 - .env의 HOTEL_STATS_CHANGE_COLUMN (없으면 체크섬 비교)"""
+    column = os.getenv('HOTEL_STATS_CHANGE_COLUMN', '').strip()
+    if column and not column.replace('_', '').isalnum():
+        raise ValueError(f"HOTEL_STATS_CHANGE_COLUMN 값이 올바르지 않습니다: {column}")
+    return column or None
+
+
+def create_tables_sql() -> list:
+    """집계 테이블 / 적재 기간 테이블 DDL (MySQL)"""
+    return [
+        f"""
+        CREATE TABLE IF NOT EXISTS {get_rollup_table()} (
+            date_type VARCHAR(16) NOT NULL,
+            stat_date DATE NOT NULL,
+            product_idx INT NOT NULL,
+            channel_idx INT NULL,
+            channel_name VARCHAR(100) NULL,
+            channel_code VARCHAR(255) NULL,
+            booking_count INT NOT NULL DEFAULT 0,
+            total_rooms INT NOT NULL DEFAULT 0,
+            confirmed_rooms INT NOT NULL DEFAULT 0,
+            cancelled_rooms INT NOT NULL DEFAULT 0,
+            total_deposit DECIMAL(20, 2) NOT NULL DEFAULT 0,
+            total_purchase DECIMAL(20, 2) NOT NULL DEFAULT 0,
+            built_at DATETIME NOT NULL,
+            KEY idx_hotel_daily_stats_lookup (date_type, stat_date, product_idx)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        f"""
+        CREATE TABLE IF NOT EXISTS {get_meta_table()} (
+            date_type VARCHAR(16) NOT NULL PRIMARY KEY,
+            built_from DATE NOT NULL,
+            built_until DATE NOT NULL,
+            built_at DATETIME NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        f"""
+        CREATE TABLE IF NOT EXISTS {_qualified(WATERMARK_TABLE)} (
+            name VARCHAR(32) NOT NULL PRIMARY KEY,
+            value VARCHAR(64) NOT NULL,
+            updated_at DATETIME NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        f"""
+        CREATE TABLE IF NOT EXISTS {_qualified(MARKER_TABLE)} (
+            order_day DATE NOT NULL,
+            use_day DATE NULL,
+            product_idx INT NOT NULL,
+            channel_idx INT NULL,
+            row_count INT NOT NULL,
+            checksum BIGINT NOT NULL,
+            KEY idx_hotel_daily_stats_marker_day (order_day)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        f"""
+        CREATE TABLE IF NOT EXISTS {_qualified(ORDER_CELL_TABLE)} (
+            order_product_idx BIGINT NOT NULL PRIMARY KEY,
+            order_day DATE NOT NULL,
+            use_day DATE NULL,
+            product_idx INT NULL,
+            channel_idx INT NULL,
+            KEY idx_hotel_daily_stats_order_cell_day (order_day)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+    ]
+
+
+def get_rollup_range(engine, date_type: str):
+    """
+    집계 테이블에 적재된 기간 조회 (HOTEL_STATS_ROLLUP_CACHE_SEC 동안 캐시)
+    
+    Args:
+        engine: 리포팅 쿼리를 실행할 엔진 (집계 테이블이 있는 서버)
+        date_type: 날짜유형
+    
+    Returns:
+        tuple: (built_from, built_until) 또는 None (미사용/미적재/조회 실패)
+    """
+    if not is_rollup_enabled():
+        return None
+    
+    key = (id(engine), date_type)
+    now = time.monotonic()
+    with _range_cache_lock:
+        cached = _range_cache.get(key)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+    
+    try:
+        row = fetch_one(
+            f"SELECT built_from, built_until FROM {get_meta_table()} WHERE date_type = %s",
+            (date_type,),
+            query_name='rollup_range',
+            engine=engine
+        )
+        rollup_range = (row[0], row[1]) if row else None
+    except Exception as e:
+        # 테이블 미생성 등 - 원본 집계로 조회
+        log_error("WARNING", "집계 테이블 적재 기간 조회 실패 - 원본 테이블에서 집계", exception=e, date_type=date_type)
+        rollup_range = None
+    
+    try:
+        cache_sec = float(os.getenv('HOTEL_STATS_ROLLUP_CACHE_SEC', DEFAULT_RANGE_CACHE_SEC))
+    except ValueError:
+        cache_sec = DEFAULT_RANGE_CACHE_SEC
+    with _range_cache_lock:
+        _range_cache[key] = (rollup_range, now + cache_sec)
+    return rollup_range
+
+
+def _merge_range(existing, start: date, end: date):
+    """적재 기간 병합 (이어지면 확장, 떨어져 있으면 새 구간으로 교체)"""
+    if existing is None:
+        return start, end
+    built_from, built_until = existing
+    if start <= built_until + timedelta(days=1) and end >= built_from - timedelta(days=1):
+        return min(built_from, start), max(built_until, end)
+    return start, end
+
+
+def to_rollup_rows(df, date_type: str, built_at: datetime) -> list:
+    """통계 쿼리 결과를 집계 테이블 행으로 변환 (숙소 정보가 없는 행 제외)"""
+    rows = []
+    for record in df.to_dict('records'):
+        if record['hotel_idx'] is None or record['hotel_idx'] != record['hotel_idx']:
+            continue
+        channel_idx = record['channel_idx']
+        rows.append({
+            'date_type': date_type,
+            'stat_date': record['booking_date'],
+            'product_idx': int(record['hotel_idx']),
+            'channel_idx': None if channel_idx is None or channel_idx != channel_idx else int(channel_idx),
+            'channel_name': record['channel_name'],
+            'channel_code': record['channel_code'],
+            'booking_count': int(record['booking_count'] or 0),
+            'total_rooms': int(record['total_rooms'] or 0),
+            'confirmed_rooms': int(record['confirmed_rooms'] or 0),
+            'cancelled_rooms': int(record['cancelled_rooms'] or 0),
+            'total_deposit': float(record['total_deposit'] or 0),
+            'total_purchase': float(record['total_purchase'] or 0),
+            'built_at': built_at,
+        })
+    return rows
+
+
+def _rollup_insert_sql():
+    """집계 테이블 INSERT 문 (executemany용)"""
+    from sqlalchemy import text
+    
+    return text(
+        f"INSERT INTO {get_rollup_table()} ({', '.join(ROLLUP_COLUMNS)}) "
+        f"VALUES ({', '.join(':' + column for column in ROLLUP_COLUMNS)})"
+    )
+
+
+def _read_built_range(conn, date_type: str):
+    """적재 기간 조회 (캐시 없이, 적재 트랜잭션 안에서 사용)"""
+    from sqlalchemy import text
+    
+    meta = conn.execute(
+        text(f"SELECT built_from, built_until FROM {get_meta_table()} WHERE date_type = :date_type"),
+        {'date_type': date_type}
+    ).fetchone()
+    return (as_date(meta[0]), as_date(meta[1])) if meta else None
+
+
+def build_rollup(start_date: date, end_date: date, date_types=DATE_TYPES, source_engine=None,
+                 target_engine=None, chunk_days: int = 7, dry_run: bool = False) -> dict:
+    """
+    기간의 일자 집계를 원본 테이블에서 다시 계산하여 집계 테이블에 적재
+    
+    구간(chunk_days)마다 한 트랜잭션에서 기존 행 삭제 + 새 행 삽입 + 적재 기간 갱신
+    (조회 중인 쿼리는 교체 전 또는 후의 구간만 봄)
+    
+    Args:
+        start_date: 시작일
+        end_date: 종료일 (오늘 이후는 마감 전이므로 어제로 제한)
+        date_types: 적재할 날짜유형
+        source_engine: 원본 집계 엔진 (없으면 리포팅 엔진)
+        target_engine: 적재 엔진 (없으면 primary)
+        chunk_days: 한 번에 집계/교체할 일수
+        dry_run: True면 원본 집계만 실행하고 적재하지 않음
+    
+    Returns:
+        dict: {날짜유형: {'rows', 'skipped', 'chunks', 'built_from', 'built_until', 'elapsed_sec'}}
+    """
+    from sqlalchemy import text
+    
+    from config.configdb import ROLE_PRIMARY, ROLE_REPORTING, get_db_connection
+    from utils.query_builder_hotel import build_hotel_statistics_query
+    from utils.query_monitor import read_sql_monitored
+    
+    source_engine = source_engine or get_db_connection(ROLE_REPORTING)
+    target_engine = target_engine or get_db_connection(ROLE_PRIMARY)
+    
+    # 오늘은 아직 마감되지 않음 (통계 쿼리도 create_date < CURDATE() 조건)
+    end_date = min(end_date, date.today() - timedelta(days=1))
+    if end_date < start_date:
+        return {}
+    
+    insert_sql = _rollup_insert_sql()
+    delete_sql = text(
+        f"DELETE FROM {get_rollup_table()} "
+        f"WHERE date_type = :date_type AND stat_date >= :start_date AND stat_date <= :end_date"
+    )
+    delete_meta_sql = text(f"DELETE FROM {get_meta_table()} WHERE date_type = :date_type")
+    insert_meta_sql = text(
+        f"INSERT INTO {get_meta_table()} (date_type, built_from, built_until, built_at) "
+        f"VALUES (:date_type, :built_from, :built_until, :built_at)"
+    )
+    
+    results = {}
+    for date_type in date_types:
+        started = time.perf_counter()
+        result = {'rows': 0, 'skipped': 0, 'chunks': 0, 'built_from': None, 'built_until': None}
+        
+        chunk_start = start_date
+        while chunk_start <= end_date:
+            chunk_end = min(chunk_start + timedelta(days=max(1, chunk_days) - 1), end_date)
+            
+            # 숙소 필터 없이 전체 숙소 집계 (집계 테이블 미사용)
+            query = build_hotel_statistics_query(chunk_start, chunk_end, None, date_type, '전체')
+            df = read_sql_monitored(query, source_engine, query_name='rollup_source')
+            built_at = datetime.now().replace(microsecond=0)
+            rows = to_rollup_rows(df, date_type, built_at)
+            result['skipped'] += len(df) - len(rows)
+            
+            if not dry_run:
+                with target_engine.begin() as conn:
+                    conn.execute(delete_sql, {'date_type': date_type, 'start_date': chunk_start, 'end_date': chunk_end})
+                    if rows:
+                        conn.execute(insert_sql, rows)
+                    existing = _read_built_range(conn, date_type)
+                    built_from, built_until = _merge_range(existing, chunk_start, chunk_end)
+                    conn.execute(delete_meta_sql, {'date_type': date_type})
+                    conn.execute(insert_meta_sql, {'date_type': date_type, 'built_from': built_from,
+                                                   'built_until': built_until, 'built_at': built_at})
+                result['built_from'], result['built_until'] = built_from, built_until
+            
+            result['rows'] += len(rows)
+            result['chunks'] += 1
+            chunk_start = chunk_end + timedelta(days=1)
+        
+        result['elapsed_sec'] = round(time.perf_counter() - started, 2)
+        results[date_type] = result
+        log_app("INFO", "일자 집계 테이블 적재", date_type=date_type, start_date=str(start_date),
+                end_date=str(end_date), dry_run=dry_run, **{k: str(v) for k, v in result.items()})
+    
+    # 이 프로세스의 적재 기간 캐시 초기화
+    with _range_cache_lock:
+        _range_cache.clear()
+    return results
+
+
+# ============================================
+# 증분 갱신
+# ============================================
+
+def _read_watermarks(conn) -> dict:
+    """지난 실행의 상한 {'last_idx': int, 'last_changed': str}"""
+    from sqlalchemy import text
+    
+    rows = conn.execute(text(f"SELECT name, value FROM {_qualified(WATERMARK_TABLE)}")).fetchall()
+    watermarks = {name: value for name, value in rows}
+    if 'last_idx' in watermarks:
+        watermarks['last_idx'] = int(watermarks['last_idx'])
+    return watermarks
+
+
+def _save_watermarks(conn, watermarks: dict, updated_at: datetime):
+    """이번 실행의 상한 저장"""
+    from sqlalchemy import text
+    
+    table = _qualified(WATERMARK_TABLE)
+    for name, value in watermarks.items():
+        if value is None:
+            continue
+        conn.execute(text(f"DELETE FROM {table} WHERE name = :name"), {'name': name})
+        conn.execute(text(f"INSERT INTO {table} (name, value, updated_at) VALUES (:name, :value, :updated_at)"),
+                     {'name': name, 'value': str(value), 'updated_at': updated_at})
+
+
+def _read_source_high_water(source_engine, change_column):
+    """원본의 현재 상한 (MAX(idx), MAX(수정 시각)) - 실행 중 새로 들어오는 주문은 다음 실행에서 처리"""
+    from utils.db_access import fetch_one
+    
+    columns = "MAX(op.idx)" + (f", MAX(op.{change_column})" if change_column else "")
+    row = fetch_one(f"SELECT {columns} FROM order_product op", query_name='rollup_high_water', engine=source_engine)
+    max_idx = int(row[0]) if row and row[0] is not None else 0
+    max_changed = str(row[1]) if change_column and row[1] is not None else None
+    return max_idx, max_changed
+
+
+# 변경 행이 속한 셀 (구매일, 이용일, 숙소, 채널) - 통계 쿼리와 같은 마감 조건
+_CELL_SELECT = """
+    SELECT DATE(op.create_date), DATE(op.checkin_date), op.product_idx, op.order_channel_idx
+    FROM order_product op
+    WHERE {condition}
+        AND op.create_date < CURDATE()
+    GROUP BY 1, 2, 3, 4
+"""
+
+# 주문 행별 셀 (수정 시각 컬럼 방식에서 변경 전 셀을 찾기 위해 저장, 당일 주문도 포함)
+_ORDER_CELL_SELECT = """
+    SELECT op.idx, DATE(op.create_date), DATE(op.checkin_date), op.product_idx, op.order_channel_idx
+    FROM order_product op
+    WHERE {condition}
+"""
+
+# 체크섬 비교용 셀 지문 - 통계에 영향을 주는 상태/객실 수/박수/채널 값의 변경 감지
+_MARKER_SELECT = """
+    SELECT
+        DATE(op.create_date) as order_day,
+        DATE(op.checkin_date) as use_day,
+        op.product_idx,
+        op.order_channel_idx,
+        COUNT(*) as row_count,
+        SUM(CRC32(CONCAT_WS(':', op.idx, op.order_product_status, op.room_cnt, op.terms, op.order_type))) as checksum
+    FROM order_product op
+    WHERE op.create_date >= %s
+        AND op.create_date < CURDATE()
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+def _add_cells(touched: dict, rows):
+    """(구매일, 이용일, 숙소, 채널) 행을 날짜유형별 셀로 추가"""
+    for order_day, use_day, product_idx, channel_idx in rows:
+        if product_idx is None:
+            continue
+        channel_idx = int(channel_idx) if channel_idx is not None else None
+        if 'orderDate' in touched and order_day is not None:
+            touched['orderDate'].add((as_date(order_day), int(product_idx), channel_idx))
+        if 'useDate' in touched and use_day is not None:
+            touched['useDate'].add((as_date(use_day), int(product_idx), channel_idx))
+
+
+def _order_cell(order_day, use_day, product_idx, channel_idx) -> tuple:
+    return (as_date(order_day), as_date(use_day) if use_day is not None else None,
+            int(product_idx) if product_idx is not None else None,
+            int(channel_idx) if channel_idx is not None else None)
+
+
+def _read_order_cells(source_engine, condition: str, params, query_name: str) -> dict:
+    """원본 주문 행별 현재 셀 {order_product.idx: (구매일, 이용일, 숙소, 채널)}"""
+    from utils.db_access import fetch_all
+    
+    rows = fetch_all(_ORDER_CELL_SELECT.format(condition=condition), params, query_name=query_name,
+                     engine=source_engine)
+    return {int(idx): _order_cell(*cell) for idx, *cell in rows if cell[0] is not None}
+
+
+def _read_stored_order_cells(conn, order_ids) -> dict:
+    """지난 실행에 저장한 주문 행별 셀 (변경 전 셀)"""
+    from sqlalchemy import bindparam, text
+    
+    query = text(
+        f"SELECT order_product_idx, order_day, use_day, product_idx, channel_idx "
+        f"FROM {_qualified(ORDER_CELL_TABLE)} WHERE order_product_idx IN :ids"
+    ).bindparams(bindparam('ids', expanding=True))
+    order_ids = list(order_ids)
+    cells = {}
+    for i in range(0, len(order_ids), ORDER_CELL_CHUNK):
+        for idx, *cell in conn.execute(query, {'ids': order_ids[i:i + ORDER_CELL_CHUNK]}).fetchall():
+            cells[int(idx)] = _order_cell(*cell)
+    return cells
+
+
+def _save_order_cells(conn, order_cells: dict, since: date):
+    """주문 행별 셀 갱신 (비교 기간 이전 주문은 삭제 - 오래된 주문의 늦은 변경은 전체 재적재로 반영)"""
+    from sqlalchemy import bindparam, text
+    
+    table = _qualified(ORDER_CELL_TABLE)
+    delete_sql = text(f"DELETE FROM {table} WHERE order_product_idx IN :ids").bindparams(
+        bindparam('ids', expanding=True))
+    insert_sql = text(f"INSERT INTO {table} (order_product_idx, order_day, use_day, product_idx, channel_idx) "
+                      f"VALUES (:idx, :order_day, :use_day, :product_idx, :channel_idx)")
+    order_ids = list(order_cells)
+    for i in range(0, len(order_ids), ORDER_CELL_CHUNK):
+        chunk = order_ids[i:i + ORDER_CELL_CHUNK]
+        conn.execute(delete_sql, {'ids': chunk})
+        rows = [{'idx': idx, 'order_day': order_cells[idx][0], 'use_day': order_cells[idx][1],
+                 'product_idx': order_cells[idx][2], 'channel_idx': order_cells[idx][3]}
+                for idx in chunk if order_cells[idx][0] >= since]
+        if rows:
+            conn.execute(insert_sql, rows)
+    conn.execute(text(f"DELETE FROM {table} WHERE order_day < :since"), {'since': since})
+
+
+def _read_markers(source_engine, since: date) -> dict:
+    """원본 셀 지문 {(구매일, 이용일, 숙소, 채널): (행 수, 체크섬)}"""
+    from utils.db_access import fetch_all
+    
+    rows = fetch_all(_MARKER_SELECT, (since,), query_name='rollup_markers', engine=source_engine)
+    return {
+        (as_date(order_day), as_date(use_day) if use_day is not None else None, int(product_idx),
+         int(channel_idx) if channel_idx is not None else None): (int(row_count), int(checksum or 0))
+        for order_day, use_day, product_idx, channel_idx, row_count, checksum in rows
+        if product_idx is not None
+    }
+
+
+def _read_stored_markers(conn, since: date) -> dict:
+    """지난 실행에 저장한 셀 지문"""
+    from sqlalchemy import text
+    
+    rows = conn.execute(
+        text(f"SELECT order_day, use_day, product_idx, channel_idx, row_count, checksum "
+             f"FROM {_qualified(MARKER_TABLE)} WHERE order_day >= :since"),
+        {'since': since}
+    ).fetchall()
+    return {
+        (as_date(order_day), as_date(use_day) if use_day is not None else None, int(product_idx),
+         int(channel_idx) if channel_idx is not None else None): (int(row_count), int(checksum))
+        for order_day, use_day, product_idx, channel_idx, row_count, checksum in rows
+    }
+
+
+def _save_markers(conn, markers: dict):
+    """셀 지문 교체 (비교 기간 밖의 오래된 지문도 함께 삭제)"""
+    from sqlalchemy import text
+    
+    table = _qualified(MARKER_TABLE)
+    conn.execute(text(f"DELETE FROM {table}"))
+    if markers:
+        conn.execute(
+            text(f"INSERT INTO {table} (order_day, use_day, product_idx, channel_idx, row_count, checksum) "
+                 f"VALUES (:order_day, :use_day, :product_idx, :channel_idx, :row_count, :checksum)"),
+            [{'order_day': key[0], 'use_day': key[1], 'product_idx': key[2], 'channel_idx': key[3],
+              'row_count': value[0], 'checksum': value[1]} for key, value in markers.items()]
+        )
+
+
+def _recompute_cells(date_type: str, cells, source_engine, target_engine, dry_run: bool) -> int:
+    """
+    변경된 셀만 통계 쿼리로 다시 집계하여 교체
+    
+    일자별로 해당 숙소만 조회 (build_hotel_statistics_query의 그룹/확정/취소 로직 그대로 사용)
+    
+    Returns:
+        int: 다시 적재한 행 수
+    """
+    from sqlalchemy import text
+    
+    from utils.query_builder_hotel import build_hotel_statistics_query
+    from utils.query_monitor import read_sql_monitored
+    
+    cells_by_day = {}
+    for stat_date, product_idx, channel_idx in cells:
+        cells_by_day.setdefault(stat_date, set()).add((product_idx, channel_idx))
+    
+    delete_sql = text(
+        f"DELETE FROM {get_rollup_table()} "
+        f"WHERE date_type = :date_type AND stat_date = :stat_date AND product_idx = :product_idx "
+        f"AND (channel_idx = :channel_idx OR (channel_idx IS NULL AND :channel_idx IS NULL))"
+    )
+    insert_sql = _rollup_insert_sql()
+    
+    written = 0
+    for stat_date, day_cells in sorted(cells_by_day.items()):
+        hotel_ids = sorted({product_idx for product_idx, _ in day_cells})
+        query = build_hotel_statistics_query(stat_date, stat_date, hotel_ids, date_type, '전체')
+        df = read_sql_monitored(query, source_engine, query_name='rollup_refresh')
+        built_at = datetime.now().replace(microsecond=0)
+        # 같은 숙소의 다른 채널은 변경이 없으므로 제외
+        rows = [row for row in to_rollup_rows(df, date_type, built_at)
+                if (row['product_idx'], row['channel_idx']) in day_cells]
+        
+        if not dry_run:
+            with target_engine.begin() as conn:
+                conn.execute(delete_sql, [
+                    {'date_type': date_type, 'stat_date': stat_date, 'product_idx': product_idx,
+                     'channel_idx': channel_idx}
+                    for product_idx, channel_idx in day_cells
+                ])
+                if rows:
+                    conn.execute(insert_sql, rows)
+        written += len(rows)
+    return written
+
+
+def refresh_rollup(date_types=DATE_TYPES, source_engine=None, target_engine=None,
+                   check_days: int = None, dry_run: bool = False) -> dict:
+    """
+    집계 테이블 증분 갱신
+    
+    1. 원본 상한(MAX(idx), 수정 시각) 기록 - 이번 실행에서 처리할 범위 고정
+    2. 마지막 실행 이후 새 주문/변경된 주문이 속한 (일자, 숙소, 채널) 셀 수집
+       (수정 시각 컬럼 방식은 저장된 주문 행별 셀로 변경 전 셀도 수집)
+    3. 적재 기간 이후 새로 마감된 날짜는 build_rollup으로 전체 집계
+    4. 기존 적재 기간 안의 변경 셀만 다시 집계하여 교체
+    5. 상한과 셀 지문(체크섬 방식) 또는 주문 행별 셀(수정 시각 컬럼 방식) 저장
+    
+    최초 실행 전에 build_rollup(전체 적재)이 되어 있어야 함
+    (최초 실행 시 idx 상한은 기록만 하고, 체크섬 방식이면 비교 기간 전체를 다시 집계)
+    
+    Args:
+        date_types: 갱신할 날짜유형
+        source_engine: 원본 엔진 (없으면 리포팅 엔진)
+        target_engine: 적재 엔진 (없으면 primary)
+        check_days: 체크섬 비교 기간 (없으면 HOTEL_STATS_CHECK_DAYS)
+        dry_run: True면 변경 셀 집계만 하고 적재/상한 저장하지 않음
+    
+    Returns:
+        dict: {'mode', 'last_idx', 'max_idx', 날짜유형: {'new_days', 'cells', 'rows', 'built_until'}}
+    """
+    from config.configdb import ROLE_PRIMARY, ROLE_REPORTING, get_db_connection
+    from utils.db_access import fetch_all
+    
+    source_engine = source_engine or get_db_connection(ROLE_REPORTING)
+    target_engine = target_engine or get_db_connection(ROLE_PRIMARY)
+    started = time.perf_counter()
+    yesterday = date.today() - timedelta(days=1)
+    change_column = get_change_column()
+    if check_days is None:
+        try:
+            check_days = max(1, int(os.getenv('HOTEL_STATS_CHECK_DAYS', DEFAULT_CHECK_DAYS)))
+        except ValueError:
+            check_days = DEFAULT_CHECK_DAYS
+    
+    # 1. 이번 실행의 상한
+    max_idx, max_changed = _read_source_high_water(source_engine, change_column)
+    with target_engine.connect() as conn:
+        watermarks = _read_watermarks(conn)
+        built_ranges = {date_type: _read_built_range(conn, date_type) for date_type in date_types}
+    last_idx = watermarks.get('last_idx')
+    last_changed = watermarks.get('last_changed')
+    
+    # 2. 변경 셀 수집
+    touched = {date_type: set() for date_type in date_types}
+    has_new_rows = last_idx is not None and max_idx > last_idx
+    new_rows_condition = "op.idx > %s AND op.idx <= %s"
+    
+    markers = None
+    order_cells = None
+    since = yesterday - timedelta(days=check_days - 1)
+    if change_column:
+        # 주문 행별 셀을 저장해 두고 변경된 주문은 변경 전 셀(일자/숙소/채널이 바뀐 경우)도 다시 집계
+        order_cells = {}
+        if 'order_cells_since' not in watermarks:
+            # 최초 실행: 비교 기간 주문의 현재 셀 저장 (이번 실행에서는 변경 전 셀 없음)
+            order_cells.update(_read_order_cells(source_engine, "op.create_date >= %s AND op.idx <= %s",
+                                                 (since, max_idx), 'rollup_order_cells'))
+        if has_new_rows:
+            new_cells = _read_order_cells(source_engine, new_rows_condition, (last_idx, max_idx), 'rollup_new_rows')
+            _add_cells(touched, new_cells.values())
+            order_cells.update(new_cells)
+        if last_changed is not None and max_changed is not None:
+            condition = f"op.{change_column} > %s AND op.{change_column} <= %s"
+            changed_cells = _read_order_cells(source_engine, condition, (last_changed, max_changed),
+                                              'rollup_changed_rows')
+            with target_engine.connect() as conn:
+                previous_cells = _read_stored_order_cells(conn, changed_cells)
+            _add_cells(touched, [*changed_cells.values(), *previous_cells.values()])
+            order_cells.update(changed_cells)
+    else:
+        if has_new_rows:
+            _add_cells(touched, fetch_all(_CELL_SELECT.format(condition=new_rows_condition), (last_idx, max_idx),
+                                          query_name='rollup_new_rows', engine=source_engine))
+        markers = _read_markers(source_engine, since)
+        with target_engine.connect() as conn:
+            stored = _read_stored_markers(conn, since)
+        changed = [key for key in markers.keys() | stored.keys() if markers.get(key) != stored.get(key)]
+        _add_cells(touched, changed)
+    
+    results = {
+        'mode': 'column' if change_column else 'checksum',
+        'last_idx': last_idx,
+        'max_idx': max_idx,
+    }
+    for date_type in date_types:
+        built = built_ranges[date_type]
+        if built is None:
+            results[date_type] = {'error': "적재 기간 없음 - 전체 적재(build_rollup) 먼저 실행"}
+            continue
+        built_from, built_until = built
+        
+        # 3. 새로 마감된 날짜
+        new_days = max(0, (yesterday - built_until).days)
+        if new_days:
+            build_rollup(built_until + timedelta(days=1), yesterday, (date_type,), source_engine, target_engine,
+                         dry_run=dry_run)
+        
+        # 4. 기존 적재 기간 안의 변경 셀
+        cells = [cell for cell in touched[date_type] if built_from <= cell[0] <= built_until]
+        rows = _recompute_cells(date_type, cells, source_engine, target_engine, dry_run)
+        results[date_type] = {
+            'new_days': new_days,
+            'cells': len(cells),
+            'rows': rows,
+            'built_until': max(built_until, yesterday),
+        }
+    
+    # 5. 상한/지문 저장
+    if not dry_run:
+        with target_engine.begin() as conn:
+            _save_watermarks(conn, {'last_idx': max_idx, 'last_changed': max_changed,
+                                    'order_cells_since': since if order_cells is not None else None},
+                             datetime.now().replace(microsecond=0))
+            if markers is not None:
+                _save_markers(conn, markers)
+            if order_cells is not None:
+                _save_order_cells(conn, order_cells, since)
+    
+    results['elapsed_sec'] = round(time.perf_counter() - started, 2)
+    log_app("INFO", "일자 집계 테이블 증분 갱신", dry_run=dry_run,
+            **{k: str(v) for k, v in results.items()})
+    
+    with _range_cache_lock:
+        _range_cache.clear()
+    return results
+
+
+def as_date(value) -> date:
+    """date/datetime 또는 'YYYY-MM-DD' 문자열을 date로 변환 (드라이버에 따라 DATE 값이 문자열일 수 있음)"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
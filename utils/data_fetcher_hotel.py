@@ -2,76 +2,282 @@
 """숙소별 데이터 조회 및 처리 함수
 - 날짜별 + 숙소별 + 채널별 집계
 - order_item.due_price 사용 (입금가)
+- 날짜 분할 병렬 조회: 통계 쿼리는 일자별로 GROUP BY하므로 기간을 나눠 동시에 실행해도 결과가 같음
+  (HOTEL_QUERY_SHARDS, 기본값 1 = 분할 안 함)
+- 마감일은 hotel_daily_stats 집계 테이블에서 조회 (utils.daily_stats_rollup, HOTEL_STATS_ROLLUP_ENABLED)
+- 같은 통계 쿼리가 동시에 요청되면 한 번만 실행하고 결과 공유 (utils.single_flight, SINGLE_FLIGHT_ENABLED)
+- fetch_hotel_report: 상세 + 요약 조회를 리포트 백그라운드 작업(utils.report_jobs)으로 실행
+- HOTEL_STATS_ENGINE=duckdb: Parquet 스냅샷이 조회 기간을 포함하면 DuckDB로 조회 (utils.duckdb_engine)
+- granularity: 일/주/월/기간 전체 단위로 SQL에서 집계 (일 단위가 아니면 분할하지 않고 원본 1회 조회 - 예약 건수 중복 방지)
 """
 
-import sys
 import os
-# 프로젝트 루트 디렉토리를 path에 추가
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 
 import pandas as pd
-from sqlalchemy import text
-from config.configdb import get_db_connection
-# 점이 있는 파일명은 직접 import 불가하므로 importlib 사용
-import importlib.util
-_query_builder_path = os.path.join(os.path.dirname(__file__), 'query_builder_hotel.py')
-spec = importlib.util.spec_from_file_location("query_builder_hotel", _query_builder_path)
-query_builder_hotel = importlib.util.module_from_spec(spec)
-sys.modules["query_builder_hotel"] = query_builder_hotel
-spec.loader.exec_module(query_builder_hotel)
-
-from query_builder_hotel import (  # type: ignore
+from config.configdb import ROLE_REPORTING, get_db_connection
+from utils.query_monitor import read_sql_monitored
+from utils.query_builder_hotel import (
     build_hotel_statistics_query,
     build_hotel_summary_query
 )
+from utils.daily_stats_rollup import get_rollup_range
+from utils.duckdb_engine import read_sql_duckdb, snapshot_covers
+from utils.report_jobs import JobCancelledError
+from utils.single_flight import SingleFlight, is_single_flight_enabled, make_query_key
+
+# 날짜 분할 조회 기본값
+DEFAULT_QUERY_SHARDS = 1
+DEFAULT_MIN_SHARD_DAYS = 7
+DEFAULT_SHARD_WORKERS = 4
+
+# 분할 쿼리 워커 풀 (프로세스당 1개, 전체 세션의 동시 분할 쿼리 수 상한)
+_shard_executor = None
+_shard_executor_lock = threading.Lock()
+
+# 동일 통계 쿼리 동시 실행 병합 (먼저 실행한 작업이 취소되면 기다리던 요청은 다시 실행)
+_statistics_flight = SingleFlight('hotel_data', retry_on=(JobCancelledError,))
+
+
+def _get_env_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def get_query_shards() -> int:
+    """통계 쿼리 날짜 분할 수 - .env의 HOTEL_QUERY_SHARDS (1이면 분할 안 함)"""
+    return _get_env_int('HOTEL_QUERY_SHARDS', DEFAULT_QUERY_SHARDS)
+
+
+def _get_shard_executor() -> ThreadPoolExecutor:
+    """분할 쿼리 워커 풀 반환 - 크기는 .env의 HOTEL_QUERY_SHARD_WORKERS (커넥션 풀 크기 이하로 설정)"""
+    global _shard_executor
+    
+    if _shard_executor is not None:
+        return _shard_executor
+    
+    with _shard_executor_lock:
+        if _shard_executor is None:
+            workers = _get_env_int('HOTEL_QUERY_SHARD_WORKERS', DEFAULT_SHARD_WORKERS)
+            _shard_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="query-shard")
+    return _shard_executor
+
+
+def split_date_range(start_date, end_date, shards: int, min_days: int = None) -> list:
+    """
+    조회 기간을 연속된 날짜 구간으로 분할 (최근 구간부터)
+    
+    통계 쿼리가 booking_date DESC로 정렬되므로 최근 구간부터 이어 붙이면 전체 쿼리와 순서가 같음
+    
+    Args:
+        start_date: 시작일 (date 또는 'YYYY-MM-DD')
+        end_date: 종료일 (date 또는 'YYYY-MM-DD')
+        shards: 분할 수
+        min_days: 구간당 최소 일수 (없으면 HOTEL_QUERY_MIN_SHARD_DAYS, 짧은 기간은 덜 나눔)
+    
+    Returns:
+        list: [(구간 시작일, 구간 종료일), ...] (date, 최근 구간부터)
+    """
+    start = pd.Timestamp(start_date).date()
+    end = pd.Timestamp(end_date).date()
+    total_days = (end - start).days + 1
+    if min_days is None:
+        min_days = _get_env_int('HOTEL_QUERY_MIN_SHARD_DAYS', DEFAULT_MIN_SHARD_DAYS)
+    
+    shards = max(1, min(shards, total_days // max(1, min_days)))
+    if total_days <= 0 or shards == 1:
+        return [(start, end)]
+    
+    # 일수를 최대한 균등하게 (앞쪽 구간에 하루씩 더 배분)
+    base, extra = divmod(total_days, shards)
+    ranges = []
+    shard_end = end
+    for i in range(shards):
+        days = base + (1 if i < extra else 0)
+        shard_start = shard_end - timedelta(days=days - 1)
+        ranges.append((shard_start, shard_end))
+        shard_end = shard_start - timedelta(days=1)
+    return ranges
+
+
+def _read_statistics(engine, start_date, end_date, selected_hotel_ids, date_type,
+                     query_name: str, connection=None, job=None, rollup_range=None,
+                     granularity: str = 'day') -> pd.DataFrame:
+    """
+    통계 쿼리 1회 실행 (타입 정리 전 원본 결과)
+    
+    connection이 있으면 그 연결에서, job이 있으면 작업 전용 연결(취소 시 KILL QUERY 대상)에서,
+    둘 다 없으면 엔진의 커넥션 풀에서 실행
+    """
+    # 쿼리 실행 (order_status는 항상 '전체'로 고정)
+    query = build_hotel_statistics_query(
+        start_date, 
+        end_date, 
+        selected_hotel_ids=selected_hotel_ids,
+        date_type=date_type,
+        order_status='전체',  # 항상 '전체'로 고정
+        rollup_range=rollup_range,
+        granularity=granularity
+    )
+    
+    if connection is not None:
+        return read_sql_monitored(query, connection, query_name=query_name)
+    if job is not None:
+        with job.connection(engine) as conn:
+            return read_sql_monitored(query, conn, query_name=query_name)
+    return read_sql_monitored(query, engine, query_name=query_name)
+
+
+def _read_statistics_sharded(engine, ranges, selected_hotel_ids, date_type, job=None,
+                             rollup_range=None, granularity: str = 'day') -> pd.DataFrame:
+    """날짜 구간별 통계 쿼리를 동시에 실행하고 구간 순서대로 이어 붙임"""
+    executor = _get_shard_executor()
+    futures = [
+        executor.submit(_read_statistics, engine, shard_start, shard_end, selected_hotel_ids, date_type,
+                        'fetch_hotel_data_shard', job=job, rollup_range=rollup_range, granularity=granularity)
+        for shard_start, shard_end in ranges
+    ]
+    try:
+        frames = [future.result() for future in futures]
+    except Exception:
+        # 하나라도 실패하면 아직 시작하지 않은 구간은 실행하지 않음
+        for future in futures:
+            future.cancel()
+        raise
+    
+    non_empty = [frame for frame in frames if not frame.empty]
+    if not non_empty:
+        return frames[0]
+    return pd.concat(non_empty, ignore_index=True)
+
+
+def _load_hotel_data(engine, start_date, end_date, selected_hotel_ids, date_type,
+                     connection=None, shards: int = None, job=None, rollup_range=None,
+                     granularity: str = 'day') -> pd.DataFrame:
+    """통계 쿼리 실행 (날짜 분할 포함) 후 타입 정리 - 작업이 취소되어 실패한 경우 JobCancelledError"""
+    if granularity != 'day':
+        # 구간별 주문번호 수를 더하면 구간에 걸친 주문이 중복 집계되므로 단위 행은 한 쿼리에서 집계
+        shards = 1
+    try:
+        ranges = split_date_range(start_date, end_date, shards or get_query_shards())
+        if connection is not None or len(ranges) == 1:
+            df = _read_statistics(engine, start_date, end_date, selected_hotel_ids, date_type,
+                                  'fetch_hotel_data', connection=connection, job=job, rollup_range=rollup_range,
+                                  granularity=granularity)
+        else:
+            df = _read_statistics_sharded(engine, ranges, selected_hotel_ids, date_type, job=job,
+                                          rollup_range=rollup_range, granularity=granularity)
+    except Exception:
+        # KILL QUERY로 중단된 쿼리 오류는 취소로 구분 (병합 대기 중인 요청이 실패 결과를 공유하지 않도록)
+        if job is not None:
+            job.check_cancelled()
+        raise
+    
+    return _coerce_hotel_data(df)
+
+
+def _coerce_hotel_data(df: pd.DataFrame) -> pd.DataFrame:
+    """통계 쿼리 결과 타입 정리 (MySQL/DuckDB 결과를 같은 형태로)"""
+    if not df.empty:
+        df['booking_date'] = pd.to_datetime(df['booking_date'])
+        df['hotel_idx'] = df['hotel_idx'].astype(int)
+        df['booking_count'] = df['booking_count'].astype(int)
+        df['total_rooms'] = df['total_rooms'].fillna(0).astype(int)
+        df['confirmed_rooms'] = df['confirmed_rooms'].fillna(0).astype(int)
+        df['cancelled_rooms'] = df['cancelled_rooms'].fillna(0).astype(int)
+        df['cancellation_rate'] = df['cancellation_rate'].fillna(0).round(1)  # 소수점 1자리
+        df['total_deposit'] = df['total_deposit'].fillna(0).round(0).astype(int)
+        df['total_purchase'] = df['total_purchase'].fillna(0).round(0).astype(int)
+        df['total_profit'] = df['total_profit'].fillna(0).round(0).astype(int)
+        df['profit_rate'] = df['profit_rate'].fillna(0).round(1)  # 소수점 1자리
+    
+    return df
+
+
+def fetch_hotel_data_duckdb(start_date, end_date, selected_hotel_ids=None, date_type='orderDate',
+                            granularity: str = 'day'):
+    """
+    Parquet 스냅샷에서 DuckDB로 통계 조회 (MySQL과 같은 쿼리 로직, 날짜 분할/집계 테이블 미사용)
+    
+    Returns:
+        pandas DataFrame (fetch_hotel_data와 같은 컬럼/타입)
+    """
+    query = build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=selected_hotel_ids,
+                                         date_type=date_type, order_status='전체', dialect='duckdb',
+                                         granularity=granularity)
+    df = read_sql_duckdb(query, query_name='fetch_hotel_data_duckdb')
+    if not df.empty:
+        # DuckDB DATE는 datetime64[us]로 반환되므로 MySQL 결과와 같은 ns 단위로 맞춤
+        df['booking_date'] = pd.to_datetime(df['booking_date']).astype('datetime64[ns]')
+    return _coerce_hotel_data(df)
 
 
 def fetch_hotel_data(start_date, end_date, selected_hotel_ids=None,
-                     date_type='orderDate', order_status='전체'):
+                     date_type='orderDate', order_status='전체', connection=None,
+                     shards: int = None, job=None, granularity: str = 'day'):
     """
     숙소별 예약 데이터 조회
     날짜별 + 숙소별 + 채널별 집계
     
+    같은 쿼리(같은 엔진)가 이미 실행 중이면 그 결과를 기다려 공유함 (반환된 DataFrame은 읽기 전용으로 사용)
+    HOTEL_STATS_ENGINE=duckdb이고 Parquet 스냅샷이 조회 기간을 포함하면 MySQL 대신 DuckDB로 조회
+    
     Args:
         start_date: 시작일
         end_date: 종료일  
         selected_hotel_ids: 선택된 숙소 ID 리스트 (None이면 전체)
         date_type: 날짜유형 ('useDate', 'orderDate')
         order_status: 예약상태 (항상 '전체'로 고정)
+        connection: 사용할 DB 연결 (지정하면 분할/병합하지 않고 이 연결에서 실행)
+        shards: 날짜 분할 수 (없으면 HOTEL_QUERY_SHARDS, 일 단위가 아니면 분할하지 않음)
+        job: 리포트 작업 (구간별 쿼리를 작업 전용 연결에서 실행하여 취소 가능하게 함)
+        granularity: 집계 단위 ('day', 'week', 'month', 'period' - booking_date는 단위 시작일)
     
     Returns:
         pandas DataFrame
     """
     try:
-        engine = get_db_connection()
+        # 선택 순서만 다른 같은 숙소 집합은 같은 쿼리가 되도록 정렬
+        if selected_hotel_ids:
+            selected_hotel_ids = sorted(set(selected_hotel_ids))
         
-        # 쿼리 실행 (order_status는 항상 '전체'로 고정)
-        query = build_hotel_statistics_query(
-            start_date, 
-            end_date, 
-            selected_hotel_ids=selected_hotel_ids,
-            date_type=date_type,
-            order_status='전체'  # 항상 '전체'로 고정
-        )
+        # 스냅샷으로 조회 가능한 기간은 DuckDB (서브초 단위라 분할/병합하지 않음)
+        if connection is None and snapshot_covers(start_date, end_date):
+            df = fetch_hotel_data_duckdb(start_date, end_date, selected_hotel_ids, date_type, granularity)
+            if job is not None:
+                job.check_cancelled()
+            return df
         
-        df = pd.read_sql(query, engine)
+        # 집계 쿼리는 리포팅 복제본으로 (복제본 미설정/지연 시 primary)
+        # 분할 구간이 모두 같은 서버에서 실행되도록 엔진은 한 번만 선택
+        engine = get_db_connection(ROLE_REPORTING) if connection is None else None
         
-        # 데이터 타입 정리
-        if not df.empty:
-            df['booking_date'] = pd.to_datetime(df['booking_date'])
-            df['hotel_idx'] = df['hotel_idx'].astype(int)
-            df['booking_count'] = df['booking_count'].astype(int)
-            df['total_rooms'] = df['total_rooms'].fillna(0).astype(int)
-            df['confirmed_rooms'] = df['confirmed_rooms'].fillna(0).astype(int)
-            df['cancelled_rooms'] = df['cancelled_rooms'].fillna(0).astype(int)
-            df['cancellation_rate'] = df['cancellation_rate'].fillna(0).round(1)  # 소수점 1자리
-            df['total_deposit'] = df['total_deposit'].fillna(0).round(0).astype(int)
-            df['total_purchase'] = df['total_purchase'].fillna(0).round(0).astype(int)
-            df['total_profit'] = df['total_profit'].fillna(0).round(0).astype(int)
-            df['profit_rate'] = df['profit_rate'].fillna(0).round(1)  # 소수점 1자리
+        # 마감일 집계 테이블 적재 기간 (HOTEL_STATS_ROLLUP_ENABLED, 없으면 원본 집계)
+        rollup_range = get_rollup_range(engine if engine is not None else connection.engine, date_type)
         
-        return df
+        if connection is not None or not is_single_flight_enabled():
+            return _load_hotel_data(engine, start_date, end_date, selected_hotel_ids, date_type,
+                                    connection=connection, shards=shards, job=job, rollup_range=rollup_range,
+                                    granularity=granularity)
         
+        # 병합 키는 분할 전 전체 쿼리 기준 (분할 수가 달라도 결과는 같음)
+        key = make_query_key(
+            build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=selected_hotel_ids,
+                                         date_type=date_type, order_status='전체', rollup_range=rollup_range,
+                                         granularity=granularity),
+            engine=engine
+        )
+        df, _ = _statistics_flight.do(key, lambda: _load_hotel_data(
+            engine, start_date, end_date, selected_hotel_ids, date_type, shards=shards, job=job,
+            rollup_range=rollup_range, granularity=granularity),
+            cancelled=job.check_cancelled if job is not None else None)
+        # 공유 결과의 컬럼 추가/삭제가 다른 세션에 보이지 않도록 얕은 복사본 반환
+        return df.copy(deep=False)
+    
     except Exception as e:
         print(f"❌ 숙소별 데이터 조회 오류: {e}")
         import traceback
@@ -80,7 +286,7 @@ def fetch_hotel_data(start_date, end_date, selected_hotel_ids=None,
 
 
 def fetch_hotel_summary_stats(start_date, end_date, selected_hotel_ids=None,
-                              date_type='orderDate', order_status='전체'):
+                              date_type='orderDate', order_status='전체', connection=None):
     """
     숙소별 요약 통계 조회
     
@@ -90,21 +296,28 @@ def fetch_hotel_summary_stats(start_date, end_date, selected_hotel_ids=None,
         selected_hotel_ids: 선택된 숙소 ID 리스트
         date_type: 날짜유형
         order_status: 예약상태 (항상 '전체'로 고정)
+        connection: 사용할 DB 연결 (리포트 작업 전용 연결, 없으면 리포팅 엔진 또는 DuckDB 스냅샷)
     
     Returns:
         dict: 요약 통계 정보
     """
     try:
-        engine = get_db_connection()
+        use_duckdb = connection is None and snapshot_covers(start_date, end_date)
         query = build_hotel_summary_query(
             start_date, 
             end_date, 
             selected_hotel_ids=selected_hotel_ids,
             date_type=date_type, 
-            order_status='전체'  # 항상 '전체'
+            order_status='전체',  # 항상 '전체'
+            dialect='duckdb' if use_duckdb else 'mysql'
         )
         
-        df = pd.read_sql(query, engine)
+        if use_duckdb:
+            df = read_sql_duckdb(query, query_name='fetch_hotel_summary_stats_duckdb')
+        else:
+            # 집계 쿼리는 리포팅 복제본으로 (복제본 미설정/지연 시 primary)
+            engine = connection if connection is not None else get_db_connection(ROLE_REPORTING)
+            df = read_sql_monitored(query, engine, query_name='fetch_hotel_summary_stats')
         
         if not df.empty:
             return {
@@ -120,7 +333,7 @@ def fetch_hotel_summary_stats(start_date, end_date, selected_hotel_ids=None,
             'hotel_count': 0,
             'active_days': 0
         }
-        
+    
     except Exception as e:
         print(f"❌ 숙소별 요약 통계 조회 오류: {e}")
         return {
@@ -131,6 +344,47 @@ def fetch_hotel_summary_stats(start_date, end_date, selected_hotel_ids=None,
         }
 
 
+# fetch_hotel_report 진행 단계 수 (상세 조회, 요약 조회)
+REPORT_STEPS = 2
+
+
+def fetch_hotel_report(job, start_date, end_date, selected_hotel_ids=None, date_type='orderDate',
+                       granularity: str = 'day'):
+    """
+    리포트 작업 함수 - 상세 데이터(날짜 분할 시 구간별 연결)와 요약 통계를 작업 전용 연결에서 순서대로 조회
+    
+    submit_report_job(fetch_hotel_report, ..., total_steps=REPORT_STEPS)로 실행하며,
+    작업이 취소되면 실행 중인 쿼리는 KILL QUERY로 중단되고 JobCancelledError로 종료
+    
+    Args:
+        job: utils.report_jobs.ReportJob
+        start_date: 시작일
+        end_date: 종료일
+        selected_hotel_ids: 선택된 숙소 ID 리스트
+        date_type: 날짜유형
+        granularity: 집계 단위 ('day', 'week', 'month', 'period')
+    
+    Returns:
+        dict: {'df': 상세 DataFrame, 'summary_stats': 요약 통계}
+    """
+    job.set_progress("예약 데이터 조회 중", step=0)
+    df = fetch_hotel_data(start_date, end_date, selected_hotel_ids=selected_hotel_ids,
+                          date_type=date_type, order_status='전체', job=job, granularity=granularity)
+    
+    job.set_progress("요약 통계 조회 중", step=1)
+    if snapshot_covers(start_date, end_date):
+        summary_stats = fetch_hotel_summary_stats(start_date, end_date, selected_hotel_ids=selected_hotel_ids,
+                                                  date_type=date_type, order_status='전체')
+    else:
+        with job.connection(get_db_connection(ROLE_REPORTING)) as conn:
+            summary_stats = fetch_hotel_summary_stats(start_date, end_date, selected_hotel_ids=selected_hotel_ids,
+                                                      date_type=date_type, order_status='전체', connection=conn)
+    
+    # 취소로 중단된 쿼리는 빈 결과로 반환되므로 결과를 넘기기 전에 확인
+    job.check_cancelled()
+    return {'df': df, 'summary_stats': summary_stats}
+
+
 # 테스트 함수
 if __name__ == "__main__":
     from datetime import datetime, timedelta
@@ -170,4 +424,3 @@ if __name__ == "__main__":
         print("  데이터 없음")
     
     print("\n✅ 숙소별 데이터 조회 테스트 완료!")
-
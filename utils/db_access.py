@@ -0,0 +1,130 @@
+# utils/db_access.py
+"""경량 DB 행 조회 모듈 (pandas 미사용)
+- 인증, 숙소 단건 조회, 숙소 검색처럼 1~수십 행을 가져오는 대화형 경로용
+- 커넥션 풀의 DBAPI 커서로 직접 조회하여 DataFrame 생성 비용 제거
+- 결과는 튜플 또는 __slots__ 데이터클래스로 반환
+- 단건 갱신용 execute() (로그인 시 비밀번호 재해시 등)
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+from config.configdb import ROLE_PRIMARY, get_db_connection
+from utils.metrics import record_db_query
+from utils.query_monitor import record_query
+
+
+@dataclass
+class ManagerRow:
+    """tblmanager 인증 조회 결과"""
+    __slots__ = ('admin_id', 'passwd', 'user_status')
+    admin_id: str
+    passwd: Optional[str]
+    user_status: Any
+
+
+@dataclass
+class HotelRow:
+    """product 단건 조회 결과"""
+    __slots__ = ('idx', 'product_code', 'name_kr')
+    idx: int
+    product_code: Optional[str]
+    name_kr: Optional[str]
+
+
+@dataclass
+class HotelSearchRow:
+    """숙소 검색 결과"""
+    __slots__ = ('idx', 'product_code', 'name_kr', 'has_recent_booking')
+    idx: int
+    product_code: Optional[str]
+    name_kr: Optional[str]
+    has_recent_booking: int
+
+
+def fetch_all(query: str, params: Sequence = None, row_type=None,
+              query_name: str = 'query', engine=None, role: str = ROLE_PRIMARY) -> List:
+    """
+    쿼리 결과 전체 조회
+    
+    Args:
+        query: SQL 문자열 (DBAPI 파라미터 형식, pymysql은 %s)
+        params: 바인딩 파라미터 (선택사항)
+        row_type: 행 변환 타입 (None이면 튜플 그대로 반환, 예: HotelRow)
+        query_name: 쿼리 유형 이름 (메트릭/슬로우 쿼리 로그용)
+        engine: SQLAlchemy 엔진 (없으면 get_db_connection(role))
+        role: 엔진 역할 (ROLE_PRIMARY, ROLE_REPORTING)
+    
+    Returns:
+        list: 튜플 또는 row_type 인스턴스 리스트
+    """
+    if engine is None:
+        engine = get_db_connection(role)
+    
+    started = time.perf_counter()
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    except Exception:
+        record_db_query(query_name, time.perf_counter() - started, status='error')
+        raise
+    finally:
+        # 풀로 반환
+        conn.close()
+    elapsed = time.perf_counter() - started
+    
+    record_db_query(query_name, elapsed, len(rows))
+    record_query(query_name, query, params, elapsed, len(rows), engine=engine)
+    
+    if row_type is None:
+        return list(rows)
+    return [row_type(*row) for row in rows]
+
+
+def fetch_one(query: str, params: Sequence = None, row_type=None,
+              query_name: str = 'query', engine=None, role: str = ROLE_PRIMARY):
+    """
+    쿼리 결과 첫 행 조회
+    
+    Returns:
+        튜플 또는 row_type 인스턴스 (결과가 없으면 None)
+    """
+    rows = fetch_all(query, params, row_type=row_type, query_name=query_name, engine=engine, role=role)
+    return rows[0] if rows else None
+
+
+def execute(query: str, params: Sequence = None, query_name: str = 'execute', engine=None) -> int:
+    """
+    INSERT/UPDATE/DELETE 실행 후 커밋
+    
+    Returns:
+        int: 영향받은 행 수
+    """
+    if engine is None:
+        engine = get_db_connection()
+    
+    started = time.perf_counter()
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params)
+            rowcount = cursor.rowcount
+        finally:
+            cursor.close()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        record_db_query(query_name, time.perf_counter() - started, status='error')
+        raise
+    finally:
+        conn.close()
+    
+    record_db_query(query_name, time.perf_counter() - started)
+    return rowcount
@@ -0,0 +1,196 @@
+# utils/duckdb_engine.py
+"""오프라인 분석 엔진 (DuckDB + Parquet 스냅샷)
+- 통계 원본 테이블(order_product/order_item/order_pay/product/common_code)을 Parquet 스냅샷으로 내려받아
+  DuckDB로 같은 통계 쿼리를 실행 (운영 MySQL에 부하 없음, 기간이 긴 전체 숙소 조회에 유리)
+- 스냅샷 생성은 tools/export_parquet_snapshot.py, 조회 사용 여부는 .env의 HOTEL_STATS_ENGINE=duckdb
+- 스냅샷은 HOTEL_STATS_PARQUET_DIR 아래 snapshot-YYYYmmdd-HHMMSS 디렉토리로 저장하고
+  CURRENT 파일(manifest JSON)이 가리키는 스냅샷을 조회 (교체 중에도 테이블 간 시점이 어긋나지 않음)
+- 스냅샷이 조회 기간을 포함하지 않으면(생성일 이후, 부분 스냅샷 시작일 이전) MySQL로 조회
+- duckdb 패키지는 선택 설치 (없으면 MySQL로 조회)
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+from utils.logger import log_app, log_error
+from utils.metrics import record_db_query
+
+# 스냅샷 대상 테이블과 컬럼 (통계/요약 쿼리에서 사용하는 컬럼만)
+SNAPSHOT_TABLES = {
+    'order_product': ('idx', 'order_num', 'product_idx', 'order_channel_idx', 'order_type',
+                      'order_product_status', 'checkin_date', 'create_date', 'room_cnt', 'terms',
+                      'order_pay_idx'),
+    'order_item': ('order_product_idx', 'due_price'),
+    'order_pay': ('idx', 'total_amount'),
+    'product': ('idx', 'name_kr', 'product_code'),
+    'common_code': ('idx', 'code_id', 'parent_idx', 'code_name'),
+}
+
+# 현재 스냅샷을 가리키는 파일 (manifest JSON)
+CURRENT_FILE = 'CURRENT'
+SNAPSHOT_PREFIX = 'snapshot-'
+
+# DuckDB 연결 (프로세스당 1개, 쿼리는 cursor()로 스레드별 실행)
+_connection = None
+_loaded_snapshot = None
+_connection_lock = threading.Lock()
+
+# duckdb 미설치 경고는 1회만 기록
+_import_warned = False
+
+
+def is_duckdb_enabled() -> bool:
+    """통계 조회 엔진이 DuckDB인지 - .env의 HOTEL_STATS_ENGINE (mysql/duckdb, 기본값: mysql)"""
+    return os.getenv('HOTEL_STATS_ENGINE', 'mysql').strip().lower() == 'duckdb'
+
+
+def get_snapshot_dir() -> str:
+    """스냅샷 기본 디렉토리 - .env의 HOTEL_STATS_PARQUET_DIR (기본값: 프로젝트 루트/data/parquet)"""
+    directory = os.getenv('HOTEL_STATS_PARQUET_DIR', '').strip()
+    if directory:
+        return directory
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_root, 'data', 'parquet')
+
+
+def read_manifest(base_dir: str = None):
+    """
+    현재 스냅샷 정보
+    
+    Returns:
+        dict: {'snapshot', 'exported_at', 'covers_from', 'covers_until', 'rows'} 또는 None (스냅샷 없음)
+    """
+    path = os.path.join(base_dir or get_snapshot_dir(), CURRENT_FILE)
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log_error("WARNING", "Parquet 스냅샷 정보 읽기 실패", exception=e, path=path)
+        return None
+
+
+def write_manifest(manifest: dict, base_dir: str = None):
+    """현재 스냅샷 교체 (임시 파일에 쓴 뒤 rename - 조회 중인 프로세스가 쓰다 만 파일을 읽지 않도록)"""
+    base_dir = base_dir or get_snapshot_dir()
+    path = os.path.join(base_dir, CURRENT_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def _import_duckdb():
+    """duckdb 모듈 (미설치 시 None)"""
+    global _import_warned
+    
+    try:
+        import duckdb
+        return duckdb
+    except ImportError as e:
+        if not _import_warned:
+            _import_warned = True
+            log_error("WARNING", "duckdb 미설치 - 통계는 MySQL에서 조회 (pip install duckdb)", exception=e)
+        return None
+
+
+def snapshot_covers(start_date, end_date) -> bool:
+    """
+    DuckDB로 조회할 수 있는 기간인지 (HOTEL_STATS_ENGINE=duckdb, duckdb 설치, 스냅샷이 기간을 포함)
+    
+    Args:
+        start_date: 시작일
+        end_date: 종료일
+    
+    Returns:
+        bool: True면 DuckDB로 조회
+    """
+    if not is_duckdb_enabled():
+        return False
+    
+    manifest = read_manifest()
+    if manifest is None or _import_duckdb() is None:
+        return False
+    
+    # 스냅샷 생성일 당일은 마감 전이므로 전날까지만 포함
+    start, end = str(start_date)[:10], str(end_date)[:10]
+    if end > manifest['covers_until']:
+        return False
+    if manifest.get('covers_from') and start < manifest['covers_from']:
+        return False
+    return True
+
+
+def _create_views(connection, snapshot_path: str):
+    """스냅샷의 테이블별 Parquet 파일을 같은 이름의 뷰로 등록 (통계 쿼리를 그대로 실행)"""
+    for table in SNAPSHOT_TABLES:
+        pattern = os.path.join(snapshot_path, table, '*.parquet').replace("'", "''")
+        connection.execute(f"CREATE OR REPLACE VIEW {table} AS SELECT * FROM read_parquet('{pattern}')")
+
+
+def get_connection():
+    """
+    현재 스냅샷을 뷰로 등록한 DuckDB 연결 (스냅샷이 교체되면 뷰 재등록)
+    
+    Returns:
+        duckdb.DuckDBPyConnection
+    """
+    global _connection, _loaded_snapshot
+    
+    duckdb = _import_duckdb()
+    if duckdb is None:
+        raise RuntimeError("duckdb 패키지가 설치되어 있지 않습니다.")
+    
+    manifest = read_manifest()
+    if manifest is None:
+        raise RuntimeError(f"Parquet 스냅샷이 없습니다: {get_snapshot_dir()}")
+    
+    with _connection_lock:
+        if _connection is None:
+            _connection = duckdb.connect(database=':memory:')
+        if _loaded_snapshot != manifest['snapshot']:
+            _create_views(_connection, os.path.join(get_snapshot_dir(), manifest['snapshot']))
+            _loaded_snapshot = manifest['snapshot']
+            log_app("INFO", "DuckDB 스냅샷 등록", snapshot=manifest['snapshot'],
+                    covers_until=manifest['covers_until'])
+        return _connection
+
+
+def read_sql_duckdb(query: str, query_name: str = 'query'):
+    """
+    DuckDB에서 쿼리 실행 (read_sql_monitored와 같은 메트릭/슬로우 쿼리 기록)
+    
+    Args:
+        query: SQL 문자열 (dialect='duckdb'로 생성)
+        query_name: 쿼리 유형 이름
+    
+    Returns:
+        pandas DataFrame
+    """
+    from utils.query_monitor import record_query
+    
+    started = time.perf_counter()
+    try:
+        # cursor()는 같은 DB를 공유하는 스레드별 연결 (동시 세션 조회 가능)
+        cursor = get_connection().cursor()
+        try:
+            df = cursor.execute(query).df()
+        finally:
+            cursor.close()
+    except Exception:
+        record_db_query(query_name, time.perf_counter() - started, status='error')
+        raise
+    elapsed = time.perf_counter() - started
+    
+    record_db_query(query_name, elapsed, len(df))
+    record_query(query_name, query, None, elapsed, len(df))
+    return df
+
+
+def last_closed_day(exported_at) -> date:
+    """스냅샷에 온전히 포함된 마지막 날 (생성일 전날)"""
+    return exported_at.date() - timedelta(days=1)
@@ -2,13 +2,46 @@
 """숙소별 엑셀 파일 생성 및 다운로드 처리
 - 날짜별 + 숙소별 + 채널별 집계
 - order_item.due_price 사용 (입금가)
+- 주/월/기간 전체 단위 결과는 날짜 컬럼을 단위에 맞게 표시
 """
 
 import pandas as pd
 from io import BytesIO
 from datetime import datetime
 
-def create_hotel_excel_file(df, summary_stats=None, sheet_name='구매일', date_type='orderDate'):
+from utils.query_builder_hotel import GRANULARITIES
+
+def get_date_column_name(date_type='orderDate', granularity='day'):
+    """결과 날짜 컬럼 표시 이름 (일 단위는 기존 이름, 그 외는 단위 + 날짜유형)"""
+    base = '구매일' if date_type == 'orderDate' else '이용일'
+    if granularity == 'week':
+        return f'주 시작일({base})'
+    if granularity == 'month':
+        return f'월({base})'
+    if granularity == 'period':
+        return f'기간({base})'
+    return '구매일(예약일)' if date_type == 'orderDate' else '이용일(체크인)'
+
+def format_booking_dates(values, granularity='day', end_date=None):
+    """
+    결과 날짜(단위 시작일) 표시 문자열
+    
+    Args:
+        values: booking_date 컬럼
+        granularity: 집계 단위
+        end_date: 조회 종료일 (기간 전체 단위에서 '시작일 ~ 종료일'로 표시)
+    
+    Returns:
+        pandas Series
+    """
+    dates = pd.to_datetime(values)
+    if granularity == 'month':
+        return dates.dt.strftime('%Y-%m')
+    if granularity == 'period' and end_date:
+        return dates.dt.strftime('%Y-%m-%d') + f" ~ {end_date}"
+    return dates.dt.strftime('%Y-%m-%d')
+
+def create_hotel_excel_file(df, summary_stats=None, sheet_name='구매일', date_type='orderDate', granularity='day'):
     """
     숙소별 DataFrame을 엑셀 파일로 변환
     
@@ -17,6 +50,7 @@ def create_hotel_excel_file(df, summary_stats=None, sheet_name='구매일', date
         summary_stats: dict (요약 통계 정보, 선택사항)
         sheet_name: str (시트 이름 - '구매일' 또는 '이용일')
         date_type: str (날짜유형 - 'orderDate' 또는 'useDate')
+        granularity: str (집계 단위 - 'day', 'week', 'month', 'period')
     
     Returns:
         BytesIO: 엑셀 파일 바이너리 데이터
@@ -41,6 +75,9 @@ def create_hotel_excel_file(df, summary_stats=None, sheet_name='구매일', date
             }, {
                 '항목': '날짜유형',
                 '값': summary_stats.get('date_type', '구매일')
+            }, {
+                '항목': '집계 단위',
+                '값': GRANULARITIES.get(granularity, granularity)
             }, {
                 '항목': '생성 일시',
                 '값': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -53,7 +90,7 @@ def create_hotel_excel_file(df, summary_stats=None, sheet_name='구매일', date
             export_df = df.copy()
             
             # 날짜 컬럼명 결정
-            date_col_name = '구매일(예약일)' if date_type == 'orderDate' else '이용일(체크인)'
+            date_col_name = get_date_column_name(date_type, granularity)
             
             # 컬럼명 한글화 및 순서 정리
             column_mapping = {
@@ -100,7 +137,9 @@ def create_hotel_excel_file(df, summary_stats=None, sheet_name='구매일', date
             
             # 날짜 포맷팅
             if date_col_name in export_df.columns:
-                export_df[date_col_name] = pd.to_datetime(export_df[date_col_name]).dt.strftime('%Y-%m-%d')
+                export_df[date_col_name] = format_booking_dates(
+                    export_df[date_col_name], granularity, (summary_stats or {}).get('end_date')
+                )
             
             # 숫자 포맷팅 (천단위 구분, 숫자만 표시)
             numeric_cols = ['예약건수', '총객실수', '확정객실수', '취소객실수', '총 입금가', '총 실구매가', '총 수익']
@@ -140,7 +179,7 @@ def create_hotel_excel_file(df, summary_stats=None, sheet_name='구매일', date
     output.seek(0)
     return output
 
-def create_hotel_excel_download(df, summary_stats=None, filename=None, date_type='orderDate'):
+def create_hotel_excel_download(df, summary_stats=None, filename=None, date_type='orderDate', granularity='day'):
     """
     Streamlit용 숙소별 엑셀 다운로드 파일 생성
     
@@ -149,6 +188,7 @@ def create_hotel_excel_download(df, summary_stats=None, filename=None, date_type
         summary_stats: dict (요약 통계)
         filename: str (파일명, 없으면 자동 생성)
         date_type: str (날짜유형 - 'orderDate' 또는 'useDate')
+        granularity: str (집계 단위 - 'day', 'week', 'month', 'period')
     
     Returns:
         tuple: (파일 바이너리, 파일명)
@@ -163,7 +203,7 @@ def create_hotel_excel_download(df, summary_stats=None, filename=None, date_type
         time_str = now.strftime('%H%M%S')
         filename = f'숙소별_예약통계_{date_str}_{time_str}.xlsx'
     
-    excel_file = create_hotel_excel_file(df, summary_stats, sheet_name, date_type)
+    excel_file = create_hotel_excel_file(df, summary_stats, sheet_name, date_type, granularity)
     
     return excel_file.getvalue(), filename
 
@@ -5,13 +5,8 @@
 - 성능 최적화: 검색 범위 제한
 """
 
-import sys
-import os
-# 프로젝트 루트 디렉토리를 path에 추가
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-import pandas as pd
-from config.configdb import get_db_connection
+from config.configdb import ROLE_REPORTING
+from utils.db_access import fetch_all, fetch_one, HotelRow, HotelSearchRow
 
 
 def search_hotels(search_term, limit=15):
@@ -39,8 +34,6 @@ def search_hotels(search_term, limit=15):
         return []
     
     try:
-        engine = get_db_connection()
-        
         # 검색어 정리 (공백 제거)
         search_term_clean = search_term.strip()
         search_term_no_space = search_term_clean.replace(' ', '')
@@ -85,27 +78,25 @@ def search_hotels(search_term, limit=15):
         search_pattern = f'%{search_term_clean}%'
         search_pattern_no_space = f'%{search_term_no_space}%'
         
-        # 쿼리 실행 (params는 튜플로 전달)
-        df = pd.read_sql(
-            query, 
-            engine,
-            params=(search_pattern, search_pattern, search_pattern_no_space, limit)
+        # 쿼리 실행 (params는 튜플로 전달, 최대 15행이므로 DataFrame 없이 조회)
+        rows = fetch_all(
+            query,
+            (search_pattern, search_pattern, search_pattern_no_space, limit),
+            row_type=HotelSearchRow,
+            query_name='search_hotels',
+            role=ROLE_REPORTING  # 180일 예약 집계 서브쿼리 포함 - 리포팅 복제본에서 실행
         )
         
         # 결과를 딕셔너리 리스트로 변환
-        if df.empty:
-            return []
-        
-        results = []
-        for _, row in df.iterrows():
-            results.append({
-                'idx': int(row['idx']),
-                'product_code': str(row['product_code']) if pd.notna(row['product_code']) else '',
-                'name_kr': str(row['name_kr']) if pd.notna(row['name_kr']) else '',
-                'has_recent_booking': int(row['has_recent_booking'])
-            })
-        
-        return results
+        return [
+            {
+                'idx': int(row.idx),
+                'product_code': str(row.product_code) if row.product_code is not None else '',
+                'name_kr': str(row.name_kr) if row.name_kr is not None else '',
+                'has_recent_booking': int(row.has_recent_booking)
+            }
+            for row in rows
+        ]
         
     except Exception as e:
         print(f"❌ 숙소 검색 오류: {e}")
@@ -130,8 +121,6 @@ def get_hotel_by_id(hotel_id):
         }
     """
     try:
-        engine = get_db_connection()
-        
         query = """
         SELECT 
             idx,
@@ -142,16 +131,15 @@ def get_hotel_by_id(hotel_id):
         LIMIT 1
         """
         
-        df = pd.read_sql(query, engine, params=(hotel_id,))
+        row = fetch_one(query, (hotel_id,), row_type=HotelRow, query_name='get_hotel_by_id')
         
-        if df.empty:
+        if row is None:
             return None
         
-        row = df.iloc[0]
         return {
-            'idx': int(row['idx']),
-            'product_code': str(row['product_code']) if pd.notna(row['product_code']) else '',
-            'name_kr': str(row['name_kr']) if pd.notna(row['name_kr']) else ''
+            'idx': int(row.idx),
+            'product_code': str(row.product_code) if row.product_code is not None else '',
+            'name_kr': str(row.name_kr) if row.name_kr is not None else ''
         }
         
     except Exception as e:
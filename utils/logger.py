@@ -1,12 +1,28 @@
 # utils/logger.py
-"""로깅 모듈 - 타입별 로그 파일 분리 및 관리"""
+"""로깅 모듈 - 타입별 로그 파일 분리 및 관리
+- 큐 기반 비동기 로깅 (QueueHandler → 백그라운드 쓰기 스레드 1개)
+- 메시지 포맷팅/파일 쓰기는 백그라운드 스레드에서 배치 단위로 처리
+- 레벨 체크를 메시지 포맷팅보다 먼저 수행 (비활성 레벨은 비용 없음)
+- 출력 형식: text (기본, key=value) 또는 json (JSON Lines, LOG_OUTPUT_FORMAT=json)
+- 고빈도 이벤트 샘플링 (LOG_SAMPLE_RATES)
+- 다중 프로세스 운영 시 프로세스별 로그 파일 (LOG_PER_PROCESS=true)
+"""
 
+import atexit
+import json
 import logging
 import os
-from datetime import datetime, timedelta
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+from utils import metrics
+
 # 로그 디렉토리 설정
 _log_dir = Path(__file__).parent.parent / "logs"
 _log_dir.mkdir(exist_ok=True)
@@ -15,8 +31,35 @@ _log_dir.mkdir(exist_ok=True)
 LOG_FORMAT = "[%(asctime)s] [%(levelname)-8s] [%(category)s] %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# 로그 타입별 설정: log_type -> (파일명, 카테고리)
+LOG_TYPES = {
+    'auth': ('auth.log', 'AUTH'),
+    'error': ('error.log', 'ERROR'),
+    'access': ('access.log', 'ACCESS'),
+    'slow': ('slow.log', 'SLOW'),
+    'app': ('app.log', 'APP'),
+}
+
+# 배치당 최대 레코드 수 (한 번의 write/flush로 처리)
+LOG_BATCH_SIZE = 256
+
+# 로그 보관 기간 및 정리 주기
+LOG_RETENTION_DAYS = 30
+LOG_SWEEP_INTERVAL_SECONDS = 24 * 3600  # 하루 1회 (여러 프로세스 중 1개만 수행)
+_sweep_marker = _log_dir / ".last_sweep"
+_sweep_started = False  # setup_logging이 리런마다 호출되므로 프로세스당 1회만 시작 (이후 타이머로 매일 반복)
+_sweep_lock = threading.Lock()
+
+# 프로세스별 로그 파일명 (예: access.12345.log) - 로테이션 파일(*.log.N)은 제외
+_PID_LOG_PATTERN = re.compile(r'^.+\.(\d+)\.log$')
+
 # 로거 딕셔너리
 _loggers = {}
+_loggers_lock = threading.Lock()
+
+# 비동기 로깅 큐 및 백그라운드 리스너
+_log_queue = queue.Queue(-1)
+_listener = None
 
 # 로그 레벨 매핑
 LOG_LEVELS = {
@@ -27,167 +70,586 @@ LOG_LEVELS = {
     'CRITICAL': logging.CRITICAL
 }
 
+# 텍스트 로그에서 표시할 필드명 (기존 로그 형식 유지)
+_TEXT_FIELD_NAMES = {
+    'ip': 'IP'
+}
+
+# JSON 로그의 기본 키 (추가 정보 필드가 덮어쓰지 않도록 보호)
+_JSON_RESERVED_KEYS = ('ts', 'level', 'category', 'source', 'message', 'exception')
+
+# 이벤트별 샘플링 비율 캐시 (LOG_SAMPLE_RATES 파싱 결과)
+_sample_rates = None
+
 
 class CategoryFilter(logging.Filter):
-    """로그 카테고리 필터"""
-    def __init__(self, category):
+    """로그 카테고리 필터 (해당 로거의 레코드만 통과)"""
+    def __init__(self, category, logger_name=None):
         super().__init__()
         self.category = category
+        self.logger_name = logger_name
     
     def filter(self, record):
-        record.category = self.category
+        if self.logger_name and record.name != self.logger_name:
+            return False
         return True
 
 
-def _setup_logger(name: str, filename: str, category: str, level: int = logging.INFO):
-    """로거 설정"""
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
+def _get_log_level() -> int:
+    """기본 로그 레벨 - .env의 LOG_LEVEL (기본값: INFO)"""
+    return LOG_LEVELS.get(os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO)
+
+
+def _get_output_format() -> str:
+    """로그 출력 형식 - .env의 LOG_OUTPUT_FORMAT ('text' 또는 'json', 기본값: text)"""
+    output_format = os.getenv('LOG_OUTPUT_FORMAT', 'text').strip().lower()
+    return output_format if output_format in ('text', 'json') else 'text'
+
+
+def _get_sample_rates() -> dict:
+    """
+    이벤트별 샘플링 비율 - .env의 LOG_SAMPLE_RATES
     
-    # 중복 핸들러 방지
-    if logger.handlers:
-        return logger
+    형식: '{log_type}.{이벤트}=비율' 또는 '{log_type}=비율'을 쉼표로 구분
+    이벤트는 action 값 또는 로그 레벨 (예: 'auth.DEBUG=0.01,access.search_hotels=0.1')
+    """
+    global _sample_rates
+    
+    if _sample_rates is not None:
+        return _sample_rates
+    
+    rates = {}
+    for item in os.getenv('LOG_SAMPLE_RATES', '').split(','):
+        if '=' not in item:
+            continue
+        key, value = item.split('=', 1)
+        try:
+            rates[key.strip()] = min(max(float(value), 0.0), 1.0)
+        except ValueError:
+            continue
+    
+    _sample_rates = rates
+    return _sample_rates
+
+
+def _get_sample_rate(log_type: str, level: str, event: str = None) -> float:
+    """이벤트의 샘플링 비율 조회 (이벤트 → 레벨 → 로그 타입 순, 설정이 없으면 1.0)"""
+    rates = _get_sample_rates()
+    if not rates:
+        return 1.0
+    if event and f"{log_type}.{event}" in rates:
+        return rates[f"{log_type}.{event}"]
+    if f"{log_type}.{level.upper()}" in rates:
+        return rates[f"{log_type}.{level.upper()}"]
+    return rates.get(log_type, 1.0)
+
+
+def _is_per_process() -> bool:
+    """
+    프로세스별 로그 파일 사용 여부 - .env의 LOG_PER_PROCESS
+    여러 Streamlit 프로세스가 같은 파일을 로테이션하면 기록이 유실되므로
+    다중 프로세스 운영 시에는 true로 설정 (예: access.12345.log)
+    """
+    return os.getenv('LOG_PER_PROCESS', 'false').strip().lower() in ('1', 'true', 'yes')
+
+
+def _get_log_filename(log_type: str) -> str:
+    """로그 타입별 파일명 (프로세스별 모드에서는 PID 포함)"""
+    filename = LOG_TYPES[log_type][0]
+    if _is_per_process():
+        stem, ext = os.path.splitext(filename)
+        filename = f"{stem}.{os.getpid()}{ext}"
+    return filename
+
+
+def _format_fields(fields) -> str:
+    """추가 정보 딕셔너리를 'key=value, ...' 문자열로 변환"""
+    return ', '.join(f"{_TEXT_FIELD_NAMES.get(key, key)}={value}" for key, value in fields.items())
+
+
+class _TextFormatter(logging.Formatter):
+    """
+    텍스트 로그 포맷터 (백그라운드 스레드에서 실행)
+    
+    호출 스레드에서는 메시지와 추가 정보 딕셔너리만 전달하고,
+    'message: key=value, ...' 문자열 조합은 여기서 수행
+    """
+    def __init__(self, category, is_app_log=False):
+        super().__init__(LOG_FORMAT, DATE_FORMAT)
+        self.category = category
+        self.is_app_log = is_app_log
+    
+    def build_message(self, record) -> str:
+        message = record.getMessage()
+        
+        fields = getattr(record, 'fields', None)
+        if self.is_app_log and getattr(record, 'app_fields', None) is not None:
+            # 전체 로그에는 요약 필드만 기록 (예: 슬로우 쿼리의 SQL 전문 제외)
+            fields = record.app_fields
+        if fields:
+            message += f": {_format_fields(fields)}"
+        
+        exception_text = getattr(record, 'exception_text', None)
+        if exception_text:
+            message += f" | Exception: {exception_text}"
+        
+        # 전체 로그에는 원본 카테고리를 접두어로 표시 (예: [AUTH] ...)
+        if self.is_app_log and record.name != 'app':
+            message = f"[{LOG_TYPES.get(record.name, ('', record.name.upper()))[1]}] {message}"
+        
+        return message
+    
+    def format(self, record):
+        record.category = self.category
+        record.message = self.build_message(record)
+        record.asctime = self.formatTime(record, self.datefmt)
+        return self.formatMessage(record)
+
+
+class _JsonFormatter(logging.Formatter):
+    """
+    JSON Lines 로그 포맷터 (백그라운드 스레드에서 실행)
+    
+    추가 정보 필드는 원래 타입(int, float, list 등)을 유지한 채 최상위 키로 기록
+    """
+    def __init__(self, category, is_app_log=False):
+        super().__init__(None, DATE_FORMAT)
+        self.category = category
+        self.is_app_log = is_app_log
+    
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'category': self.category,
+        }
+        # 전체 로그에는 원본 카테고리를 함께 기록
+        if self.is_app_log and record.name != 'app':
+            entry['source'] = LOG_TYPES.get(record.name, ('', record.name.upper()))[1]
+        entry['message'] = record.getMessage()
+        
+        fields = getattr(record, 'fields', None)
+        if self.is_app_log and getattr(record, 'app_fields', None) is not None:
+            fields = record.app_fields
+        if fields:
+            for key, value in fields.items():
+                entry[f"field_{key}" if key in _JSON_RESERVED_KEYS else key] = value
+        
+        exception_text = getattr(record, 'exception_text', None)
+        if exception_text:
+            entry['exception'] = exception_text
+        
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _BatchRotatingFileHandler(RotatingFileHandler):
+    """배치 단위로 한 번에 쓰고 flush하는 RotatingFileHandler"""
+    
+    def emit_batch(self, records):
+        lines = []
+        for record in records:
+            if record.levelno < self.level or not self.filter(record):
+                continue
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        
+        if not lines:
+            return
+        
+        data = ''.join(lines)
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            # 배치 전체 크기 기준으로 로테이션 판단
+            if self.maxBytes > 0:
+                self.stream.seek(0, 2)
+                if self.stream.tell() + len(data.encode(self.encoding or 'utf-8')) >= self.maxBytes:
+                    self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+            self.stream.write(data)
+            self.stream.flush()
+        except Exception:
+            self.handleError(records[-1])
+        finally:
+            self.release()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    레코드를 포맷팅하지 않고 그대로 큐에 넣는 핸들러
+    (같은 프로세스 안의 큐이므로 pickle 대비 전처리가 필요 없음)
+    """
+    def prepare(self, record):
+        return record
+
+
+class _BatchingQueueListener(QueueListener):
+    """큐에 쌓인 레코드를 모아 배치로 처리하는 리스너 (쓰기 스레드 1개)"""
     
-    # 파일 핸들러 (일별 로테이션)
-    log_file = _log_dir / filename
-    file_handler = RotatingFileHandler(
+    def __init__(self, log_queue, *handlers, batch_size=LOG_BATCH_SIZE):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+    
+    def _write_batch(self, batch):
+        for handler in self.handlers:
+            handler.emit_batch(batch)
+    
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, 'task_done')
+        stop = False
+        while not stop:
+            record = self.dequeue(True)
+            batch = []
+            if record is self._sentinel:
+                stop = True
+            else:
+                batch.append(record)
+            
+            # 대기 중인 레코드를 최대 batch_size까지 모음
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    record = self.dequeue(False)
+                except queue.Empty:
+                    break
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    batch.append(record)
+            
+            if batch:
+                self._write_batch(batch)
+            
+            if has_task_done:
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    q.task_done()
+
+
+def _create_file_handler(log_type: str):
+    """로그 타입별 파일 핸들러 생성 (백그라운드 리스너에서 사용)"""
+    category = LOG_TYPES[log_type][1]
+    log_file = _log_dir / _get_log_filename(log_type)
+    file_handler = _BatchRotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=30,  # 30일 보관
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True
     )
-    file_handler.setLevel(level)
-    file_handler.addFilter(CategoryFilter(category))
+    file_handler.setLevel(logging.DEBUG)
+    
+    formatter_class = _JsonFormatter if _get_output_format() == 'json' else _TextFormatter
+    
+    # 전체 로그(app.log)는 모든 타입의 레코드를 함께 기록
+    if log_type == 'app':
+        file_handler.addFilter(lambda record: getattr(record, 'mirror_to_app', True))
+        file_handler.setFormatter(formatter_class(category, is_app_log=True))
+    else:
+        file_handler.addFilter(CategoryFilter(category, logger_name=log_type))
+        file_handler.setFormatter(formatter_class(category))
+    
+    return file_handler
+
+
+def _start_listener():
+    """백그라운드 쓰기 스레드 시작 (프로세스당 1회)"""
+    global _listener
+    
+    if _listener is not None:
+        return _listener
+    
+    handlers = [_create_file_handler(log_type) for log_type in LOG_TYPES]
+    _listener = _BatchingQueueListener(_log_queue, *handlers)
+    _listener.start()
+    atexit.register(_stop_listener)
+    return _listener
+
+
+def _stop_listener():
+    """남은 로그를 모두 기록하고 쓰기 스레드 종료"""
+    global _listener
+    
+    if _listener is None:
+        return
+    
+    try:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    except Exception:
+        pass
+    _listener = None
+
+
+def _setup_logger(name: str, category: str, level: int = logging.INFO):
+    """로거 설정 (큐 핸들러만 연결, 실제 파일 쓰기는 리스너 담당)"""
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.propagate = False
     
-    formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-    file_handler.setFormatter(formatter)
+    # 중복 핸들러 방지
+    if logger.handlers:
+        return logger
     
-    logger.addHandler(file_handler)
+    queue_handler = _DeferredQueueHandler(_log_queue)
+    queue_handler.setLevel(level)
+    logger.addHandler(queue_handler)
     
     return logger
 
 
 def _get_logger(log_type: str):
     """로거 가져오기"""
-    if log_type not in _loggers:
-        if log_type == 'auth':
-            _loggers[log_type] = _setup_logger('auth', 'auth.log', 'AUTH')
-        elif log_type == 'error':
-            _loggers[log_type] = _setup_logger('error', 'error.log', 'ERROR')
-        elif log_type == 'access':
-            _loggers[log_type] = _setup_logger('access', 'access.log', 'ACCESS')
-        elif log_type == 'app':
-            _loggers[log_type] = _setup_logger('app', 'app.log', 'APP')
-        else:
-            _loggers[log_type] = _setup_logger('app', 'app.log', 'APP')
+    logger = _loggers.get(log_type)
+    if logger is not None:
+        return logger
+    
+    with _loggers_lock:
+        if log_type not in _loggers:
+            _start_listener()
+            if log_type not in LOG_TYPES:
+                log_type_key = 'app'
+            else:
+                log_type_key = log_type
+            _loggers[log_type] = _setup_logger(log_type_key, LOG_TYPES[log_type_key][1],
+                                               level=_get_log_level())
     
     return _loggers[log_type]
 
 
-def _clean_old_logs(days: int = 30):
-    """오래된 로그 파일 삭제"""
+def _sample(log_type: str, level: str, event: str = None):
+    """
+    샘플링 판정 (메시지 포맷팅 전에 호출)
+    
+    Returns:
+        float: 기록할 경우 적용된 샘플링 비율 (설정이 없으면 1.0)
+        None: 샘플링으로 제외된 경우
+    """
+    rate = _get_sample_rate(log_type, level, event)
+    if rate < 1.0 and random.random() >= rate:
+        return None
+    return rate
+
+
+def is_log_enabled(log_type: str, level: str) -> bool:
+    """
+    해당 레벨의 로그가 기록되는지 확인
+    (디버깅 정보 딕셔너리 생성 등 비용이 큰 작업 전에 사용)
+    """
+    return _get_logger(log_type).isEnabledFor(LOG_LEVELS.get(level.upper(), logging.INFO))
+
+
+def _is_pid_alive(pid: int) -> bool:
+    """
+    해당 PID의 프로세스가 살아 있는지 확인
+    
+    판단할 수 없으면 살아 있는 것으로 간주 (로그를 지우지 않는 쪽이 안전)
+    """
+    if pid == os.getpid():
+        return True
+    if os.name == 'nt':
+        # Windows의 os.kill은 프로세스를 종료시키므로 OpenProcess로 확인
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+            if not handle:
+                return False
+            kernel32.CloseHandle(handle)
+        except Exception:
+            pass
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # PermissionError 등: 프로세스는 존재함
+        pass
+    return True
+
+
+def _clean_old_logs(days: int = LOG_RETENTION_DAYS, force: bool = False):
+    """
+    오래된 로그 파일 삭제
+    
+    - 로테이션된 파일(*.log.N)과 종료된 프로세스의 로그 파일(*.PID.log) 대상
+    - 살아 있는 프로세스의 *.PID.log는 오래 기록이 없어도(유휴 워커) 삭제하지 않음
+    - 정리 주기 마커 파일을 확인하여 하루 1회만 디렉토리를 훑음
+      (여러 프로세스가 동시에 시작해도 대부분 stat 1회로 끝남)
+    """
     try:
-        cutoff_date = datetime.now() - timedelta(days=days)
-        for log_file in _log_dir.glob("*.log.*"):  # 로테이션된 파일
+        now = time.time()
+        if not force:
             try:
-                file_time = datetime.fromtimestamp(log_file.stat().st_mtime)
-                if file_time < cutoff_date:
-                    log_file.unlink()
-            except Exception:
+                if now - _sweep_marker.stat().st_mtime < LOG_SWEEP_INTERVAL_SECONDS:
+                    return
+            except FileNotFoundError:
                 pass
+        # 다른 프로세스가 중복 수행하지 않도록 마커를 먼저 갱신
+        _sweep_marker.touch()
+        
+        active_files = {filename for filename, _ in LOG_TYPES.values()}
+        active_files.update(_get_log_filename(log_type) for log_type in LOG_TYPES)
+        cutoff = now - days * 24 * 3600
+        
+        with os.scandir(_log_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name in active_files or not ('.log.' in name or name.endswith('.log')):
+                    continue
+                try:
+                    if entry.stat().st_mtime >= cutoff:
+                        continue
+                    match = _PID_LOG_PATTERN.match(name)
+                    if match and _is_pid_alive(int(match.group(1))):
+                        continue
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
     except Exception:
         pass
 
 
 def log_auth(level: str, message: str, admin_id: str = None, ip: str = None, **kwargs):
     """인증 관련 로그"""
+    metrics.record_log_event('auth', level, kwargs.get('action'), kwargs)
     logger = _get_logger('auth')
     log_level = LOG_LEVELS.get(level.upper(), logging.INFO)
+    if not logger.isEnabledFor(log_level):
+        return
+    sample_rate = _sample('auth', level, kwargs.get('action'))
+    if sample_rate is None:
+        return
     
-    # 추가 정보 포맷팅
-    extra_info = []
+    # 추가 정보 (문자열 조합은 백그라운드 스레드에서 수행)
+    fields = {}
     if admin_id:
-        extra_info.append(f"admin_id={admin_id}")
+        fields['admin_id'] = admin_id
     if ip:
-        extra_info.append(f"IP={ip}")
+        fields['ip'] = ip
     for key, value in kwargs.items():
         if key not in ['admin_id', 'ip']:
-            extra_info.append(f"{key}={value}")
-    
-    full_message = message
-    if extra_info:
-        full_message += f": {', '.join(extra_info)}"
+            fields[key] = value
     
-    logger.log(log_level, full_message)
+    # 샘플링된 레코드는 분석 시 가중치로 쓸 수 있도록 비율 기록
+    if sample_rate < 1.0:
+        fields['sample_rate'] = sample_rate
     
-    # 전체 로그에도 기록
-    log_app(level, f"[AUTH] {full_message}")
+    logger.log(log_level, message, extra={'fields': fields})
 
 
 def log_error(level: str, message: str, exception: Exception = None, traceback_str: str = None, **kwargs):
     """에러 로그"""
+    metrics.record_log_event('error', level)
     logger = _get_logger('error')
     log_level = LOG_LEVELS.get(level.upper(), logging.ERROR)
+    if not logger.isEnabledFor(log_level):
+        return
     
-    full_message = message
-    if kwargs:
-        extra_info = [f"{key}={value}" for key, value in kwargs.items()]
-        full_message += f": {', '.join(extra_info)}"
+    # 예외 객체는 호출 스레드에서 문자열로 변환 (이후 상태 변경 방지)
+    exception_text = f"{type(exception).__name__}: {str(exception)}" if exception else None
     
-    if exception:
-        full_message += f" | Exception: {type(exception).__name__}: {str(exception)}"
-    
-    logger.log(log_level, full_message)
+    logger.log(log_level, message, extra={'fields': kwargs, 'exception_text': exception_text})
     
     if traceback_str:
-        logger.log(log_level, f"Traceback: {traceback_str}")
-    
-    # 전체 로그에도 기록
-    log_app(level, f"[ERROR] {full_message}")
+        logger.log(log_level, f"Traceback: {traceback_str}", extra={'mirror_to_app': False})
 
 
 def log_access(level: str, message: str, admin_id: str = None, action: str = None, **kwargs):
     """접근/활동 로그"""
+    metrics.record_log_event('access', level, action, kwargs)
     logger = _get_logger('access')
     log_level = LOG_LEVELS.get(level.upper(), logging.INFO)
+    if not logger.isEnabledFor(log_level):
+        return
+    sample_rate = _sample('access', level, action)
+    if sample_rate is None:
+        return
     
-    # 추가 정보 포맷팅
-    extra_info = []
+    # 추가 정보 (문자열 조합은 백그라운드 스레드에서 수행)
+    fields = {}
     if admin_id:
-        extra_info.append(f"admin_id={admin_id}")
+        fields['admin_id'] = admin_id
     if action:
-        extra_info.append(f"action={action}")
+        fields['action'] = action
     for key, value in kwargs.items():
         if key not in ['admin_id', 'action']:
-            extra_info.append(f"{key}={value}")
+            fields[key] = value
     
-    full_message = message
-    if extra_info:
-        full_message += f": {', '.join(extra_info)}"
+    # 샘플링된 레코드는 분석 시 가중치로 쓸 수 있도록 비율 기록
+    if sample_rate < 1.0:
+        fields['sample_rate'] = sample_rate
     
-    logger.log(log_level, full_message)
+    logger.log(log_level, message, extra={'fields': fields})
+
+
+def log_slow_query(level: str, message: str, query_name: str = None, explain: str = None, **kwargs):
+    """슬로우 쿼리 로그 (slow.log)"""
+    logger = _get_logger('slow')
+    log_level = LOG_LEVELS.get(level.upper(), logging.WARNING)
+    if not logger.isEnabledFor(log_level):
+        return
+    
+    fields = {}
+    if query_name:
+        fields['query'] = query_name
+    for key, value in kwargs.items():
+        if key not in ['query_name', 'explain']:
+            fields[key] = value
+    
+    # 전체 로그에는 요약만 기록 (SQL 전문 제외)
+    app_fields = {key: fields[key] for key in ['query', 'elapsed_sec', 'rows'] if key in fields}
     
-    # 전체 로그에도 기록
-    log_app(level, f"[ACCESS] {full_message}")
+    logger.log(log_level, message, extra={'fields': fields, 'app_fields': app_fields})
+    
+    # 실행 계획은 별도 라인으로 기록 (최초 발생 시에만 전달됨)
+    if explain:
+        logger.log(log_level, "EXPLAIN", extra={'fields': {'query': query_name, 'plan': explain},
+                                               'mirror_to_app': False})
 
 
 def log_app(level: str, message: str, **kwargs):
     """전체 로그"""
     logger = _get_logger('app')
     log_level = LOG_LEVELS.get(level.upper(), logging.INFO)
+    if not logger.isEnabledFor(log_level):
+        return
     
-    full_message = message
-    if kwargs:
-        extra_info = [f"{key}={value}" for key, value in kwargs.items()]
-        full_message += f": {', '.join(extra_info)}"
-    
-    logger.log(log_level, full_message)
+    logger.log(log_level, message, extra={'fields': kwargs})
+
+
+def flush_logs():
+    """큐에 쌓인 로그를 모두 파일에 기록 (종료 직전, 테스트 등에서 사용)"""
+    if _listener is not None:
+        _log_queue.join()
+
+
+def _run_sweep():
+    """로그 정리 후 다음 정리 예약 (장시간 실행되는 워커도 하루 1회 정리, 데몬 타이머)"""
+    try:
+        _clean_old_logs()
+    finally:
+        timer = threading.Timer(LOG_SWEEP_INTERVAL_SECONDS, _run_sweep)
+        timer.name = "log-retention-sweep"
+        timer.daemon = True
+        timer.start()
 
 
 def setup_logging():
-    """로깅 초기화"""
-    # 오래된 로그 정리
-    _clean_old_logs(days=30)
+    """로깅 초기화 (Streamlit 리런마다 호출되어도 프로세스당 1회만 수행)"""
+    global _sweep_started
+    with _sweep_lock:
+        if _sweep_started:
+            return
+        _sweep_started = True
+    
+    # 오래된 로그 정리 (시작을 지연시키지 않도록 백그라운드에서 수행, 이후 LOG_SWEEP_INTERVAL_SECONDS마다 반복)
+    threading.Thread(target=_run_sweep, name="log-retention-sweep", daemon=True).start()
     
     # 기본 로거 설정
     log_app("INFO", "로깅 시스템 초기화 완료")
@@ -200,5 +662,5 @@ if __name__ == "__main__":
     log_auth("INFO", "로그인 성공", admin_id="test_user")
     log_error("ERROR", "데이터베이스 연결 실패", exception=Exception("Connection timeout"))
     log_access("INFO", "데이터 조회", admin_id="test_user", action="fetch_data", 기간="2025-01-01~2025-01-07")
+    flush_logs()
     print("✅ 로깅 테스트 완료")
-
@@ -0,0 +1,384 @@
+# utils/metrics.py
+"""Prometheus 형식 메트릭 수집 및 HTTP 노출
+- 카운터/게이지/히스토그램 (외부 라이브러리 없이 표준 라이브러리만 사용)
+- 로그 호출(log_access/log_error)과 데이터 조회 계층에서 값 수집
+- METRICS_PORT 설정 시 Streamlit 프로세스 안에서 /metrics 엔드포인트 실행
+- 다중 워커 운영 시 워커마다 자기 포트에서 자기 값만 노출 (프로세스 간 합산은 Prometheus에서)
+  - METRICS_WORKER_INDEX 설정 시 METRICS_PORT + 인덱스
+  - 미설정 시 METRICS_PORT부터 METRICS_PORT_RANGE개 포트 중 비어 있는 첫 포트
+  - 스크레이프 대상은 METRICS_PORT ~ METRICS_PORT + METRICS_PORT_RANGE - 1 전체로 두고
+    sum(rate(...)) / histogram_quantile(0.95, sum by (le) (rate(..._bucket[5m])))처럼 워커를 합쳐 조회
+"""
+
+import os
+import threading
+
+# 기본 히스토그램 버킷 (초)
+DEFAULT_TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# 행 수 버킷
+ROW_BUCKETS = (0, 10, 100, 500, 1000, 5000, 10000, 50000, 100000)
+# 파일 크기 버킷 (바이트)
+SIZE_BUCKETS = (1024, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024)
+
+# 메트릭 레지스트리
+_registry = {}
+_registry_lock = threading.Lock()
+
+# 워커별 메트릭 포트 범위 기본값 (METRICS_PORT부터 시도할 포트 수)
+DEFAULT_PORT_RANGE = 8
+
+# HTTP 서버 (프로세스당 1개)
+# 시작 실패(포트 사용 중 등)도 기록하여 rerun마다 다시 바인드/경고하지 않음 (프로세스당 1회만 시도)
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def _escape_label(value) -> str:
+    """Prometheus 라벨 값 이스케이프"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, labelvalues, extra=None) -> str:
+    """라벨 문자열 생성 (예: {query="search_hotels",le="0.5"})"""
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.extend(f'{name}="{_escape_label(value)}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value) -> str:
+    """Prometheus 숫자 표현"""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """단조 증가 카운터"""
+    type_name = 'counter'
+    
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+    
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_number(value)}"
+
+
+class Gauge(Counter):
+    """현재 값 (증가/감소/설정 가능)"""
+    type_name = 'gauge'
+    
+    def set(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (p95 등은 Prometheus의 histogram_quantile로 계산)"""
+    type_name = 'histogram'
+    
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_TIME_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values = {}  # labelvalues -> [버킷별 건수, 합계, 건수]
+        self._lock = threading.Lock()
+    
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+    
+    def summary(self, **labels):
+        """(합계, 건수) 반환 (벤치마크 등에서 전후 차이 계산용)"""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            return (state[1], state[2]) if state else (0.0, 0)
+    
+    def render(self):
+        with self._lock:
+            items = sorted((key, [list(state[0]), state[1], state[2]]) for key, state in self._values.items())
+        for labelvalues, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, labelvalues, [('le', _format_number(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_number(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+def _register(metric):
+    """레지스트리에 메트릭 등록 (같은 이름이 있으면 기존 메트릭 반환)"""
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+
+def counter(name, documentation, labelnames=()):
+    """카운터 생성 또는 조회"""
+    return _register(Counter(name, documentation, labelnames))
+
+
+def gauge(name, documentation, labelnames=()):
+    """게이지 생성 또는 조회"""
+    return _register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_TIME_BUCKETS):
+    """히스토그램 생성 또는 조회"""
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def render_metrics() -> str:
+    """등록된 모든 메트릭을 Prometheus 텍스트 형식으로 변환"""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# ============================================
+# 서비스 메트릭 정의
+# ============================================
+
+LOG_EVENTS = counter(
+    'hotel_stats_log_events_total', "로그 이벤트 수 (카테고리/레벨별)", ['category', 'level'])
+ACTION_EVENTS = counter(
+    'hotel_stats_action_total', "사용자 작업 수 (조회, 검색, 엑셀 생성 등)", ['action'])
+ACTION_DURATION = histogram(
+    'hotel_stats_action_duration_seconds', "사용자 작업 소요 시간", ['action'])
+ACTION_ROWS = histogram(
+    'hotel_stats_action_rows', "사용자 작업 결과 행 수", ['action'], buckets=ROW_BUCKETS)
+EXCEL_SIZE = histogram(
+    'hotel_stats_excel_size_bytes', "생성된 엑셀 파일 크기", buckets=SIZE_BUCKETS)
+DB_QUERY_DURATION = histogram(
+    'hotel_stats_db_query_duration_seconds', "DB 쿼리 소요 시간 (쿼리 유형별)", ['query'])
+DB_QUERY_ROWS = counter(
+    'hotel_stats_db_rows_fetched_total', "DB 쿼리로 가져온 행 수 (쿼리 유형별)", ['query'])
+DB_ROUTE = counter(
+    'hotel_stats_db_route_total', "역할별 엔진 선택 결과 (요청 역할 -> 실제 사용 엔진)", ['role', 'target'])
+DB_REPLICA_LAG = gauge(
+    'hotel_stats_db_replica_lag_seconds', "리포팅 복제본 복제 지연 (복제 중단 시 -1)")
+DB_QUERIES = counter(
+    'hotel_stats_db_queries_total', "DB 쿼리 실행 수 (쿼리 유형/결과별)", ['query', 'status'])
+CACHE_REQUESTS = counter(
+    'hotel_stats_cache_requests_total', "캐시 조회 수 (hit/miss)", ['cache', 'result'])
+LOGIN_DURATION = histogram(
+    'hotel_stats_login_duration_seconds', "로그인 처리 시간 (bcrypt 검증 포함)", ['result'])
+PASSWORD_VERIFY_DURATION = histogram(
+    'hotel_stats_password_verify_seconds', "비밀번호 해시 검증 시간 (해시 유형별)", ['hash_type'])
+PASSWORD_VERIFY_QUEUE_WAIT = histogram(
+    'hotel_stats_password_verify_queue_wait_seconds', "비밀번호 검증 워커 풀 대기 시간")
+PASSWORD_VERIFY_REJECTED = counter(
+    'hotel_stats_password_verify_rejected_total', "비밀번호 검증 거절 수 (대기열 초과/시간 초과)", ['reason'])
+LOGIN_THROTTLED = counter(
+    'hotel_stats_login_throttled_total', "로그인 실패 횟수 제한으로 차단된 시도 수 (user/ip)", ['scope'])
+PASSWORD_REHASH = counter(
+    'hotel_stats_password_rehash_total', "로그인 시 레거시 비밀번호 재해시 수 (결과별)", ['result'])
+SSH_TUNNEL_UP = gauge(
+    'hotel_stats_ssh_tunnel_up', "SSH 터널 상태 (1: 정상, 0: 끊김, 포워더별)", ['forwarder'])
+SSH_TUNNEL_RESTARTS = counter(
+    'hotel_stats_ssh_tunnel_restarts_total', "SSH 터널 재연결 시도 수 (포워더/결과별)", ['forwarder', 'result'])
+SSH_TUNNEL_CONNECTIONS = counter(
+    'hotel_stats_ssh_tunnel_connections_total', "SSH 터널을 통해 연 DB 연결 수 (포워더/결과별)", ['forwarder', 'status'])
+SSH_TUNNEL_CONNECT_DURATION = histogram(
+    'hotel_stats_ssh_tunnel_connect_seconds', "SSH 터널을 통한 DB 연결 수립 시간 (포워더별)", ['forwarder'])
+REPORT_JOBS = counter(
+    'hotel_stats_report_jobs_total', "리포트 백그라운드 작업 상태 전이 수 (상태/취소 사유별)", ['state', 'reason'])
+REPORT_JOB_DURATION = histogram(
+    'hotel_stats_report_job_duration_seconds', "리포트 백그라운드 작업 실행 시간 (작업 유형/최종 상태별)", ['job', 'state'])
+REPORT_JOB_QUEUE_WAIT = histogram(
+    'hotel_stats_report_job_queue_wait_seconds', "리포트 작업 워커 풀 대기 시간")
+REPORT_JOB_KILLS = counter(
+    'hotel_stats_report_job_kills_total', "취소된 리포트 작업의 KILL QUERY 실행 수 (결과별)", ['result'])
+RESULT_STORE_BYTES = gauge(
+    'hotel_stats_result_store_bytes', "조회 결과 보관소 크기 (DataFrame + 집계 보기/엑셀 캐시 메모리 합계)")
+RESULT_STORE_ENTRIES = gauge(
+    'hotel_stats_result_store_entries', "조회 결과 보관소 결과 수")
+RESULT_STORE_EVICTIONS = counter(
+    'hotel_stats_result_store_evictions_total', "조회 결과 보관소 크기 초과로 삭제된 결과 수")
+
+
+def record_log_event(category: str, level: str, action: str = None, fields: dict = None):
+    """
+    로그 호출 지점에서 메트릭 수집 (utils.logger에서 호출)
+    
+    action과 함께 duration_ms, rows, size_bytes 필드가 있으면 작업별 히스토그램에 기록
+    """
+    LOG_EVENTS.inc(category=category, level=level.upper())
+    if not action:
+        return
+    
+    ACTION_EVENTS.inc(action=action)
+    if not fields:
+        return
+    
+    duration_ms = fields.get('duration_ms')
+    if isinstance(duration_ms, (int, float)):
+        ACTION_DURATION.observe(duration_ms / 1000, action=action)
+    rows = fields.get('rows')
+    if isinstance(rows, int):
+        ACTION_ROWS.observe(rows, action=action)
+    size_bytes = fields.get('size_bytes')
+    if isinstance(size_bytes, int):
+        EXCEL_SIZE.observe(size_bytes)
+
+
+def record_db_query(query_name: str, elapsed: float, rows: int = 0, status: str = 'ok'):
+    """DB 쿼리 실행 결과 기록 (utils.query_monitor에서 호출)"""
+    DB_QUERIES.inc(query=query_name, status=status)
+    if status == 'ok':
+        DB_QUERY_DURATION.observe(elapsed, query=query_name)
+        DB_QUERY_ROWS.inc(rows, query=query_name)
+
+
+def record_cache(cache: str, hit: bool):
+    """캐시 hit/miss 기록"""
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def _make_handler():
+    """GET /metrics 요청 처리 클래스 생성 (http.server는 서버를 띄울 때만 import)"""
+    from http.server import BaseHTTPRequestHandler
+    
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = render_metrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            # 스크레이프 요청마다 stderr에 기록하지 않음
+            pass
+    
+    return _MetricsHandler
+
+
+def _get_env_int(name: str, default: int, minimum: int = 0) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def _candidate_ports(port: int = None) -> list:
+    """
+    이 워커가 바인드할 포트 후보 (.env의 METRICS_PORT, METRICS_WORKER_INDEX, METRICS_PORT_RANGE)
+    
+    Returns:
+        list: 시도할 포트 목록 (METRICS_PORT 미설정/오류 시 빈 목록)
+    """
+    if port is not None:
+        return [port]
+    try:
+        base_port = int(os.getenv('METRICS_PORT', '').strip())
+    except ValueError:
+        return []
+    
+    worker_index = os.getenv('METRICS_WORKER_INDEX', '').strip()
+    if worker_index:
+        try:
+            return [base_port + int(worker_index)]
+        except ValueError:
+            return []
+    return [base_port + offset for offset in range(_get_env_int('METRICS_PORT_RANGE', DEFAULT_PORT_RANGE, 1))]
+
+
+def start_metrics_server(port: int = None, host: str = None):
+    """
+    메트릭 HTTP 서버 시작 (프로세스당 1회, 데몬 스레드)
+    
+    앱이 rerun마다 호출하므로 시작에 실패한 프로세스는 다시 시도하지 않음
+    워커마다 다른 포트에서 자기 프로세스의 값만 노출 (포트 선택은 _candidate_ports, 합산은 Prometheus에서)
+    
+    Args:
+        port: 포트 (없으면 .env의 METRICS_PORT + METRICS_WORKER_INDEX 또는 METRICS_PORT_RANGE 안의 빈 포트,
+              METRICS_PORT 미설정 시 서버를 띄우지 않음)
+        host: 바인드 주소 (없으면 .env의 METRICS_HOST, 기본값: 127.0.0.1)
+    
+    Returns:
+        ThreadingHTTPServer 또는 None
+    """
+    global _server, _server_failed
+    
+    if _server is not None or _server_failed:
+        return _server
+    
+    ports = _candidate_ports(port)
+    if not ports:
+        return None
+    host = host or os.getenv('METRICS_HOST', '127.0.0.1')
+    
+    with _server_lock:
+        if _server is not None or _server_failed:
+            return _server
+        from http.server import ThreadingHTTPServer
+        server = None
+        for candidate in ports:
+            try:
+                server = ThreadingHTTPServer((host, candidate), _make_handler())
+                break
+            except OSError as e:
+                error = e
+        if server is None:
+            # 범위 안의 포트를 모두 다른 워커/프로세스가 사용 중인 경우 등 - 앱 실행은 계속
+            _server_failed = True
+            from utils.logger import log_error
+            log_error("WARNING", "메트릭 서버 시작 실패", exception=error, host=host,
+                      ports=f"{ports[0]}-{ports[-1]}")
+            return None
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+        thread.start()
+        _server = server
+    
+    from utils.logger import log_app
+    log_app("INFO", "메트릭 서버 시작", host=host, port=server.server_address[1], pid=os.getpid())
+    return _server
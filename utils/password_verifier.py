@@ -0,0 +1,295 @@
+# utils/password_verifier.py
+"""비밀번호 검증 모듈
+- bcrypt 검증/해시를 크기가 제한된 전용 워커 풀에서 실행 (Streamlit 스크립트 스레드의 CPU 점유 방지)
+- 대기열 한도(AUTH_VERIFY_QUEUE_LIMIT) 초과 시 즉시 거절하여 로그인 폭주가 다른 세션의 rerun을 막지 않도록 함
+- IP/사용자별 로그인 실패 횟수 제한 (LoginThrottle)
+- 레거시 해시(MD5/SHA256/평문) 판별 및 bcrypt 재해시 필요 여부 확인
+- bcrypt는 워커 스레드에서 최초 검증 시 import (앱 시작 시간 단축)
+"""
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from utils.metrics import (
+    LOGIN_THROTTLED,
+    PASSWORD_VERIFY_DURATION,
+    PASSWORD_VERIFY_QUEUE_WAIT,
+    PASSWORD_VERIFY_REJECTED,
+)
+
+# bcrypt 기본 cost (tools/bcrypt_calibrate.py로 서버에 맞는 값 측정 후 BCRYPT_ROUNDS로 지정)
+DEFAULT_BCRYPT_ROUNDS = 12
+
+# 검증 워커 풀 기본값
+DEFAULT_VERIFY_WORKERS = 2
+DEFAULT_VERIFY_QUEUE_LIMIT = 16
+DEFAULT_VERIFY_TIMEOUT_SEC = 10.0
+
+# 로그인 실패 제한 기본값 (윈도우 내 실패 횟수)
+DEFAULT_THROTTLE_WINDOW_SEC = 300
+DEFAULT_MAX_FAILURES_PER_USER = 5
+DEFAULT_MAX_FAILURES_PER_IP = 20
+
+# 워커 풀 (프로세스당 1개, 최초 사용 시 생성)
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+class VerifierBusyError(Exception):
+    """검증 대기열이 가득 찼거나 제한 시간 안에 검증이 끝나지 않은 경우"""
+
+
+def _get_env_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def _get_env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def get_bcrypt_rounds() -> int:
+    """bcrypt cost - .env의 BCRYPT_ROUNDS (4~31)"""
+    return min(31, _get_env_int('BCRYPT_ROUNDS', DEFAULT_BCRYPT_ROUNDS, minimum=4))
+
+
+def is_rehash_enabled() -> bool:
+    """로그인 성공 시 레거시 해시 재해시 여부 - .env의 AUTH_REHASH_ENABLED"""
+    return os.getenv('AUTH_REHASH_ENABLED', 'false').strip().lower() in ('1', 'true', 'yes')
+
+
+def _get_executor():
+    """검증 워커 풀과 대기열 슬롯 세마포어 반환"""
+    global _executor, _slots
+    
+    if _executor is not None:
+        return _executor, _slots
+    
+    with _executor_lock:
+        if _executor is None:
+            workers = _get_env_int('AUTH_VERIFY_WORKERS', min(DEFAULT_VERIFY_WORKERS, os.cpu_count() or 1))
+            queue_limit = _get_env_int('AUTH_VERIFY_QUEUE_LIMIT', DEFAULT_VERIFY_QUEUE_LIMIT)
+            # 실행 중 + 대기 중 작업 수 상한
+            _slots = threading.BoundedSemaphore(workers + queue_limit)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-verify")
+    return _executor, _slots
+
+
+def _run_in_pool(func, *args, timeout: float = None):
+    """
+    워커 풀에서 함수 실행 후 결과 반환
+    
+    Raises:
+        VerifierBusyError: 대기열이 가득 찼거나 timeout 초과
+    """
+    executor, slots = _get_executor()
+    if not slots.acquire(blocking=False):
+        PASSWORD_VERIFY_REJECTED.inc(reason='queue_full')
+        raise VerifierBusyError("비밀번호 검증 대기열이 가득 찼습니다.")
+    
+    submitted = time.perf_counter()
+    
+    def _task():
+        PASSWORD_VERIFY_QUEUE_WAIT.observe(time.perf_counter() - submitted)
+        return func(*args)
+    
+    try:
+        future = executor.submit(_task)
+    except Exception:
+        slots.release()
+        raise
+    # 제한 시간 초과로 호출자가 먼저 반환해도 작업 종료 시 슬롯 반환
+    future.add_done_callback(lambda _: slots.release())
+    
+    if timeout is None:
+        timeout = _get_env_float('AUTH_VERIFY_TIMEOUT_SEC', DEFAULT_VERIFY_TIMEOUT_SEC)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        PASSWORD_VERIFY_REJECTED.inc(reason='timeout')
+        raise VerifierBusyError("비밀번호 검증 시간이 초과되었습니다.")
+
+
+def detect_hash_type(stored_password: str) -> str:
+    """저장된 비밀번호의 해시 유형 판별 (길이 기준: bcrypt 60, MD5 32, SHA256 64, 그 외 평문)"""
+    length = len(stored_password) if stored_password else 0
+    if length == 60:
+        return "bcrypt"
+    if length == 32:
+        return "MD5"
+    if length == 64:
+        return "SHA256"
+    return "평문"
+
+
+def _bcrypt_checkpw(password: bytes, stored_password: bytes) -> bool:
+    import bcrypt
+    
+    started = time.perf_counter()
+    try:
+        return bcrypt.checkpw(password, stored_password)
+    finally:
+        PASSWORD_VERIFY_DURATION.observe(time.perf_counter() - started, hash_type='bcrypt')
+
+
+def verify_password(password: str, stored_password: str, hash_type: str = None) -> bool:
+    """
+    비밀번호 검증 (bcrypt는 워커 풀에서, MD5/SHA256/평문은 호출 스레드에서 비교)
+    
+    기존 동작과 같이 해시 유형 검증에 실패하면 마지막으로 평문 비교를 시도
+    
+    Args:
+        password: 입력 비밀번호 (평문)
+        stored_password: tblmanager.passwd 값
+        hash_type: detect_hash_type() 결과 (없으면 판별)
+    
+    Returns:
+        bool: 일치 여부
+    
+    Raises:
+        VerifierBusyError: bcrypt 검증 대기열이 가득 찼거나 시간 초과
+    """
+    if not stored_password:
+        return False
+    if hash_type is None:
+        hash_type = detect_hash_type(stored_password)
+    
+    password_bytes = password.encode('utf-8')
+    
+    if hash_type == "bcrypt":
+        try:
+            if _run_in_pool(_bcrypt_checkpw, password_bytes, stored_password.encode('utf-8')):
+                return True
+        except ValueError:
+            # bcrypt 형식이 아닌 60자 값 - 평문 비교로 진행
+            pass
+    elif hash_type == "MD5":
+        if hmac.compare_digest(hashlib.md5(password_bytes).hexdigest(), stored_password.lower()):
+            return True
+    elif hash_type == "SHA256":
+        if hmac.compare_digest(hashlib.sha256(password_bytes).hexdigest(), stored_password.lower()):
+            return True
+    
+    return hmac.compare_digest(password_bytes, stored_password.encode('utf-8'))
+
+
+def get_bcrypt_cost(stored_password: str):
+    """bcrypt 해시의 cost 값 ($2b$12$... -> 12, bcrypt가 아니면 None)"""
+    if not stored_password or len(stored_password) != 60 or not stored_password.startswith('$2'):
+        return None
+    try:
+        return int(stored_password.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(stored_password: str, rounds: int = None) -> bool:
+    """레거시 해시이거나 bcrypt cost가 목표보다 낮으면 True"""
+    cost = get_bcrypt_cost(stored_password)
+    if cost is None:
+        return True
+    return cost < (rounds or get_bcrypt_rounds())
+
+
+def _bcrypt_hash(password: bytes, rounds: int) -> str:
+    import bcrypt
+    
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def hash_password(password: str, rounds: int = None) -> str:
+    """
+    bcrypt 해시 생성 (워커 풀에서 실행)
+    
+    Raises:
+        VerifierBusyError: 대기열이 가득 찼거나 시간 초과
+    """
+    return _run_in_pool(_bcrypt_hash, password.encode('utf-8'), rounds or get_bcrypt_rounds())
+
+
+class LoginThrottle:
+    """
+    로그인 실패 횟수 제한 (프로세스 메모리, 슬라이딩 윈도우)
+    
+    - 사용자 ID별 / IP별로 윈도우 안의 실패 시각을 보관
+    - 한도에 도달하면 가장 오래된 실패가 윈도우를 벗어날 때까지 로그인 시도 차단
+    - IP를 알 수 없는 경우("unknown") IP 기준 제한은 적용하지 않음 (모든 사용자가 같은 키로 묶이는 것 방지)
+    """
+    
+    def __init__(self, window_sec: float = None, max_per_user: int = None, max_per_ip: int = None):
+        self.window_sec = window_sec or _get_env_float('AUTH_THROTTLE_WINDOW_SEC', DEFAULT_THROTTLE_WINDOW_SEC)
+        self.max_per_user = max_per_user or _get_env_int('AUTH_MAX_FAILURES_PER_USER', DEFAULT_MAX_FAILURES_PER_USER)
+        self.max_per_ip = max_per_ip or _get_env_int('AUTH_MAX_FAILURES_PER_IP', DEFAULT_MAX_FAILURES_PER_IP)
+        self._failures = {}  # (scope, key) -> deque[실패 시각]
+        self._lock = threading.Lock()
+    
+    def _keys(self, ip, admin_id):
+        keys = []
+        if admin_id:
+            keys.append(('user', str(admin_id).lower(), self.max_per_user))
+        if ip and ip != "unknown":
+            keys.append(('ip', ip, self.max_per_ip))
+        return keys
+    
+    def _prune(self, failures: deque, now: float):
+        while failures and now - failures[0] >= self.window_sec:
+            failures.popleft()
+    
+    def check(self, ip: str, admin_id: str) -> float:
+        """
+        로그인 시도 가능 여부 확인
+        
+        Returns:
+            float: 0이면 허용, 그 외에는 재시도까지 남은 시간 (초)
+        """
+        now = time.monotonic()
+        retry_after = 0.0
+        with self._lock:
+            for scope, key, limit in self._keys(ip, admin_id):
+                failures = self._failures.get((scope, key))
+                if not failures:
+                    continue
+                self._prune(failures, now)
+                if len(failures) >= limit:
+                    LOGIN_THROTTLED.inc(scope=scope)
+                    retry_after = max(retry_after, self.window_sec - (now - failures[0]))
+        return retry_after
+    
+    def record_failure(self, ip: str, admin_id: str):
+        """로그인 실패 기록"""
+        now = time.monotonic()
+        with self._lock:
+            for scope, key, limit in self._keys(ip, admin_id):
+                failures = self._failures.setdefault((scope, key), deque())
+                self._prune(failures, now)
+                failures.append(now)
+                # 한도 이상은 보관할 필요 없음 (메모리 상한)
+                while len(failures) > limit:
+                    failures.popleft()
+            # 오래된 키 정리
+            if len(self._failures) > 10000:
+                for failure_key in [k for k, v in self._failures.items() if not v or now - v[-1] >= self.window_sec]:
+                    del self._failures[failure_key]
+    
+    def reset(self, admin_id: str):
+        """로그인 성공 시 사용자 ID 기준 실패 기록 삭제 (IP 기준 기록은 유지)"""
+        if not admin_id:
+            return
+        with self._lock:
+            self._failures.pop(('user', str(admin_id).lower()), None)
+
+
+# 프로세스 공용 인스턴스
+login_throttle = LoginThrottle()
@@ -3,13 +3,11 @@
 - 날짜별 + 숙소별 + 채널별 집계
 - order_item.due_price 사용 (입금가)
 - product 테이블 JOIN
+- 마감일은 hotel_daily_stats 집계 테이블에서 읽고 집계 이후 기간만 원본 집계 (utils.daily_stats_rollup)
+- dialect='duckdb': Parquet 스냅샷 조회용 DuckDB 문법으로 생성 (utils.duckdb_engine, 집계 로직은 같음)
+- granularity: 일/주/월/기간 전체 단위로 GROUP BY (booking_date는 단위 시작일, 결과 행 수 감소)
 """
 
-import sys
-import os
-# 프로젝트 루트 디렉토리를 path에 추가
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from datetime import datetime, timedelta
 from config.order_status_mapping import (
     get_status_codes_by_group,
@@ -17,23 +15,171 @@ from config.order_status_mapping import (
 )
 from config.master_data_loader import get_all_order_status_codes
 
+# 방언별 SQL 조각 (MySQL 전용 함수만 다름)
+_DIALECT_SQL = {
+    'mysql': {
+        'to_date': "DATE({0})",
+        'week_start': "DATE_SUB(DATE({0}), INTERVAL WEEKDAY({0}) DAY)",
+        'month_start': "DATE_SUB(DATE({0}), INTERVAL DAYOFMONTH({0}) - 1 DAY)",
+        'today': "CURDATE()",
+        'channel_codes': "GROUP_CONCAT(DISTINCT op.order_type ORDER BY op.order_type SEPARATOR ', ')",
+    },
+    'duckdb': {
+        'to_date': "CAST({0} AS DATE)",
+        'week_start': "CAST(date_trunc('week', {0}) AS DATE)",
+        'month_start': "CAST(date_trunc('month', {0}) AS DATE)",
+        'today': "current_date",
+        'channel_codes': "string_agg(DISTINCT op.order_type, ', ' ORDER BY op.order_type)",
+    },
+}
+
+
+# 집계 단위: 키 -> 표시 이름 (주는 월요일 시작)
+GRANULARITIES = {
+    'day': '일별',
+    'week': '주별',
+    'month': '월별',
+    'period': '기간 전체',
+}
+
+
+def _get_dialect_sql(dialect):
+    if dialect not in _DIALECT_SQL:
+        raise ValueError(f"지원하지 않는 SQL 방언입니다: {dialect}")
+    return _DIALECT_SQL[dialect]
+
+
+def _bucket_expression(column, granularity, sql, period_start):
+    """집계 단위 시작일 식 (기간 전체는 조회 시작일 상수)"""
+    if granularity == 'day':
+        return sql['to_date'].format(column)
+    if granularity == 'week':
+        return sql['week_start'].format(column)
+    if granularity == 'month':
+        return sql['month_start'].format(column)
+    if granularity == 'period':
+        return f"CAST('{str(period_start)[:10]}' AS DATE)"
+    raise ValueError(f"지원하지 않는 집계 단위입니다: {granularity}")
+
 
 def build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=None,
-                                 date_type='orderDate', order_status='전체'):
+                                 date_type='orderDate', order_status='전체', rollup_range=None,
+                                 dialect='mysql', granularity='day'):
     """
     숙소별 통계 쿼리 생성
     날짜별 + 숙소별 + 채널별 집계
     
+    rollup_range가 있으면 그 기간의 마감일은 hotel_daily_stats 집계 테이블에서 읽고,
+    나머지 기간(집계 전 최근일 등)만 원본 테이블에서 집계하여 UNION ALL
+    (일 단위가 아니면 집계 테이블의 일자별 예약 건수를 더할 수 없으므로 원본에서 COUNT(DISTINCT) 1회)
+    
     Args:
         start_date: 시작일 (YYYY-MM-DD)
         end_date: 종료일 (YYYY-MM-DD)
         selected_hotel_ids: 선택된 숙소 ID 리스트 (None이면 전체)
         date_type: 날짜유형 ('useDate', 'orderDate')
         order_status: 예약상태 (항상 '전체'로 고정)
+        rollup_range: 집계 테이블에 적재된 기간 (built_from, built_until), 없으면 원본만 조회
+        dialect: SQL 방언 ('mysql', 'duckdb' - Parquet 스냅샷에는 집계 테이블이 없으므로 rollup_range 무시)
+        granularity: 집계 단위 (GRANULARITIES, booking_date는 단위 시작일 - 기간 전체는 start_date,
+            일 단위가 아니면 rollup_range 무시)
     
     Returns:
         SQL 쿼리 문자열
     """
+    if dialect != 'mysql' or granularity != 'day':
+        # 여러 날에 걸친 주문이 일자별 건수 합계에서 중복 집계되지 않도록 단위 행은 원본에서 집계
+        rollup_range = None
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"지원하지 않는 집계 단위입니다: {granularity}")
+    
+    parts = []
+    for part_start, part_end, from_rollup in _split_by_rollup(start_date, end_date, rollup_range):
+        if from_rollup:
+            parts.append(_build_rollup_statistics_select(part_start, part_end, selected_hotel_ids, date_type))
+        else:
+            parts.append(_build_raw_statistics_select(part_start, part_end, selected_hotel_ids,
+                                                      date_type, order_status, dialect, granularity, start_date))
+    
+    query = "\n    UNION ALL\n".join(parts) + """
+    ORDER BY booking_date DESC, hotel_name ASC, channel_name ASC
+    """
+    
+    return query
+
+
+def _split_by_rollup(start_date, end_date, rollup_range):
+    """
+    조회 기간을 원본 조회 구간과 집계 테이블 구간으로 분할
+    
+    Returns:
+        list: [(구간 시작일, 구간 종료일, 집계 테이블 사용 여부), ...]
+    """
+    if not rollup_range:
+        return [(start_date, end_date, False)]
+    
+    from utils.daily_stats_rollup import as_date
+    
+    start, end = as_date(start_date), as_date(end_date)
+    built_from, built_until = as_date(rollup_range[0]), as_date(rollup_range[1])
+    if built_until < start or built_from > end:
+        return [(start_date, end_date, False)]
+    
+    parts = []
+    if start < built_from:
+        parts.append((start, built_from - timedelta(days=1), False))
+    parts.append((max(start, built_from), min(end, built_until), True))
+    if end > built_until:
+        parts.append((built_until + timedelta(days=1), end, False))
+    return parts
+
+
+def _build_rollup_statistics_select(start_date, end_date, selected_hotel_ids, date_type):
+    """hotel_daily_stats 집계 테이블 조회 (원본 집계와 같은 컬럼 순서/계산식, 일 단위 전용)"""
+    from utils.daily_stats_rollup import get_rollup_table
+    
+    hotel_filter = ""
+    if selected_hotel_ids and len(selected_hotel_ids) > 0:
+        hotel_ids_str = ','.join([str(hid) for hid in selected_hotel_ids])
+        hotel_filter = f"AND s.product_idx IN ({hotel_ids_str})"
+    
+    date_type = 'useDate' if date_type == 'useDate' else 'orderDate'
+    
+    return f"""
+    SELECT 
+        s.stat_date as booking_date,
+        p.name_kr as hotel_name,
+        s.product_idx as hotel_idx,
+        p.product_code as hotel_code,
+        s.channel_name as channel_name,
+        s.channel_idx as channel_idx,
+        s.channel_code as channel_code,
+        s.booking_count as booking_count,
+        s.total_rooms as total_rooms,
+        s.confirmed_rooms as confirmed_rooms,
+        s.cancelled_rooms as cancelled_rooms,
+        CASE 
+            WHEN s.total_rooms = 0 THEN 0
+            ELSE (s.cancelled_rooms / s.total_rooms) * 100
+        END as cancellation_rate,
+        s.total_deposit as total_deposit,
+        s.total_purchase as total_purchase,
+        s.total_purchase - s.total_deposit as total_profit,
+        CASE 
+            WHEN s.total_deposit = 0 THEN 0
+            ELSE ((s.total_purchase - s.total_deposit) / s.total_deposit) * 100
+        END as profit_rate
+    FROM {get_rollup_table()} s
+    LEFT JOIN product p ON s.product_idx = p.idx
+    WHERE s.date_type = '{date_type}'
+        AND s.stat_date >= '{start_date}' AND s.stat_date <= '{end_date}'
+        {hotel_filter}"""
+
+
+def _build_raw_statistics_select(start_date, end_date, selected_hotel_ids, date_type, order_status,
+                                 dialect='mysql', granularity='day', period_start=None):
+    """order_product/order_item/order_pay 원본 집계 (ORDER BY 제외)"""
+    sql = _get_dialect_sql(dialect)
     
     # 숙소 필터 조건 생성
     hotel_filter = ""
@@ -46,11 +192,11 @@ def build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=None,
     if date_type == 'useDate':
         # 이용일 기준
         date_condition = f"op.checkin_date >= '{start_date}' AND op.checkin_date <= '{end_date}'"
-        date_field = "DATE(op.checkin_date)"
+        date_field = _bucket_expression("op.checkin_date", granularity, sql, period_start)
     else:  # orderDate (기본값)
         # 구매일 기준
         date_condition = f"op.create_date >= '{start_date}' AND op.create_date <= '{end_date} 23:59:59'"
-        date_field = "DATE(op.create_date)"
+        date_field = _bucket_expression("op.create_date", granularity, sql, period_start)
     
     # 예약상태 조건 생성 (항상 '전체'로 고정)
     status_condition = ""
@@ -95,7 +241,7 @@ def build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=None,
             END
         ) as channel_name,
         op.order_channel_idx as channel_idx,
-        GROUP_CONCAT(DISTINCT op.order_type ORDER BY op.order_type SEPARATOR ', ') as channel_code,
+        {sql['channel_codes']} as channel_code,
         COUNT(DISTINCT op.order_num) as booking_count,
         SUM(COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0)) as total_rooms,
         SUM(CASE 
@@ -151,18 +297,16 @@ def build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=None,
     LEFT JOIN order_pay opay 
         ON op.order_pay_idx = opay.idx
     WHERE {date_condition}
-        AND op.create_date < CURDATE()
+        AND op.create_date < {sql['today']}
         {status_condition}
         {hotel_filter}
-    GROUP BY {date_field}, p.idx, p.name_kr, p.product_code, op.order_channel_idx, channel_name
-    ORDER BY booking_date DESC, hotel_name ASC, channel_name ASC
-    """
+    GROUP BY {date_field}, p.idx, p.name_kr, p.product_code, op.order_channel_idx, channel_name"""
     
     return query
 
 
 def build_hotel_summary_query(start_date, end_date, selected_hotel_ids=None,
-                              date_type='orderDate', order_status='전체'):
+                              date_type='orderDate', order_status='전체', dialect='mysql'):
     """
     숙소별 요약 통계 쿼리 생성
     
@@ -172,10 +316,12 @@ def build_hotel_summary_query(start_date, end_date, selected_hotel_ids=None,
         selected_hotel_ids: 선택된 숙소 ID 리스트
         date_type: 날짜유형
         order_status: 예약상태 (항상 '전체'로 고정)
+        dialect: SQL 방언 ('mysql', 'duckdb')
     
     Returns:
         SQL 쿼리 문자열
     """
+    sql = _get_dialect_sql(dialect)
     
     # 날짜 조건
     date_condition = ""
@@ -207,12 +353,12 @@ def build_hotel_summary_query(start_date, end_date, selected_hotel_ids=None,
         ), 0) * COALESCE(op.room_cnt, 1)) as total_revenue,
         COUNT(DISTINCT op.product_idx) as hotel_count,
         COUNT(DISTINCT CASE 
-            WHEN '{date_type}' = 'useDate' THEN DATE(op.checkin_date)
-            ELSE DATE(op.create_date)
+            WHEN '{date_type}' = 'useDate' THEN {sql['to_date'].format("op.checkin_date")}
+            ELSE {sql['to_date'].format("op.create_date")}
         END) as active_days
     FROM order_product op
     WHERE {date_condition}
-        AND op.create_date < CURDATE()
+        AND op.create_date < {sql['today']}
         {status_condition}
         {hotel_filter}
     """
@@ -0,0 +1,174 @@
+# utils/query_monitor.py
+"""쿼리 실행 모니터링 모듈
+- 임계값(SLOW_QUERY_THRESHOLD_SEC)을 넘는 쿼리를 slow.log에 기록
+- 정규화된 SQL, 바인딩 파라미터, 반환 행 수, 소요 시간 기록
+- 같은 쿼리 유형의 최초 발생 시 EXPLAIN FORMAT=JSON 수집 (SLOW_QUERY_EXPLAIN=true)
+- 쿼리 유형별 소요 시간/행 수 메트릭 기록 (utils.metrics)
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from utils.logger import log_slow_query, log_error
+from utils.metrics import record_db_query
+
+# 슬로우 쿼리 기본 임계값 (초)
+DEFAULT_SLOW_QUERY_THRESHOLD_SEC = 3.0
+
+# 로그에 남길 SQL/파라미터 최대 길이 (로그 파일 비대화 방지)
+MAX_LOGGED_SQL_LENGTH = 4000
+MAX_LOGGED_PARAMS = 50
+
+# EXPLAIN을 이미 수집한 쿼리 지문 (프로세스 단위)
+_explained_fingerprints = set()
+_explained_lock = threading.Lock()
+
+# 정규화용 정규식
+_COMMENT_RE = re.compile(r"--[^\n]*")
+_LITERAL_RE = re.compile(r"'((?:[^'\\]|\\.|'')*)'|(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_IN_LIST_RE = re.compile(r"IN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def get_slow_query_threshold() -> float:
+    """슬로우 쿼리 임계값 (초) - .env의 SLOW_QUERY_THRESHOLD_SEC"""
+    try:
+        return float(os.getenv('SLOW_QUERY_THRESHOLD_SEC', DEFAULT_SLOW_QUERY_THRESHOLD_SEC))
+    except ValueError:
+        return DEFAULT_SLOW_QUERY_THRESHOLD_SEC
+
+
+def is_explain_enabled() -> bool:
+    """EXPLAIN 수집 여부 - .env의 SLOW_QUERY_EXPLAIN"""
+    return os.getenv('SLOW_QUERY_EXPLAIN', 'false').strip().lower() in ('1', 'true', 'yes')
+
+
+def normalize_sql(sql: str):
+    """
+    SQL 정규화 (쿼리 유형별 집계용 지문 생성)
+    
+    - 주석 제거, 공백 정리
+    - 문자열/숫자 리터럴을 ?로 치환
+    - IN (?, ?, ...) 목록을 IN (...)으로 축약
+    
+    Args:
+        sql: SQL 문자열
+    
+    Returns:
+        tuple: (정규화된 SQL, 추출된 리터럴 리스트)
+    """
+    literals = []
+    
+    def _replace_literal(match):
+        # 문자열 리터럴은 따옴표 안의 값, 숫자는 그대로 기록
+        literals.append(match.group(1) if match.group(1) is not None else match.group(0))
+        return '?'
+    
+    normalized = _COMMENT_RE.sub(' ', sql)
+    normalized = _LITERAL_RE.sub(_replace_literal, normalized)
+    normalized = _IN_LIST_RE.sub('IN (...)', normalized)
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
+    
+    return normalized, literals
+
+
+def _truncate(value: str, max_length: int = MAX_LOGGED_SQL_LENGTH) -> str:
+    """로그용 문자열 길이 제한"""
+    if len(value) <= max_length:
+        return value
+    return value[:max_length] + f"...(+{len(value) - max_length}자)"
+
+
+def _format_params(params, literals):
+    """로그용 파라미터 표현 (바인딩 파라미터가 없으면 SQL에 포함된 리터럴 사용)"""
+    values = list(params) if params else literals
+    if len(values) > MAX_LOGGED_PARAMS:
+        return repr(values[:MAX_LOGGED_PARAMS])[:-1] + f", ...(+{len(values) - MAX_LOGGED_PARAMS}개)]"
+    return repr(values)
+
+
+def _capture_explain(engine, query: str, params):
+    """EXPLAIN FORMAT=JSON 실행 결과를 한 줄 JSON으로 반환 (실패 시 None)"""
+    try:
+        with engine.connect() as conn:
+            result = conn.exec_driver_sql(f"EXPLAIN FORMAT=JSON {query}", params or None)
+            row = result.fetchone()
+        if row is None:
+            return None
+        # 여러 줄 JSON을 한 줄로 압축
+        return json.dumps(json.loads(row[0]), ensure_ascii=False, separators=(',', ':'))
+    except Exception as e:
+        log_error("WARNING", "EXPLAIN 수집 실패", exception=e)
+        return None
+
+
+def record_query(query_name: str, query: str, params, elapsed: float, rows: int, engine=None):
+    """
+    쿼리 실행 결과를 기록 (임계값 초과 시 slow.log)
+    
+    Args:
+        query_name: 쿼리 유형 이름 (예: 'fetch_hotel_data')
+        query: 실행한 SQL
+        params: 바인딩 파라미터 (없으면 None)
+        elapsed: 소요 시간 (초)
+        rows: 반환 행 수
+        engine: EXPLAIN 수집에 사용할 엔진 (없으면 EXPLAIN 생략)
+    """
+    if elapsed < get_slow_query_threshold():
+        return
+    
+    try:
+        normalized, literals = normalize_sql(query)
+        
+        # 같은 쿼리 유형은 최초 발생 시에만 EXPLAIN 수집
+        explain = None
+        if engine is not None and is_explain_enabled():
+            fingerprint = f"{query_name}:{normalized}"
+            with _explained_lock:
+                is_first = fingerprint not in _explained_fingerprints
+                _explained_fingerprints.add(fingerprint)
+            if is_first:
+                explain = _capture_explain(engine, query, params)
+        
+        log_slow_query("WARNING", "슬로우 쿼리", query_name=query_name,
+                       elapsed_sec=f"{elapsed:.3f}",
+                       rows=rows,
+                       params=_format_params(params, literals),
+                       sql=_truncate(normalized),
+                       explain=explain)
+    except Exception as e:
+        # 모니터링 실패가 조회를 막지 않도록 함
+        log_error("WARNING", "슬로우 쿼리 기록 실패", exception=e, query=query_name)
+
+
+def read_sql_monitored(query: str, engine, params=None, query_name: str = 'query'):
+    """
+    pd.read_sql 실행 + 소요 시간 측정 및 슬로우 쿼리 기록
+    
+    Args:
+        query: SQL 문자열
+        engine: SQLAlchemy 엔진 또는 Connection (리포트 작업처럼 연결을 직접 관리하는 경우)
+        params: 바인딩 파라미터 (선택사항)
+        query_name: 쿼리 유형 이름
+    
+    Returns:
+        pandas DataFrame
+    """
+    import pandas as pd
+    
+    started = time.perf_counter()
+    try:
+        df = pd.read_sql(query, engine, params=params)
+    except Exception:
+        record_db_query(query_name, time.perf_counter() - started, status='error')
+        raise
+    elapsed = time.perf_counter() - started
+    
+    record_db_query(query_name, elapsed, len(df))
+    # EXPLAIN은 별도 연결에서 실행 (Connection이면 소속 엔진 사용)
+    record_query(query_name, query, params, elapsed, len(df), engine=engine.engine)
+    
+    return df
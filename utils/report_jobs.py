@@ -0,0 +1,323 @@
+# utils/report_jobs.py
+"""리포트 백그라운드 실행 모듈
+- 조회 쿼리를 전용 워커 풀에서 실행 (Streamlit 세션은 작업 ID만 보관하고 폴링)
+- 작업 상태: queued -> running -> done / failed / cancelled, 단계별 진행 메시지
+- 취소 시 작업이 사용 중인 DB 연결에 KILL QUERY 실행 (MySQL에서 쿼리가 계속 도는 것 방지)
+- 다시 조회하면 이전 작업 취소, 일정 시간 폴링이 없는 작업(브라우저 종료 등)은 버려진 것으로 보고 취소
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from utils.logger import log_app, log_error
+from utils.metrics import REPORT_JOBS, REPORT_JOB_DURATION, REPORT_JOB_KILLS, REPORT_JOB_QUEUE_WAIT
+
+# 작업 상태
+STATE_QUEUED = 'queued'
+STATE_RUNNING = 'running'
+STATE_DONE = 'done'
+STATE_FAILED = 'failed'
+STATE_CANCELLED = 'cancelled'
+
+FINISHED_STATES = (STATE_DONE, STATE_FAILED, STATE_CANCELLED)
+
+# 워커 풀 기본값
+DEFAULT_JOB_WORKERS = 4
+# 마지막 폴링 후 이 시간이 지나도록 조회되지 않은 미완료 작업은 취소 (초)
+DEFAULT_ABANDON_SEC = 60
+# 끝난 작업을 보관하는 시간 (초) - 이후 결과 조회 불가
+DEFAULT_RESULT_TTL_SEC = 600
+
+# 워커 풀 (프로세스당 1개, 최초 사용 시 생성)
+_executor = None
+_executor_lock = threading.Lock()
+
+# 작업 목록: job_id -> ReportJob
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+class JobCancelledError(Exception):
+    """작업이 취소되어 더 이상 진행하지 않는 경우"""
+
+
+def _get_env_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """리포트 워커 풀 반환 - 크기는 .env의 REPORT_JOB_WORKERS"""
+    global _executor
+    
+    if _executor is not None:
+        return _executor
+    
+    with _executor_lock:
+        if _executor is None:
+            workers = _get_env_int('REPORT_JOB_WORKERS', DEFAULT_JOB_WORKERS)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-job")
+    return _executor
+
+
+class ReportJob:
+    """
+    백그라운드 리포트 작업
+    
+    - 작업 함수는 첫 인자로 ReportJob을 받아 set_progress()로 진행 상황을 알리고,
+      DB 쿼리는 connection()으로 연 연결에서 실행해야 취소 시 KILL QUERY 대상이 됨
+    - 상태/결과 속성은 워커 스레드가 갱신하고 세션은 읽기만 함
+    """
+    
+    def __init__(self, name: str, owner: str = None, total_steps: int = 1):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.owner = owner
+        self.state = STATE_QUEUED
+        self.progress = "대기 중"
+        self.step = 0
+        self.total_steps = max(1, total_steps)
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.last_polled_at = time.monotonic()
+        self._cancel_event = threading.Event()
+        self._finished_event = threading.Event()
+        # 실행 중인 쿼리의 DB 연결: (엔진, MySQL 연결 ID, KILL 완료 이벤트)
+        # KILL 완료 이벤트는 평소 set 상태, 취소 시 clear 후 KILL QUERY가 끝나면 다시 set
+        self._connections = []
+        self._lock = threading.Lock()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+    
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+    
+    @property
+    def elapsed(self) -> float:
+        """실행 시간 (초, 시작 전이면 0)"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+    
+    def wait(self, timeout: float = None) -> bool:
+        """작업이 끝날 때까지 최대 timeout초 대기 (끝났으면 True)"""
+        return self._finished_event.wait(timeout)
+    
+    def set_progress(self, message: str, step: int = None):
+        """진행 메시지 갱신 (취소된 작업이면 JobCancelledError)"""
+        self.check_cancelled()
+        self.progress = message
+        if step is not None:
+            self.step = min(step, self.total_steps)
+    
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelledError(f"취소된 작업입니다: {self.id}")
+    
+    @contextmanager
+    def connection(self, engine):
+        """
+        작업 전용 DB 연결 (연결 ID를 기록하여 취소 시 KILL QUERY 대상으로 사용)
+        
+        취소된 작업의 연결은 KILL QUERY가 끝날 때까지 기다린 뒤 풀에 반납하지 않고 폐기
+        (같은 연결 ID를 다른 세션/작업이 받아 KILL되는 것 방지)
+        
+        Args:
+            engine: SQLAlchemy 엔진
+        
+        Yields:
+            SQLAlchemy Connection (pd.read_sql에 엔진 대신 전달)
+        """
+        self.check_cancelled()
+        with engine.connect() as conn:
+            connection_id = conn.exec_driver_sql("SELECT CONNECTION_ID()").scalar()
+            kill_done = threading.Event()
+            kill_done.set()
+            entry = (engine, connection_id, kill_done)
+            with self._lock:
+                self._connections.append(entry)
+            try:
+                # 연결 ID 등록 전에 취소 요청이 들어온 경우
+                self.check_cancelled()
+                yield conn
+            finally:
+                # 진행 중인 KILL QUERY가 끝날 때까지 연결 ID 유지
+                kill_done.wait()
+                with self._lock:
+                    self._connections.remove(entry)
+                if self._cancel_event.is_set():
+                    conn.invalidate()
+    
+    def cancel(self, reason: str = 'user') -> bool:
+        """
+        작업 취소 요청 (실행 중인 쿼리는 KILL QUERY로 중단)
+        
+        Returns:
+            bool: 취소 요청이 반영되었으면 True (이미 끝난 작업이면 False)
+        """
+        with self._lock:
+            if self.finished or self._cancel_event.is_set():
+                return False
+            self._cancel_event.set()
+            connections = list(self._connections)
+            for _, _, kill_done in connections:
+                kill_done.clear()
+            if self.state == STATE_QUEUED:
+                # 아직 시작 전이면 워커가 꺼낼 때 바로 종료
+                self._finish(STATE_CANCELLED)
+        
+        REPORT_JOBS.inc(state='cancel_requested', reason=reason)
+        for engine, connection_id, kill_done in connections:
+            try:
+                _kill_query(engine, connection_id, reason)
+            finally:
+                kill_done.set()
+        return True
+    
+    def _finish(self, state: str, result=None, error: Exception = None):
+        self.state = state
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self._finished_event.set()
+    
+    def _run(self, func, args, kwargs):
+        """워커 스레드에서 작업 실행"""
+        REPORT_JOB_QUEUE_WAIT.observe(time.time() - self.created_at)
+        with self._lock:
+            if self._cancel_event.is_set():
+                return
+            self.state = STATE_RUNNING
+            self.started_at = time.time()
+            self.progress = "실행 중"
+        
+        try:
+            result = func(self, *args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                if self._cancel_event.is_set():
+                    # KILL QUERY로 중단된 쿼리의 오류는 취소로 처리
+                    self._finish(STATE_CANCELLED)
+                else:
+                    self._finish(STATE_FAILED, error=e)
+            if self.state == STATE_FAILED:
+                log_error("ERROR", "리포트 작업 실패", exception=e, job_id=self.id, job=self.name, admin_id=self.owner)
+        else:
+            with self._lock:
+                if self._cancel_event.is_set():
+                    self._finish(STATE_CANCELLED)
+                else:
+                    self.step = self.total_steps
+                    self._finish(STATE_DONE, result=result)
+        
+        REPORT_JOBS.inc(state=self.state, reason='')
+        REPORT_JOB_DURATION.observe(self.elapsed, job=self.name, state=self.state)
+
+
+def _kill_query(engine, connection_id, reason: str):
+    """다른 연결에서 KILL QUERY 실행 (연결은 유지되고 실행 중인 문장만 중단)"""
+    from utils.db_access import execute
+    
+    try:
+        execute(f"KILL QUERY {int(connection_id)}", query_name='report_job_kill', engine=engine)
+        REPORT_JOB_KILLS.inc(result='ok')
+        log_app("INFO", "리포트 쿼리 중단 (KILL QUERY)", connection_id=connection_id, reason=reason)
+    except Exception as e:
+        # 쿼리가 이미 끝나 연결 ID가 없는 경우(Unknown thread id) 포함
+        REPORT_JOB_KILLS.inc(result='error')
+        log_error("WARNING", "KILL QUERY 실패", exception=e, connection_id=connection_id, reason=reason)
+
+
+def _reap_jobs():
+    """버려진 작업 취소 및 오래된 완료 작업 삭제"""
+    abandon_sec = _get_env_int('REPORT_JOB_ABANDON_SEC', DEFAULT_ABANDON_SEC)
+    ttl_sec = _get_env_int('REPORT_JOB_RESULT_TTL_SEC', DEFAULT_RESULT_TTL_SEC)
+    now = time.time()
+    now_monotonic = time.monotonic()
+    
+    with _jobs_lock:
+        jobs = list(_jobs.values())
+    
+    for job in jobs:
+        if job.finished:
+            if now - job.finished_at >= ttl_sec:
+                with _jobs_lock:
+                    _jobs.pop(job.id, None)
+        elif now_monotonic - job.last_polled_at >= abandon_sec:
+            job.cancel(reason='abandoned')
+
+
+def submit_report_job(func, *args, name: str = 'report', owner: str = None, total_steps: int = 1,
+                      supersedes: str = None, **kwargs) -> ReportJob:
+    """
+    리포트 작업 제출
+    
+    Args:
+        func: 작업 함수 (첫 인자로 ReportJob을 받음, 반환값이 job.result)
+        name: 작업 유형 이름 (메트릭/로그용)
+        owner: 작업 소유자 (사용자 ID)
+        total_steps: 진행률 계산용 전체 단계 수
+        supersedes: 대체할 이전 작업 ID (있으면 취소)
+    
+    Returns:
+        ReportJob: 제출된 작업 (job.id를 세션에 보관)
+    """
+    _reap_jobs()
+    if supersedes:
+        cancel_job(supersedes, reason='superseded')
+    
+    job = ReportJob(name, owner=owner, total_steps=total_steps)
+    with _jobs_lock:
+        _jobs[job.id] = job
+    REPORT_JOBS.inc(state=STATE_QUEUED, reason='')
+    _get_executor().submit(job._run, func, args, kwargs)
+    return job
+
+
+def get_job(job_id: str):
+    """
+    작업 조회 (조회할 때마다 폴링 시각 갱신 - 버려진 작업 판정 기준)
+    
+    Returns:
+        ReportJob 또는 None (없거나 보관 기간이 지난 작업)
+    """
+    if not job_id:
+        return None
+    _reap_jobs()
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is not None:
+        job.last_polled_at = time.monotonic()
+    return job
+
+
+def cancel_job(job_id: str, reason: str = 'user') -> bool:
+    """작업 취소 (없거나 이미 끝난 작업이면 False)"""
+    if not job_id:
+        return False
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return False
+    return job.cancel(reason=reason)
+
+
+def discard_job(job_id: str):
+    """결과를 가져간 작업 삭제 (미완료 작업이면 취소 후 삭제)"""
+    if not job_id:
+        return
+    cancel_job(job_id, reason='discarded')
+    with _jobs_lock:
+        _jobs.pop(job_id, None)
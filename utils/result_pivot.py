@@ -0,0 +1,144 @@
+# utils/result_pivot.py
+"""조회 결과 집계 보기 (숙소별/채널별/주별 등)
+- 세션에 보관한 조회 결과(일자 x 숙소 x 채널)를 다시 묶어 합계 계산 (DB 조회 없음)
+- 취소율/수익률은 행별 비율의 평균이 아니라 합계로 다시 계산 (객실 수/입금가 가중)
+- 같은 조회 결과 + 같은 집계 기준(선택 순서 무관)은 결과 dict에 보관하여 다시 계산하지 않음
+
+예약 건수는 일자 x 숙소 x 채널별 주문번호 수의 합계이므로
+여러 이용일/채널에 걸친 주문은 묶은 단위에서도 중복 집계됨 (요약 통계의 총 예약 건수와 같은 기준)
+"""
+
+import pandas as pd
+
+from utils.metrics import record_cache
+from utils.result_store import add_to_result
+
+# 집계 기준: 키 -> 표시 이름
+DIMENSIONS = {
+    'date': '일자',
+    'week': '주',
+    'month': '월',
+    'hotel': '숙소',
+    'channel': '채널',
+}
+
+# 시간 기준 (최근 순 정렬)
+TIME_DIMENSIONS = ('date', 'week', 'month')
+
+# 조회 집계 단위별로 쓸 수 있는 시간 기준 (같거나 더 큰 단위만 - 주 행을 월로 묶으면 두 달에 걸친 주가
+# 앞 달에 들어가고, 월 행을 주로 묶으면 한 달이 첫 주에 들어가므로 제외, 기간 전체는 시간 기준 없음)
+_GRANULARITY_TIME_DIMENSIONS = {
+    'day': ('date', 'week', 'month'),
+    'week': ('week',),
+    'month': ('month',),
+    'period': (),
+}
+
+# 집계 기준별 묶음 컬럼 (숙소는 같은 이름의 다른 숙소가 섞이지 않도록 ID 포함)
+_DIMENSION_COLUMNS = {
+    'date': ['booking_date'],
+    'week': ['week_start'],
+    'month': ['month_start'],
+    'hotel': ['hotel_idx', 'hotel_name'],
+    'channel': ['channel_name'],
+}
+
+# 합계 컬럼
+SUM_COLUMNS = ('booking_count', 'total_rooms', 'confirmed_rooms', 'cancelled_rooms',
+               'total_deposit', 'total_purchase', 'total_profit')
+
+
+def get_dimensions(granularity: str = 'day') -> dict:
+    """조회 결과의 집계 단위에서 쓸 수 있는 집계 기준 (키 -> 표시 이름)"""
+    allowed = _GRANULARITY_TIME_DIMENSIONS[granularity]
+    return {key: name for key, name in DIMENSIONS.items() if key not in TIME_DIMENSIONS or key in allowed}
+
+
+def _add_period_columns(df: pd.DataFrame, dimensions) -> pd.DataFrame:
+    """주/월 시작일 컬럼 추가 (필요한 경우만, 원본은 공유 결과이므로 복사본에 추가)"""
+    if 'week' not in dimensions and 'month' not in dimensions:
+        return df
+    
+    df = df.copy(deep=False)
+    booking_date = pd.to_datetime(df['booking_date'])
+    if 'week' in dimensions:
+        # 월요일 시작
+        df['week_start'] = booking_date.dt.normalize() - pd.to_timedelta(booking_date.dt.dayofweek, unit='D')
+    if 'month' in dimensions:
+        df['month_start'] = booking_date.dt.to_period('M').dt.to_timestamp()
+    return df
+
+
+def add_rate_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """합계 컬럼으로 취소율/수익률 다시 계산 (통계 쿼리와 같은 식, 분모가 0이면 0, 소수점 1자리)"""
+    rooms = frame['total_rooms'].where(frame['total_rooms'] != 0)
+    deposit = frame['total_deposit'].where(frame['total_deposit'] != 0)
+    frame['cancellation_rate'] = (frame['cancelled_rooms'] / rooms * 100).fillna(0).round(1)
+    frame['profit_rate'] = ((frame['total_purchase'] - frame['total_deposit']) / deposit * 100).fillna(0).round(1)
+    return frame
+
+
+def rollup_result(df: pd.DataFrame, dimensions) -> pd.DataFrame:
+    """
+    조회 결과를 집계 기준별로 다시 합계
+    
+    Args:
+        df: fetch_hotel_data 결과 (일자 x 숙소 x 채널)
+        dimensions: 집계 기준 키 목록 (DIMENSIONS, 비어 있으면 전체 합계 1행)
+    
+    Returns:
+        pandas DataFrame: 기준 컬럼 + SUM_COLUMNS + cancellation_rate, profit_rate
+    """
+    unknown = [dimension for dimension in dimensions if dimension not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 집계 기준입니다: {', '.join(unknown)}")
+    
+    group_columns = [column for dimension in dimensions for column in _DIMENSION_COLUMNS[dimension]]
+    if df.empty:
+        return pd.DataFrame(columns=group_columns + list(SUM_COLUMNS) + ['cancellation_rate', 'profit_rate'])
+    
+    source = _add_period_columns(df, dimensions)
+    if group_columns:
+        # 채널 없는 행(NULL)도 하나의 묶음으로 유지
+        totals = source.groupby(group_columns, sort=False, dropna=False)[list(SUM_COLUMNS)].sum().reset_index()
+    else:
+        totals = source[list(SUM_COLUMNS)].sum().to_frame().T
+    
+    add_rate_columns(totals)
+    return _arrange(totals, dimensions)
+
+
+def _arrange(totals: pd.DataFrame, dimensions) -> pd.DataFrame:
+    """기준 순서대로 컬럼 배치 후 정렬 (시간 기준은 최근 순, 나머지는 이름순, 시간 기준이 없으면 실구매가 큰 순)"""
+    group_columns = [column for dimension in dimensions for column in _DIMENSION_COLUMNS[dimension]]
+    sort_columns = [column for column in group_columns if column != 'hotel_idx']
+    ascending = [dimension not in TIME_DIMENSIONS for dimension in dimensions
+                 for column in _DIMENSION_COLUMNS[dimension] if column != 'hotel_idx']
+    if not any(dimension in TIME_DIMENSIONS for dimension in dimensions):
+        sort_columns, ascending = ['total_purchase'] + sort_columns, [False] + ascending
+    columns = group_columns + list(SUM_COLUMNS) + ['cancellation_rate', 'profit_rate']
+    return totals[columns].sort_values(sort_columns, ascending=ascending, kind='stable').reset_index(drop=True)
+
+
+def get_result_pivot(result: dict, dimensions) -> pd.DataFrame:
+    """
+    조회 결과의 집계 (같은 결과 + 같은 기준이면 보관된 집계 반환)
+    
+    Args:
+        result: 보관소의 조회 결과 (utils.result_store, 집계는 result['pivots']에 보관되어
+                같은 결과를 보는 세션끼리 공유, 크기는 결과 크기에 포함되고 결과와 함께 삭제됨)
+        dimensions: 집계 기준 키 목록 (순서대로 컬럼 배치)
+    
+    Returns:
+        pandas DataFrame (읽기 전용으로 사용)
+    """
+    # 선택 순서만 다른 기준은 같은 집계를 공유 (보관은 정렬된 기준 순서, 반환 시 선택 순서로 배치)
+    key = tuple(sorted(dimensions))
+    pivot = result['pivots'].get(key)
+    record_cache('result_pivot', pivot is not None)
+    if pivot is None:
+        pivot = rollup_result(result['df'], key)
+        pivot = add_to_result(result, 'pivots', key, pivot, int(pivot.memory_usage(index=True, deep=True).sum()))
+    if key != tuple(dimensions):
+        pivot = _arrange(pivot, dimensions)
+    return pivot
@@ -0,0 +1,185 @@
+# utils/result_store.py
+"""조회 결과 공유 보관소
+- 조회 결과 DataFrame을 세션마다 보관하지 않고 프로세스 공용 보관소에 두고 세션은 키만 보관
+- 키는 조회 조건 + 결과 내용 해시 (같은 조건으로 같은 결과를 받은 세션끼리 DataFrame 1개를 공유)
+- 전체 크기(DataFrame + 집계 보기/엑셀 캐시 메모리 합계)가 .env의 RESULT_STORE_MAX_MB를 넘으면
+  오래 사용하지 않은 결과부터 삭제
+- 삭제된 결과는 세션이 보관한 조회 조건으로 다시 조회 (app에서 처리)
+- 공유된 결과는 여러 세션이 함께 보므로 읽기 전용으로 취급
+- 결과에 딸린 집계 보기/엑셀 캐시는 add_to_result로 추가하여 결과 크기에 포함 (결과와 함께 삭제됨)
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils.logger import log_app
+from utils.metrics import RESULT_STORE_BYTES, RESULT_STORE_ENTRIES, RESULT_STORE_EVICTIONS, record_cache
+
+# 보관소 최대 크기 기본값 (MB)
+DEFAULT_MAX_MB = 512
+
+# 보관 결과: key -> {'key', 'df', 'summary_stats', 'pivots', 'exports', 'nbytes'} (마지막이 최근 사용)
+# pivots: 집계 보기 캐시, exports: 엑셀 파일 캐시 ((날짜유형, 집계 단위) -> (bytes, 파일명))
+# nbytes: DataFrame + 캐시 크기 합계
+_results = OrderedDict()
+_total_bytes = 0
+_results_lock = threading.Lock()
+
+
+def get_max_bytes() -> int:
+    """보관소 최대 크기 (바이트) - .env의 RESULT_STORE_MAX_MB"""
+    try:
+        max_mb = max(1, int(os.getenv('RESULT_STORE_MAX_MB', DEFAULT_MAX_MB)))
+    except ValueError:
+        max_mb = DEFAULT_MAX_MB
+    return max_mb * 1024 * 1024
+
+
+def make_result_key(params: dict, df: pd.DataFrame) -> str:
+    """
+    결과 키 생성 (조회 조건 + 결과 내용)
+    
+    Args:
+        params: 조회 조건 (start_date, end_date, selected_hotel_ids, date_type, granularity 등)
+        df: 조회 결과
+    
+    Returns:
+        str: '조건 해시-내용 해시'
+    """
+    canonical = '\n'.join(f"{name}={sorted(value) if isinstance(value, (list, tuple, set)) else value}"
+                          for name, value in sorted(params.items()))
+    params_digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+    
+    content = hashlib.sha256(','.join(map(str, df.columns)).encode('utf-8'))
+    if not df.empty:
+        content.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return f"{params_digest}-{content.hexdigest()[:16]}"
+
+
+def _evict(keep_key: str) -> list:
+    """최대 크기를 넘는 동안 오래된 결과부터 삭제 (방금 저장한 결과는 유지, _results_lock 보유 상태에서 호출)"""
+    global _total_bytes
+    
+    max_bytes = get_max_bytes()
+    evicted = []
+    for key in list(_results):
+        if _total_bytes <= max_bytes:
+            break
+        if key == keep_key:
+            continue
+        _total_bytes -= _results.pop(key)['nbytes']
+        evicted.append(key)
+    return evicted
+
+
+def _update_gauges():
+    RESULT_STORE_BYTES.set(_total_bytes)
+    RESULT_STORE_ENTRIES.set(len(_results))
+
+
+def _record_evictions(evicted: list, total_bytes: int):
+    if evicted:
+        RESULT_STORE_EVICTIONS.inc(len(evicted))
+        log_app("INFO", "조회 결과 보관소 정리", evicted=len(evicted), entries=len(_results),
+                total_mb=round(total_bytes / 1024 / 1024, 1))
+
+
+def put_result(params: dict, df: pd.DataFrame, summary_stats: dict) -> dict:
+    """
+    조회 결과 저장
+    
+    같은 키의 결과가 이미 있으면 새 DataFrame은 버리고 기존 결과를 공유 (집계 보기/엑셀 캐시도 유지)
+    
+    Args:
+        params: 조회 조건
+        df: 조회 결과
+        summary_stats: 요약 통계
+    
+    Returns:
+        dict: 보관된 결과 ({'key', 'df', 'summary_stats', 'pivots', 'exports', 'nbytes'}, 세션에는 key만 보관)
+    """
+    global _total_bytes
+    
+    key = make_result_key(params, df)
+    with _results_lock:
+        entry = _results.get(key)
+        if entry is not None:
+            _results.move_to_end(key)
+            record_cache('result_store_dedup', True)
+            return entry
+        
+        record_cache('result_store_dedup', False)
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        entry = {'key': key, 'df': df, 'summary_stats': summary_stats, 'pivots': {}, 'exports': {}, 'nbytes': nbytes}
+        _results[key] = entry
+        _total_bytes += nbytes
+        evicted = _evict(key)
+        _update_gauges()
+        total_bytes = _total_bytes
+    
+    _record_evictions(evicted, total_bytes)
+    return entry
+
+
+def add_to_result(entry: dict, cache: str, cache_key, value, nbytes: int):
+    """
+    결과에 집계 보기/엑셀 캐시 추가 (크기를 결과 크기에 더하고 최대 크기를 넘으면 오래된 결과부터 삭제)
+    
+    다른 세션이 먼저 같은 캐시를 추가했으면 새 값은 버리고 기존 값을 반환
+    
+    Args:
+        entry: put_result/get_result가 반환한 결과
+        cache: 캐시 이름 ('pivots', 'exports')
+        cache_key: 캐시 키
+        value: 캐시 값
+        nbytes: 캐시 값의 메모리 크기
+    
+    Returns:
+        보관된 캐시 값
+    """
+    global _total_bytes
+    
+    with _results_lock:
+        values = entry[cache]
+        if cache_key in values:
+            return values[cache_key]
+        values[cache_key] = value
+        entry['nbytes'] += nbytes
+        evicted = []
+        # 이미 보관소에서 삭제된 결과는 세션이 보고 있는 동안만 쓰이므로 전체 크기에 더하지 않음
+        if _results.get(entry['key']) is entry:
+            _total_bytes += nbytes
+            evicted = _evict(entry['key'])
+            _update_gauges()
+        total_bytes = _total_bytes
+    
+    _record_evictions(evicted, total_bytes)
+    return value
+
+
+def get_result(key: str):
+    """
+    보관된 조회 결과
+    
+    Args:
+        key: put_result가 반환한 키
+    
+    Returns:
+        dict: {'key', 'df', 'summary_stats', 'pivots', 'exports', 'nbytes'} 또는 None (삭제됨 - 다시 조회 필요)
+    """
+    with _results_lock:
+        entry = _results.get(key)
+        if entry is not None:
+            _results.move_to_end(key)
+    record_cache('result_store', entry is not None)
+    return entry
+
+
+def get_store_stats() -> dict:
+    """보관소 상태 ({'entries', 'bytes', 'max_bytes'})"""
+    with _results_lock:
+        return {'entries': len(_results), 'bytes': _total_bytes, 'max_bytes': get_max_bytes()}
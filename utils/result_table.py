@@ -0,0 +1,119 @@
+# utils/result_table.py
+"""조회 결과 상세 표 (필터/정렬/페이지)
+- 세션에 보관한 타입 정리된 결과에서 필터/정렬을 벡터 연산으로 처리
+- 화면에 보이는 페이지의 행만 표시용 문자열로 변환 (전체 결과를 매번 포맷하지 않음)
+"""
+
+import math
+
+import pandas as pd
+
+from utils.excel_handler_hotel import format_booking_dates, get_date_column_name
+
+# 페이지 크기 선택지 (첫 번째가 기본값)
+PAGE_SIZES = (25, 50, 100, 200)
+
+# 정렬 기준: 컬럼 -> 표시 이름 (날짜는 날짜유형/집계 단위에 따라 표시 이름이 바뀌므로 별도 처리)
+SORT_COLUMNS = {
+    'booking_date': '날짜',
+    'hotel_name': '숙소명',
+    'channel_name': '채널명',
+    'booking_count': '예약건수',
+    'total_rooms': '총객실수',
+    'cancelled_rooms': '취소객실수',
+    'cancellation_rate': '취소율',
+    'total_deposit': '총 입금가',
+    'total_purchase': '총 실구매가',
+    'total_profit': '총 수익',
+    'profit_rate': '수익률 (%)',
+}
+
+# 상세 표 컬럼: 컬럼 -> 표시 이름 (표시 순서, 날짜 컬럼 제외)
+DETAIL_COLUMNS = {
+    'hotel_name': '숙소명',
+    'channel_name': '채널명',
+    'booking_count': '예약건수',
+    'total_rooms': '총객실수',
+    'confirmed_rooms': '확정객실수',
+    'cancelled_rooms': '취소객실수',
+    'cancellation_rate': '취소율',
+    'total_deposit': '총 입금가',
+    'total_purchase': '총 실구매가',
+    'total_profit': '총 수익',
+    'profit_rate': '수익률 (%)',
+}
+
+# 비율 컬럼 (소수점 1자리 + %)
+_RATE_COLUMNS = ('cancellation_rate', 'profit_rate')
+
+
+def filter_result(df: pd.DataFrame, hotel_names=None, channel_names=None) -> pd.DataFrame:
+    """
+    숙소/채널 필터 (선택하지 않은 조건은 전체)
+    
+    Returns:
+        pandas DataFrame (조건이 없으면 원본 그대로)
+    """
+    mask = None
+    if hotel_names:
+        mask = df['hotel_name'].isin(hotel_names)
+    if channel_names:
+        channel_mask = df['channel_name'].isin(channel_names)
+        mask = channel_mask if mask is None else mask & channel_mask
+    return df if mask is None else df[mask]
+
+
+def sort_result(df: pd.DataFrame, column: str = None, ascending: bool = False) -> pd.DataFrame:
+    """
+    정렬 (같은 값은 조회 순서 유지, 기준이 없으면 조회 순서 그대로)
+    
+    조회 결과는 날짜 최근 순 > 숙소명 > 채널명 순이므로 안정 정렬로 다음 기준이 유지됨
+    """
+    if not column:
+        return df
+    if column not in SORT_COLUMNS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {column}")
+    return df.sort_values(column, ascending=ascending, kind='stable', na_position='last')
+
+
+def get_page_count(total_rows: int, page_size: int) -> int:
+    """전체 페이지 수 (결과가 없어도 1)"""
+    return max(1, math.ceil(total_rows / page_size))
+
+
+def get_page(df: pd.DataFrame, page: int, page_size: int) -> pd.DataFrame:
+    """페이지 행 (1부터 시작, 범위를 벗어나면 마지막 페이지)"""
+    page = min(max(1, page), get_page_count(len(df), page_size))
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
+
+
+def format_detail_page(page_df: pd.DataFrame, date_type: str = 'orderDate', granularity: str = 'day',
+                       end_date=None) -> pd.DataFrame:
+    """
+    상세 표 페이지를 표시용으로 변환 (컬럼명 한글화, 천단위 구분, 비율 % 표시)
+    
+    Args:
+        page_df: 한 페이지 분량의 조회 결과
+        date_type: 날짜유형
+        granularity: 집계 단위
+        end_date: 조회 종료일 (기간 전체 단위 표시용)
+    
+    Returns:
+        pandas DataFrame (문자열 컬럼)
+    """
+    display = pd.DataFrame(index=page_df.index)
+    display[get_date_column_name(date_type, granularity)] = format_booking_dates(
+        page_df['booking_date'], granularity, end_date
+    )
+    for column, label in DETAIL_COLUMNS.items():
+        if column not in page_df.columns:
+            continue
+        values = page_df[column]
+        if column in _RATE_COLUMNS:
+            display[label] = values.fillna(0).map('{:.1f}%'.format)
+        elif pd.api.types.is_numeric_dtype(values):
+            display[label] = values.fillna(0).astype('int64').map('{:,}'.format)
+        else:
+            display[label] = values.fillna('-')
+    return display
@@ -0,0 +1,169 @@
+# utils/session_token.py
+"""세션 토큰 모듈
+- 로그인 성공 시 HMAC-SHA256 서명 토큰 발급 (사용자 ID + 만료 시각)
+- 새로고침 시 쿠키의 토큰을 메모리에서 검증 (DB 조회 없음)
+- 검증된 토큰은 프로세스 내 LRU 캐시에 보관하여 rerun마다 HMAC 재계산 생략
+- 서명 키는 .env의 SESSION_SECRET (미설정 시 프로세스 시작마다 임의 생성되어 재시작 후 재로그인 필요)
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from utils.logger import log_error
+from utils.metrics import record_cache
+
+# 토큰 형식 버전 (형식 변경 시 이전 토큰 무효화)
+TOKEN_VERSION = "v1"
+
+# 기본 유효 기간 (초) - 기존 auth_admin_id 쿠키와 같은 1일
+DEFAULT_TOKEN_TTL_SEC = 86400
+
+# 검증 캐시 최대 항목 수
+MAX_CACHED_TOKENS = 1024
+
+# 서명 키 (최초 사용 시 결정)
+_secret = None
+_secret_lock = threading.Lock()
+
+# 검증된 토큰 캐시: token -> (admin_id, expires_at)
+_verified_cache = OrderedDict()
+# 로그아웃된 토큰: token -> expires_at (프로세스 내에서만 유효)
+_revoked = {}
+_cache_lock = threading.Lock()
+
+
+def get_token_ttl() -> int:
+    """토큰 유효 기간 (초) - .env의 SESSION_TOKEN_TTL_SEC"""
+    try:
+        return max(60, int(os.getenv('SESSION_TOKEN_TTL_SEC', DEFAULT_TOKEN_TTL_SEC)))
+    except ValueError:
+        return DEFAULT_TOKEN_TTL_SEC
+
+
+def _get_secret() -> bytes:
+    """서명 키 반환"""
+    global _secret
+    
+    if _secret is not None:
+        return _secret
+    
+    with _secret_lock:
+        if _secret is None:
+            secret = os.getenv('SESSION_SECRET', '').strip()
+            if secret:
+                _secret = secret.encode('utf-8')
+            else:
+                _secret = secrets.token_bytes(32)
+                log_error("WARNING", "SESSION_SECRET 미설정 - 임시 서명 키 사용 (재시작/다중 프로세스 환경에서 재로그인 필요)")
+    return _secret
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(_get_secret(), f"{TOKEN_VERSION}.{payload}".encode('utf-8'), hashlib.sha256).digest()
+    return _b64encode(digest)
+
+
+def issue_token(admin_id: str, ttl: int = None) -> str:
+    """
+    세션 토큰 발급
+    
+    Args:
+        admin_id: 사용자 ID
+        ttl: 유효 기간 (초, 없으면 SESSION_TOKEN_TTL_SEC)
+    
+    Returns:
+        str: 쿠키/URL에 그대로 넣을 수 있는 토큰 (v1.<payload>.<signature>)
+    """
+    expires_at = int(time.time()) + (ttl or get_token_ttl())
+    payload = _b64encode(json.dumps({'sub': admin_id, 'exp': expires_at}, separators=(',', ':')).encode('utf-8'))
+    token = f"{TOKEN_VERSION}.{payload}.{_sign(payload)}"
+    
+    with _cache_lock:
+        _cache_put(token, admin_id, expires_at)
+    return token
+
+
+def _cache_put(token: str, admin_id: str, expires_at: int):
+    """검증 캐시에 추가 (_cache_lock 안에서 호출)"""
+    _verified_cache[token] = (admin_id, expires_at)
+    _verified_cache.move_to_end(token)
+    while len(_verified_cache) > MAX_CACHED_TOKENS:
+        _verified_cache.popitem(last=False)
+
+
+def verify_token(token: str) -> Optional[str]:
+    """
+    세션 토큰 검증
+    
+    Args:
+        token: issue_token()으로 발급한 토큰
+    
+    Returns:
+        str: 유효하면 사용자 ID, 위조/만료/로그아웃된 토큰이면 None
+    """
+    if not token:
+        return None
+    
+    now = time.time()
+    with _cache_lock:
+        cached = _verified_cache.get(token)
+        if cached is not None:
+            if cached[1] > now:
+                _verified_cache.move_to_end(token)
+                record_cache('session_token', True)
+                return cached[0]
+            del _verified_cache[token]
+        if token in _revoked:
+            return None
+    record_cache('session_token', False)
+    
+    try:
+        version, payload, signature = token.split('.')
+    except ValueError:
+        return None
+    if version != TOKEN_VERSION or not hmac.compare_digest(signature.encode('utf-8'), _sign(payload).encode('ascii')):
+        return None
+    
+    try:
+        claims = json.loads(_b64decode(payload))
+        admin_id = claims['sub']
+        expires_at = int(claims['exp'])
+    except (ValueError, KeyError, TypeError):
+        return None
+    if not admin_id or expires_at <= now:
+        return None
+    
+    with _cache_lock:
+        _cache_put(token, admin_id, expires_at)
+    return admin_id
+
+
+def revoke_token(token: str):
+    """로그아웃 시 토큰 무효화 (같은 프로세스에서만 유효, 만료 시각까지 보관)"""
+    if not token:
+        return
+    
+    now = time.time()
+    with _cache_lock:
+        cached = _verified_cache.pop(token, None)
+        expires_at = cached[1] if cached else now + get_token_ttl()
+        # 만료된 항목 정리
+        for revoked_token in [t for t, exp in _revoked.items() if exp <= now]:
+            del _revoked[revoked_token]
+        _revoked[token] = expires_at
@@ -0,0 +1,122 @@
+# utils/single_flight.py
+"""동일 쿼리 동시 실행 병합 (single-flight)
+- 같은 쿼리가 이미 실행 중이면 새로 실행하지 않고 끝날 때까지 기다렸다가 같은 결과를 받음
+- 월말처럼 여러 사용자가 같은 숙소/기간을 동시에 조회할 때 중복 DB 부하 제거
+- 결과는 캐시하지 않음 (실행이 끝나면 키 삭제, 이후 요청은 새로 실행)
+- 공유된 결과는 여러 세션이 함께 보므로 읽기 전용으로 취급 (DataFrame은 호출자마다 얕은 복사본 반환)
+"""
+
+import hashlib
+import os
+import re
+import threading
+
+from utils.metrics import record_cache
+
+# follower가 결과를 기다리며 호출자 취소 여부를 확인하는 간격 (초)
+WAIT_SLICE_SEC = 0.2
+
+# 키 정규화용 정규식 (리터럴은 결과에 영향을 주므로 유지)
+_COMMENT_RE = re.compile(r"--[^\n]*")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def is_single_flight_enabled() -> bool:
+    """동일 쿼리 병합 여부 - .env의 SINGLE_FLIGHT_ENABLED (기본값: true)"""
+    return os.getenv('SINGLE_FLIGHT_ENABLED', 'true').strip().lower() in ('1', 'true', 'yes')
+
+
+def make_query_key(query: str, params=None, engine=None) -> str:
+    """
+    쿼리 병합 키 생성
+    
+    주석/공백만 정리한 SQL + 바인딩 파라미터 + 엔진 (같은 SQL이라도 primary/복제본은 별도 실행)
+    
+    Args:
+        query: SQL 문자열
+        params: 바인딩 파라미터
+        engine: SQLAlchemy 엔진 또는 Connection (엔진 단위로 구분)
+    
+    Returns:
+        str: SHA-256 16진수 문자열
+    """
+    normalized = _WHITESPACE_RE.sub(' ', _COMMENT_RE.sub(' ', query)).strip()
+    # 엔진은 프로세스 동안 캐시되므로 객체 ID로 구분
+    engine_id = id(engine.engine) if engine is not None else 0
+    return hashlib.sha256(f"{engine_id}\n{normalized}\n{params!r}".encode('utf-8')).hexdigest()
+
+
+class _Flight:
+    """실행 중인 호출 1건"""
+    __slots__ = ('done', 'result', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    키별 동시 실행 병합
+    
+    - 처음 들어온 호출(leader)만 함수를 실행하고 나머지(follower)는 결과를 기다림
+    - leader가 실패하면 follower도 같은 예외를 받음
+    - retry_on에 지정한 예외(예: leader 작업 취소)로 끝나면 follower는 결과를 받지 않고 다시 시도
+    - follower는 짧은 간격으로 기다리며 자신의 취소 여부를 확인 (취소되면 leader를 기다리지 않고 종료)
+    """
+    
+    def __init__(self, name: str, retry_on=()):
+        self.name = name
+        self.retry_on = tuple(retry_on)
+        self._flights = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: str, func, cancelled=None):
+        """
+        func()를 키 단위로 병합 실행
+        
+        Args:
+            key: 병합 키
+            func: 실행할 함수 (leader만 실행)
+            cancelled: 호출자 취소 확인 함수 (취소되었으면 예외 발생, 예: job.check_cancelled)
+                       follower로 기다리는 동안 WAIT_SLICE_SEC마다 호출
+        
+        Returns:
+            tuple: (결과, 다른 호출의 결과를 공유했는지 여부)
+        """
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    is_leader = True
+                else:
+                    is_leader = False
+            
+            if is_leader:
+                record_cache(f"single_flight_{self.name}", False)
+                try:
+                    flight.result = func()
+                except BaseException as e:
+                    flight.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._flights[key]
+                    flight.done.set()
+                return flight.result, False
+            
+            while not flight.done.wait(WAIT_SLICE_SEC if cancelled is not None else None):
+                cancelled()
+            if flight.error is not None and isinstance(flight.error, self.retry_on):
+                continue
+            record_cache(f"single_flight_{self.name}", True)
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+    
+    def in_flight(self) -> int:
+        """실행 중인 키 수"""
+        with self._lock:
+            return len(self._flights)